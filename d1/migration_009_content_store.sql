@@ -0,0 +1,44 @@
+-- migration_009_content_store.sql
+-- 背景：news_snapshots 每次抓取都整行复制全部资讯且从不清理，一天两次，绝大多数行与上一次完全相同。
+-- 现改为内容寻址存储：news_contents 按内容哈希只存一份资讯内容，news_run_items 只记“哪次抓取包含哪条内容”。
+-- 旧表 news_snapshots 中的数据由 scripts/compact_news_snapshots.py 迁移并清空，
+-- 同一脚本负责按保留策略对旧抓取降采样。
+
+CREATE TABLE IF NOT EXISTS news_contents (
+  content_hash TEXT PRIMARY KEY,
+  source_url TEXT NOT NULL,
+  source_name TEXT NOT NULL,
+  platform TEXT NOT NULL,
+  region TEXT NOT NULL,
+  industry_stage TEXT NOT NULL,
+  title_original TEXT NOT NULL,
+  title_zh TEXT NOT NULL,
+  summary_original TEXT NOT NULL,
+  summary_zh TEXT NOT NULL,
+  has_translation INTEGER NOT NULL DEFAULT 0,
+  action TEXT NOT NULL,
+  published_at TEXT NOT NULL,
+  date TEXT NOT NULL,
+  content_tags_json TEXT NOT NULL,
+  first_seen_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_news_contents_source_url ON news_contents(source_url);
+CREATE INDEX IF NOT EXISTS idx_news_contents_published_at ON news_contents(published_at DESC);
+
+CREATE TABLE IF NOT EXISTS news_run_items (
+  run_id TEXT NOT NULL,
+  source_url TEXT NOT NULL,
+  content_hash TEXT NOT NULL,
+  captured_at TEXT NOT NULL,
+  PRIMARY KEY (run_id, source_url),
+  FOREIGN KEY (run_id) REFERENCES fetch_runs(run_id) ON DELETE CASCADE,
+  FOREIGN KEY (content_hash) REFERENCES news_contents(content_hash)
+);
+
+CREATE INDEX IF NOT EXISTS idx_news_run_items_content_hash ON news_run_items(content_hash);
+
+CREATE VIEW IF NOT EXISTS news_history AS
+SELECT r.run_id, r.captured_at, c.*
+FROM news_run_items r
+JOIN news_contents c ON c.content_hash = r.content_hash;
@@ -59,6 +59,45 @@ CREATE INDEX IF NOT EXISTS idx_news_snapshots_published_at ON news_snapshots(pub
 CREATE INDEX IF NOT EXISTS idx_news_snapshots_platform ON news_snapshots(platform);
 CREATE INDEX IF NOT EXISTS idx_news_snapshots_stage ON news_snapshots(industry_stage);
 
+CREATE TABLE IF NOT EXISTS news_contents (
+  content_hash TEXT PRIMARY KEY,
+  source_url TEXT NOT NULL,
+  source_name TEXT NOT NULL,
+  platform TEXT NOT NULL,
+  region TEXT NOT NULL,
+  industry_stage TEXT NOT NULL,
+  title_original TEXT NOT NULL,
+  title_zh TEXT NOT NULL,
+  summary_original TEXT NOT NULL,
+  summary_zh TEXT NOT NULL,
+  has_translation INTEGER NOT NULL DEFAULT 0,
+  action TEXT NOT NULL,
+  published_at TEXT NOT NULL,
+  date TEXT NOT NULL,
+  content_tags_json TEXT NOT NULL,
+  first_seen_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_news_contents_source_url ON news_contents(source_url);
+CREATE INDEX IF NOT EXISTS idx_news_contents_published_at ON news_contents(published_at DESC);
+
+CREATE TABLE IF NOT EXISTS news_run_items (
+  run_id TEXT NOT NULL,
+  source_url TEXT NOT NULL,
+  content_hash TEXT NOT NULL,
+  captured_at TEXT NOT NULL,
+  PRIMARY KEY (run_id, source_url),
+  FOREIGN KEY (run_id) REFERENCES fetch_runs(run_id) ON DELETE CASCADE,
+  FOREIGN KEY (content_hash) REFERENCES news_contents(content_hash)
+);
+
+CREATE INDEX IF NOT EXISTS idx_news_run_items_content_hash ON news_run_items(content_hash);
+
+CREATE VIEW IF NOT EXISTS news_history AS
+SELECT r.run_id, r.captured_at, c.*
+FROM news_run_items r
+JOIN news_contents c ON c.content_hash = r.content_hash;
+
 CREATE TABLE IF NOT EXISTS page_visits (
   id INTEGER PRIMARY KEY AUTOINCREMENT,
   path TEXT NOT NULL,
@@ -1,8 +1,41 @@
 const CACHE_CONTROL = "public, max-age=300";
-const CACHE_KEY_PATH = "/api/digest:v2";
-const REMOTE_DIGEST_URL =
-  "https://raw.githubusercontent.com/cyrus-tt/cyrus-ai-learning-notes/main/data/news_digest.json";
-const LOCAL_FALLBACK_PATH = "/data/news_digest.json";
+const CACHE_KEY_PATH = "/api/digest:v3";
+const REMOTE_DATA_BASE = "https://raw.githubusercontent.com/cyrus-tt/cyrus-ai-learning-notes/main/data/";
+const LOCAL_DATA_BASE = "/data/";
+const FULL_DIGEST_PATH = "news_digest.json";
+const DAY_RE = /^\d{4}-\d{2}-\d{2}$/;
+const WEEK_RE = /^\d{4}-\d{2}-W\d$/;
+
+// ?scope=current|manifest|day|week serves one shard from data/digest/;
+// no scope (or scope=full) keeps returning the monolithic news_digest.json.
+const SCOPES = {
+  full: {
+    path: () => FULL_DIGEST_PATH,
+    isValid: (payload) => Array.isArray(payload.dailyHistory) && Array.isArray(payload.weeklyHistory)
+  },
+  current: {
+    path: () => "digest/current.json",
+    isValid: (payload) => Boolean(payload.currentDay && typeof payload.currentDay === "object"),
+    fromFull: (payload) => ({
+      generatedAt: payload.generatedAt,
+      timezone: payload.timezone,
+      currentDay: payload.currentDay,
+      currentWeek: payload.currentWeek
+    })
+  },
+  manifest: {
+    path: () => "digest/manifest.json",
+    isValid: (payload) => Array.isArray(payload.days) && Array.isArray(payload.weeks)
+  },
+  day: {
+    path: (id) => (DAY_RE.test(id) ? `digest/days/${id}.json` : ""),
+    isValid: (payload) => Array.isArray(payload.top10)
+  },
+  week: {
+    path: (id) => (WEEK_RE.test(id) ? `digest/weeks/${id}.json` : ""),
+    isValid: (payload) => Array.isArray(payload.topEvents)
+  }
+};
 
 export async function onRequest(context) {
   const { request } = context;
@@ -18,20 +51,38 @@ export async function onRequest(context) {
     );
   }
 
-  const cacheKey = buildCacheKey(request);
+  const params = new URL(request.url).searchParams;
+  const scopeName = params.get("scope") || "full";
+  const scope = Object.prototype.hasOwnProperty.call(SCOPES, scopeName) ? SCOPES[scopeName] : null;
+  const id = String(params.get("date") || params.get("week") || "");
+  const shardPath = scope ? scope.path(id) : "";
+  if (!shardPath) {
+    return json(
+      {
+        ok: false,
+        error: "invalid_scope"
+      },
+      400,
+      "no-store"
+    );
+  }
+
+  const cacheKey = buildCacheKey(request, scopeName, id);
   const cache = caches.default;
   const cached = await cache.match(cacheKey);
   if (cached) {
     return cached;
   }
 
-  const localUrl = new URL(LOCAL_FALLBACK_PATH, request.url).toString();
-  const [remotePayload, localPayload] = await Promise.all([
-    fetchDigestPayload(REMOTE_DIGEST_URL, { cacheTtl: 300 }),
-    fetchDigestPayload(localUrl, { cacheTtl: 60 })
-  ]);
+  let preferredPayload = await loadPreferredPayload(request, shardPath, scope.isValid);
+  if (!preferredPayload && scope.fromFull) {
+    // Shards not deployed yet: derive this scope from the monolithic digest.
+    const fullPayload = await loadPreferredPayload(request, FULL_DIGEST_PATH, SCOPES.full.isValid);
+    if (fullPayload) {
+      preferredPayload = { ...fullPayload, payload: scope.fromFull(fullPayload.payload) };
+    }
+  }
 
-  const preferredPayload = pickPreferredPayload(remotePayload, localPayload);
   if (preferredPayload) {
     const response = json(
       preferredPayload.payload,
@@ -60,14 +111,27 @@ export async function onRequest(context) {
   );
 }
 
-function buildCacheKey(request) {
+function buildCacheKey(request, scopeName, id) {
   const url = new URL(request.url);
   url.pathname = CACHE_KEY_PATH;
   url.search = "";
+  url.searchParams.set("scope", scopeName);
+  if (id) {
+    url.searchParams.set("id", id);
+  }
   return new Request(url.toString(), { method: "GET" });
 }
 
-async function fetchDigestPayload(url, cfOptions) {
+async function loadPreferredPayload(request, path, isValid) {
+  const localUrl = new URL(LOCAL_DATA_BASE + path, request.url).toString();
+  const [remotePayload, localPayload] = await Promise.all([
+    fetchDigestPayload(REMOTE_DATA_BASE + path, { cacheTtl: 300 }, isValid),
+    fetchDigestPayload(localUrl, { cacheTtl: 60 }, isValid)
+  ]);
+  return pickPreferredPayload(remotePayload, localPayload);
+}
+
+async function fetchDigestPayload(url, cfOptions, isValid) {
   try {
     const response = await fetch(url, {
       cf: {
@@ -85,7 +149,7 @@ async function fetchDigestPayload(url, cfOptions) {
       return null;
     }
 
-    if (!Array.isArray(payload.dailyHistory) || !Array.isArray(payload.weeklyHistory)) {
+    if (!isValid(payload)) {
       return null;
     }
 
@@ -483,7 +483,7 @@ async function reloadDigestData() {
 }
 
 async function loadDigestPayload() {
-  const urls = ["/api/digest", "./data/news_digest.json"];
+  const urls = ["/api/digest?scope=current", "./data/digest/current.json", "./data/news_digest.json"];
   for (const url of urls) {
     const payload = await tryLoadDigestPayload(url);
     if (payload) {
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""Offline microbenchmarks for the news pipeline hot paths.
+
+Times the per-run CPU work on recorded fixtures (benchmarks/fixtures: RSS
+feeds captured from data/news.json and X search rows from data/x_feed.json),
+without any network access:
+
+- parse_entries (streaming parser, PER_SOURCE_LIMIT * 3 budget) vs feedparser
+  on the fixture feeds with their items repeated `scale` times
+- normalize_item over every feed entry
+- infer_action / infer_industry_stage / infer_content_tags
+- apply_ai_scores, dedupe_and_sort (including the near-duplicate merge)
+- build_news_digest (against a synthetic full-length previous digest, not
+  data/news_digest.json), build_d1_sync_statements (empty manifest = full sync)
+- build_report (48h) and build_watchlist_payload (X)
+
+Each benchmark runs at 1x, 10x and 100x the fixture volume. Copies replace
+every word (every character for CJK text) with one drawn deterministically
+from the fixture vocabulary: same lengths and word distribution, so keyword
+hit rates stay realistic, but they are distinct stories rather than
+near-duplicates of the originals.
+
+Results go to benchmarks/results/<commit>.json; --compare prints the ratio
+against an earlier result file:
+
+    python scripts/benchmark_pipeline.py
+    python scripts/benchmark_pipeline.py --scales 1,10 --compare benchmarks/results/abc1234.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import feedparser
+
+import build_news_48h_report
+import build_x_watchlist
+import update_news
+from fast_feed import parse_entries
+from news_item import NewsItem
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURE_DIR = ROOT / "benchmarks" / "fixtures"
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+DEFAULT_SCALES = (1, 10, 100)
+DEFAULT_MIN_TIME = 0.5
+MAX_ROUNDS = 50
+
+
+def remix(text: str, copy: int, words: list[str], chars: list[str]) -> str:
+    rng = random.Random(f"{copy}:{text}")
+    if " " in text:
+        return " ".join(rng.choice(words) for _ in text.split())
+    return "".join(rng.choice(chars) for _ in text)
+
+
+def load_fixture_entries() -> list[tuple[dict[str, Any], Any]]:
+    sources = json.loads((FIXTURE_DIR / "sources.json").read_text(encoding="utf-8"))
+    entries = []
+    for source in sources:
+        parsed = feedparser.parse((FIXTURE_DIR / source["fixture"]).read_bytes())
+        entries.extend((source, entry) for entry in parsed.entries)
+    return entries
+
+
+def load_fixture_feeds() -> list[bytes]:
+    sources = json.loads((FIXTURE_DIR / "sources.json").read_text(encoding="utf-8"))
+    return [(FIXTURE_DIR / source["fixture"]).read_bytes() for source in sources]
+
+
+def scale_feed(content: bytes, scale: int) -> bytes:
+    """The same feed document with its <item> block repeated `scale` times."""
+    start, end = content.find(b"<item>"), content.rfind(b"</item>") + len(b"</item>")
+    if start < 0 or scale <= 1:
+        return content
+    return content[:start] + content[start:end] * scale + content[end:]
+
+
+def scale_entries(entries: list[tuple[dict[str, Any], Any]], scale: int) -> list[tuple[dict[str, Any], Any]]:
+    scaled = list(entries)
+    texts = [entry.get(key, "") for _, entry in entries for key in ("title", "summary")]
+    words = sorted({word for text in texts if " " in text for word in text.split()})
+    chars = sorted({char for text in texts if " " not in text for char in text}) or words
+    for copy in range(1, scale):
+        for source, entry in entries:
+            clone = feedparser.FeedParserDict(entry)
+            clone["title"] = remix(entry.get("title", ""), copy, words, chars)
+            clone["summary"] = remix(entry.get("summary", ""), copy, words, chars)
+            link = entry.get("link", "")
+            clone["link"] = f"{link}{'&' if '?' in link else '?'}copy={copy}"
+            scaled.append((source, clone))
+    return scaled
+
+
+def load_x_fixture(scale: int) -> tuple[dict[str, Any], dict[str, build_x_watchlist.UserAggregate]]:
+    config = json.loads((ROOT / "data" / "x_discovery_config.json").read_text(encoding="utf-8"))
+    recorded = json.loads((FIXTURE_DIR / "x_search.json").read_text(encoding="utf-8"))["searchResults"]
+    matcher = build_x_watchlist.make_signal_matcher(
+        commercial=config.get("commercialSignals", []),
+        research=config.get("researchSignals", []),
+    )
+    users: dict[str, build_x_watchlist.UserAggregate] = {}
+    for copy in range(scale):
+        for track_key, keywords in recorded.items():
+            for keyword, rows in keywords.items():
+                for row in rows:
+                    if copy:
+                        row = {**row, "userScreenName": f"{row['userScreenName']}_{copy}", "id": f"{row['id']}{copy}"}
+                    build_x_watchlist.collect_tweet(users, row, track_key, keyword, matcher)
+    build_x_watchlist.apply_seed_users(users, config.get("seedUsers", []))
+    return config, users
+
+
+def synthetic_digest(items: list[NewsItem], generated_at: dt.datetime, rules: dict[str, Any]) -> dict[str, Any]:
+    """A previous digest covering the historyDays days before generated_at, cloned from the fixture's day."""
+    history_days = max(int(rules.get("historyDays", 90)), 1)
+    top_n = max(int(rules.get("topN", 10)), 1)
+    target_day = generated_at.astimezone(update_news.SHANGHAI_TZ).date()
+    template = update_news.build_current_day_entry(items, target_day, top_n)
+    daily_history = []
+    for offset in range(1, history_days + 1):
+        day = target_day - dt.timedelta(days=offset)
+        entry = update_news.deep_copy(template)
+        entry["date"] = day.isoformat()
+        entry["label"] = update_news.make_day_label(day)
+        daily_history.append(entry)
+    return {"dailyHistory": daily_history, "weeklyHistory": update_news.build_weekly_history(daily_history, top_n)}
+
+
+def time_call(func: Callable[[], Any], min_time: float) -> list[float]:
+    samples: list[float] = []
+    total = 0.0
+    while len(samples) < MAX_ROUNDS and (total < min_time or len(samples) < 3):
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        samples.append(elapsed)
+        total += elapsed
+    return samples
+
+
+def run_scale(
+    scale: int, entries: list[tuple[dict[str, Any], Any]], feeds: list[bytes], min_time: float
+) -> list[dict[str, Any]]:
+    scaled = scale_entries(entries, scale)
+    scaled_feeds = [scale_feed(feed, scale) for feed in feeds]
+    feed_entries = len(entries) * scale
+    texts = [f"{entry.get('title', '')} {entry.get('summary', '')}" for _, entry in scaled]
+    items: list[NewsItem] = [item for item in (update_news.normalize_item(s, e) for s, e in scaled) if item]
+    rules = update_news.load_digest_rules()
+    authority = update_news.ScoringModel(rules).authority_score
+    latest = max(item.published_ts or 0 for item in items)
+    generated_at = dt.datetime.fromtimestamp(latest, tz=dt.timezone.utc) + dt.timedelta(hours=1)
+    update_news.apply_ai_scores(items, generated_at, rules)
+    payload = {"generatedAt": generated_at.isoformat(), "timezone": "UTC", "total": len(items), "items": items}
+    previous_digest = synthetic_digest(items, generated_at, rules)
+    x_config, x_users = load_x_fixture(scale)
+
+    def infer_all() -> None:
+        for text in texts:
+            hits = update_news.rule_hits(text)
+            update_news.infer_action(text, hits)
+            update_news.infer_industry_stage(text, hits)
+            update_news.infer_content_tags(text, hits)
+
+    benchmarks: list[tuple[str, int, Callable[[], Any]]] = [
+        (
+            "parse_feeds",
+            feed_entries,
+            lambda: [parse_entries(feed, update_news.PER_SOURCE_LIMIT * 3) for feed in scaled_feeds],
+        ),
+        ("parse_feeds_feedparser", feed_entries, lambda: [feedparser.parse(feed) for feed in scaled_feeds]),
+        ("normalize_item", len(scaled), lambda: [update_news.normalize_item(s, e) for s, e in scaled]),
+        ("infer_classifiers", len(texts), infer_all),
+        ("apply_ai_scores", len(items), lambda: update_news.apply_ai_scores(items, generated_at, rules)),
+        ("dedupe_and_sort", len(items), lambda: update_news.dedupe_and_sort(list(items), authority)),
+        (
+            "build_news_digest",
+            len(items),
+            lambda: update_news.build_news_digest(payload, generated_at, rules, previous_digest),
+        ),
+        (
+            "build_d1_sync_statements",
+            len(items),
+            lambda: update_news.build_d1_sync_statements(payload, "bench", generated_at, generated_at, {}),
+        ),
+        ("build_report_48h", len(items), lambda: build_news_48h_report.build_report(items, generated_at)),
+        ("build_watchlist_payload", len(x_users), lambda: build_x_watchlist.build_watchlist_payload(x_config, x_users)),
+    ]
+
+    results = []
+    for name, count, func in benchmarks:
+        samples = time_call(func, min_time)
+        best = min(samples)
+        results.append(
+            {
+                "name": name,
+                "scale": scale,
+                "items": count,
+                "rounds": len(samples),
+                "best": round(best, 6),
+                "median": round(statistics.median(samples), 6),
+                "perItemUs": round(best / max(count, 1) * 1e6, 3),
+            }
+        )
+        print(f"[bench] {name:<25} {scale:>4}x {count:>6} items  best {best * 1000:9.2f} ms  ({len(samples)} rounds)")
+    return results
+
+
+def git_revision() -> str:
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(["git", "diff", "--quiet", "HEAD", "--", "scripts"], cwd=ROOT).returncode != 0
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{revision}-dirty" if dirty else revision
+
+
+def compare(current: list[dict[str, Any]], baseline_path: Path) -> None:
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    before = {(row["name"], row["scale"]): row["best"] for row in baseline.get("results", [])}
+    print(f"[bench] vs {baseline.get('revision', baseline_path.name)} (ratio < 1 is faster)")
+    for row in current:
+        old = before.get((row["name"], row["scale"]))
+        if old:
+            print(f"[bench] {row['name']:<25} {row['scale']:>4}x  {row['best'] / old:6.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time the news pipeline hot paths on recorded fixtures.")
+    parser.add_argument("--scales", default=",".join(str(scale) for scale in DEFAULT_SCALES))
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME, help="minimum seconds per benchmark")
+    parser.add_argument("--output", type=Path, help="result file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", type=Path, help="earlier result file to compare against")
+    args = parser.parse_args()
+
+    entries = load_fixture_entries()
+    feeds = load_fixture_feeds()
+    revision = git_revision()
+    results: list[dict[str, Any]] = []
+    for scale in (int(value) for value in args.scales.split(",") if value.strip()):
+        results.extend(run_scale(scale, entries, feeds, args.min_time))
+
+    output = args.output or RESULTS_DIR / f"{revision}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    report = {
+        "revision": revision,
+        "generatedAt": dt.datetime.now(tz=dt.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "fixtureEntries": len(entries),
+        "results": results,
+    }
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    print(f"[OK] wrote {output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
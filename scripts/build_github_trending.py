@@ -9,30 +9,31 @@ from __future__ import annotations
 
 import json
 import os
-import signal
 import sys
 import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
-import requests
-
 try:
     from deep_translator import GoogleTranslator
 except ImportError:
     GoogleTranslator = None
 
+import news_http
+from news_item import NewsItem, json_default
+from translation import BatchTranslator, point_translator
+from translation_cache import TranslationCache, open_translation_cache
+
 ROOT = Path(__file__).resolve().parent.parent
 OUTPUT_FILE = ROOT / "data" / "github_trending.json"
-TRANSLATION_CACHE_FILE = ROOT / "data" / "translation_cache.json"
+GITHUB_API_BASE_ENV = "GITHUB_API_BASE"
+DEFAULT_GITHUB_API_BASE = "https://api.github.com"
 
 DEFAULT_TIMEOUT = 20
 MIN_STARS = 1000
 MAX_ITEMS = 80
 PER_PAGE = 30
-TRANSLATION_TIMEOUT_SECONDS = 8
-TRANSLATION_FAILURE_LIMIT = 5
 
 SEARCH_QUERIES = [
     "ai agent",
@@ -49,14 +50,11 @@ STAGE_UPSTREAM = {"research", "paper", "benchmark", "training", "dataset", "mode
 STAGE_DOWNSTREAM = {"app", "tool", "workflow", "automation", "deploy", "production", "saas", "cli", "sdk"}
 
 
-def _translation_timeout_handler(signum: int, frame: Any) -> None:
-    raise TimeoutError("translation timed out")
-
-
 def main() -> int:
     token = os.getenv("GITHUB_TOKEN", "").strip()
     translator, cache = init_translator()
     translation_state = {"failures": 0, "disabled": False}
+    batch_translator = BatchTranslator(translator, cache, translation_state, label="[github-trending]")
 
     print(f"[github-trending] starting, token={'yes' if token else 'no'}, queries={len(SEARCH_QUERIES)}")
 
@@ -76,12 +74,13 @@ def main() -> int:
 
     items = []
     for repo in all_repos.values():
-        item = normalize_repo(repo, translator, cache, translation_state)
+        item = normalize_repo(repo)
         if item:
             items.append(item)
 
     items.sort(key=lambda x: x.get("metrics", {}).get("stars", 0), reverse=True)
     items = items[:MAX_ITEMS]
+    translate_items(items, batch_translator)
 
     payload = {
         "generatedAt": datetime.now(timezone.utc).isoformat(),
@@ -91,14 +90,15 @@ def main() -> int:
     }
 
     write_json(OUTPUT_FILE, payload)
-    save_translation_cache(cache)
+    cache.close()
 
     print(f"[github-trending] done: items={len(items)}")
     return 0
 
 
 def search_github(query: str, token: str) -> list[dict[str, Any]]:
-    url = "https://api.github.com/search/repositories"
+    base = (os.getenv(GITHUB_API_BASE_ENV, "").strip() or DEFAULT_GITHUB_API_BASE).rstrip("/")
+    url = f"{base}/search/repositories"
     headers = {"Accept": "application/vnd.github+json"}
     if token:
         headers["Authorization"] = f"Bearer {token}"
@@ -110,31 +110,27 @@ def search_github(query: str, token: str) -> list[dict[str, Any]]:
         "per_page": PER_PAGE,
     }
 
-    for attempt in range(3):
-        try:
-            resp = requests.get(url, headers=headers, params=params, timeout=DEFAULT_TIMEOUT)
-            if resp.status_code == 403:
-                print(f"[github-trending] rate limited, waiting {10 * (attempt + 1)}s", file=sys.stderr)
-                time.sleep(10 * (attempt + 1))
-                continue
-            if not resp.ok:
-                print(f"[github-trending] search failed: {resp.status_code} q={query[:40]}", file=sys.stderr)
-                return []
-            data = resp.json()
-            return data.get("items", []) if isinstance(data, dict) else []
-        except Exception as err:
-            print(f"[github-trending] search error: {err}", file=sys.stderr)
-            if attempt < 2:
-                time.sleep(5)
-    return []
-
-
-def normalize_repo(
-    repo: dict[str, Any],
-    translator: Any,
-    cache: dict[str, str],
-    translation_state: dict[str, Any],
-) -> dict[str, Any] | None:
+    try:
+        # 403 is GitHub's rate-limit answer; news_http waits for Retry-After / X-RateLimit-Reset.
+        resp = news_http.get(
+            url,
+            headers=headers,
+            params=params,
+            timeout=DEFAULT_TIMEOUT,
+            retry_status=news_http.RETRY_STATUS | {403},
+        )
+        if not resp.ok:
+            print(f"[github-trending] search failed: {resp.status_code} q={query[:40]}", file=sys.stderr)
+            return []
+        data = resp.json()
+        return data.get("items", []) if isinstance(data, dict) else []
+    except Exception as err:
+        print(f"[github-trending] search error: {err}", file=sys.stderr)
+        return []
+
+
+def normalize_repo(repo: dict[str, Any]) -> NewsItem | None:
+    """Normalize one search hit; zh fields hold the original text until translate_items runs."""
     full_name = safe_text(repo.get("full_name", ""))
     if not full_name:
         return None
@@ -154,9 +150,6 @@ def normalize_repo(
     pushed_at = safe_text(repo.get("pushed_at", ""))
     html_url = safe_text(repo.get("html_url", ""))
 
-    desc_zh = translate_text(desc_original, translator, cache, translation_state) if desc_original else ""
-    has_translation = bool(desc_zh and desc_zh != desc_original)
-
     stage = infer_stage(topics, desc_original)
 
     action = "高Star项目，建议深入阅读文档和社区讨论。"
@@ -171,14 +164,14 @@ def normalize_repo(
     base_tags.extend(topics[:5])
     content_tags = dedupe(base_tags)[:8]
 
-    return {
+    return NewsItem.from_dict({
         "title": f"{full_name} · GitHub开源",
         "titleOriginal": f"{full_name} · GitHub Trending",
         "titleZh": f"{full_name} · GitHub开源",
-        "summary": desc_zh or desc_original or "暂无描述",
+        "summary": desc_original or "暂无描述",
         "summaryOriginal": desc_original or "No description",
-        "summaryZh": desc_zh or desc_original or "暂无描述",
-        "hasTranslation": has_translation,
+        "summaryZh": desc_original or "暂无描述",
+        "hasTranslation": False,
         "platform": "GitHub",
         "region": "全球开源",
         "industryStage": stage,
@@ -201,7 +194,7 @@ def normalize_repo(
             "license": license_name,
             "lastPushedAt": pushed_at,
         },
-    }
+    })
 
 
 def infer_stage(topics: list[str], description: str) -> str:
@@ -215,59 +208,35 @@ def infer_stage(topics: list[str], description: str) -> str:
     return "中游"
 
 
-def init_translator() -> tuple[Any, dict[str, str]]:
-    cache = load_translation_cache()
+def init_translator() -> tuple[Any, TranslationCache]:
+    cache = open_translation_cache()
     if GoogleTranslator is None:
         return None, cache
     try:
-        translator = GoogleTranslator(source="en", target="zh-CN")
+        translator = point_translator(GoogleTranslator(source="en", target="zh-CN"))
         return translator, cache
     except Exception:
         return None, cache
 
 
-def translate_via_service(text: str, translator: Any) -> str:
-    if hasattr(signal, "SIGALRM") and hasattr(signal, "setitimer"):
-        previous_handler = signal.getsignal(signal.SIGALRM)
-        try:
-            signal.signal(signal.SIGALRM, _translation_timeout_handler)
-            signal.setitimer(signal.ITIMER_REAL, TRANSLATION_TIMEOUT_SECONDS)
-            return translator.translate(text)
-        finally:
-            signal.setitimer(signal.ITIMER_REAL, 0)
-            signal.signal(signal.SIGALRM, previous_handler)
-
-    return translator.translate(text)
-
-
-def translate_text(text: str, translator: Any, cache: dict[str, str], translation_state: dict[str, Any]) -> str:
-    if not text or not translator or translation_state.get("disabled"):
-        return text
-    if has_cjk(text):
+def translate_text(text: str, translator: BatchTranslator) -> str:
+    if not text or has_cjk(text):
         return text
+    return translator.lookup(text) or text
 
-    cache_key = f"zh::{text}"
-    if cache_key in cache:
-        return cache[cache_key]
 
-    try:
-        result = translate_via_service(text, translator)
-        translation_state["failures"] = 0
-        if result:
-            cache[cache_key] = result
-            return result
-    except Exception as err:
-        failures = int(translation_state.get("failures", 0)) + 1
-        translation_state["failures"] = failures
-        if failures >= TRANSLATION_FAILURE_LIMIT and not translation_state.get("disabled"):
-            translation_state["disabled"] = True
-            print(
-                f"[github-trending] translation disabled after {failures} failures: {type(err).__name__}: {err}",
-                file=sys.stderr,
-            )
-        else:
-            print(f"[github-trending] translate error: {err}", file=sys.stderr)
-    return text
+def translate_items(items: list[dict[str, Any]], translator: BatchTranslator) -> None:
+    """Fill the zh description of normalized repos in one batched pass; run it after the MAX_ITEMS trim."""
+    descriptions = [item["summaryOriginal"] if item["summaryOriginal"] != "No description" else "" for item in items]
+    for desc in descriptions:
+        translator.add(desc)
+    translator.flush()
+
+    for item, desc in zip(items, descriptions):
+        desc_zh = translate_text(desc, translator) if desc else ""
+        item["summary"] = desc_zh or desc or "暂无描述"
+        item["summaryZh"] = desc_zh or desc or "暂无描述"
+        item["hasTranslation"] = bool(desc_zh and desc_zh != desc)
 
 
 def has_cjk(text: str) -> bool:
@@ -278,25 +247,9 @@ def has_cjk(text: str) -> bool:
     return False
 
 
-def load_translation_cache() -> dict[str, str]:
-    try:
-        return json.loads(TRANSLATION_CACHE_FILE.read_text(encoding="utf-8"))
-    except Exception:
-        return {}
-
-
-def save_translation_cache(cache: dict[str, str]) -> None:
-    try:
-        TRANSLATION_CACHE_FILE.write_text(
-            json.dumps(cache, ensure_ascii=False, indent=2), encoding="utf-8"
-        )
-    except Exception as err:
-        print(f"[github-trending] cache save error: {err}", file=sys.stderr)
-
-
 def write_json(path: Path, payload: dict[str, Any]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2, default=json_default), encoding="utf-8")
 
 
 def safe_text(value: Any) -> str:
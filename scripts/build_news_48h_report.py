@@ -1,5 +1,9 @@
 #!/usr/bin/env python3
-"""Build a 48-hour AI news visualization snapshot from data/news.json."""
+"""Build a 48-hour AI news visualization snapshot.
+
+Reads the window from the news history store (data/news_history.sqlite3),
+falling back to data/news.json when the store has not been created yet.
+"""
 
 from __future__ import annotations
 
@@ -12,6 +16,10 @@ from pathlib import Path
 from typing import Any
 from zoneinfo import ZoneInfo
 
+from news_history import open_news_history
+from news_item import NewsItem, to_news_items
+from update_news import apply_ai_scores, load_digest_rules
+
 ROOT = Path(__file__).resolve().parent.parent
 INPUT_FILE = ROOT / "data" / "news.json"
 OUTPUT_FILE = ROOT / "data" / "news_48h_report.json"
@@ -25,7 +33,12 @@ SOURCE_LIMIT = 10
 TAG_LIMIT = 12
 
 
-def load_items() -> list[dict[str, Any]]:
+def load_items(start_ts: float | None = None, end_ts: float | None = None) -> list[NewsItem]:
+    history = open_news_history()
+    if history is not None:
+        with history:
+            return history.query(since=start_ts, until=end_ts)
+
     payload = json.loads(INPUT_FILE.read_text(encoding="utf-8"))
     if isinstance(payload, list):
         items = payload
@@ -33,20 +46,7 @@ def load_items() -> list[dict[str, Any]]:
         items = payload.get("items", [])
     else:
         items = []
-    return [item for item in items if isinstance(item, dict)]
-
-
-def parse_published_at(item: dict[str, Any]) -> datetime | None:
-    raw = str(item.get("publishedAt") or "").strip()
-    if not raw:
-        return None
-    try:
-        dt = datetime.fromisoformat(raw.replace("Z", "+00:00"))
-    except ValueError:
-        return None
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    return dt.astimezone(timezone.utc)
+    return to_news_items(items)
 
 
 def format_local(value: datetime) -> str:
@@ -66,15 +66,15 @@ def normalize_count_rows(counter: Counter[str], total: int) -> list[dict[str, An
     return rows
 
 
-def build_source_rows(items: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    grouped: dict[str, list[dict[str, Any]]] = defaultdict(list)
+def build_source_rows(items: list[NewsItem]) -> list[dict[str, Any]]:
+    grouped: dict[str, list[NewsItem]] = defaultdict(list)
     for item in items:
         grouped[str(item.get("sourceName") or "未知来源")].append(item)
 
     rows = []
     for name, group in grouped.items():
         scores = [float(item.get("aiScore", 0) or 0) for item in group]
-        latest_dt = max(item["_publishedAt"] for item in group)
+        latest_dt = max(group, key=lambda item: item.published_ts).published_at
         rows.append(
             {
                 "name": name,
@@ -90,14 +90,14 @@ def build_source_rows(items: list[dict[str, Any]]) -> list[dict[str, Any]]:
     ]
 
 
-def build_timeline(items: list[dict[str, Any]], window_start: datetime, window_end: datetime) -> list[dict[str, Any]]:
+def build_timeline(items: list[NewsItem], window_start: datetime, window_end: datetime) -> list[dict[str, Any]]:
     bucket_count = max(1, math.ceil(WINDOW_HOURS / BUCKET_HOURS))
     bucket_span = timedelta(hours=BUCKET_HOURS)
     counts = [0] * bucket_count
+    start_ts = window_start.timestamp()
 
     for item in items:
-        delta = item["_publishedAt"] - window_start
-        raw_index = int(delta.total_seconds() // bucket_span.total_seconds())
+        raw_index = int((item.published_ts - start_ts) // bucket_span.total_seconds())
         index = min(max(raw_index, 0), bucket_count - 1)
         counts[index] += 1
 
@@ -118,7 +118,8 @@ def build_timeline(items: list[dict[str, Any]], window_start: datetime, window_e
     return rows
 
 
-def simplify_item(item: dict[str, Any]) -> dict[str, Any]:
+def simplify_item(item: NewsItem) -> dict[str, Any]:
+    published_at = item.published_at
     return {
         "title": item.get("title") or item.get("titleOriginal") or "",
         "titleZh": item.get("titleZh") or "",
@@ -131,28 +132,28 @@ def simplify_item(item: dict[str, Any]) -> dict[str, Any]:
         "contentTags": item.get("contentTags") or [],
         "region": item.get("region") or "",
         "aiScore": int(item.get("aiScore", 0) or 0),
-        "publishedAt": item["_publishedAt"].isoformat(),
-        "publishedAtLocal": format_local(item["_publishedAt"]),
+        "publishedAt": published_at.isoformat(),
+        "publishedAtLocal": format_local(published_at),
         "action": item.get("action") or "",
     }
 
 
-def build_report() -> dict[str, Any]:
-    generated_at = datetime.now(timezone.utc)
+def build_report(items: list[NewsItem] | None = None, generated_at: datetime | None = None) -> dict[str, Any]:
+    """Report over the last WINDOW_HOURS; items default to load_items() for the window."""
+    generated_at = generated_at or datetime.now(timezone.utc)
     window_start = generated_at - timedelta(hours=WINDOW_HOURS)
 
-    prepared_items = []
-    for item in load_items():
-        published_at = parse_published_at(item)
-        if published_at is None:
-            continue
-        if published_at < window_start or published_at > generated_at:
-            continue
-        enriched = dict(item)
-        enriched["_publishedAt"] = published_at
-        prepared_items.append(enriched)
+    start_ts = window_start.timestamp()
+    end_ts = generated_at.timestamp()
 
-    prepared_items.sort(key=lambda item: item["_publishedAt"], reverse=True)
+    prepared_items = [
+        item
+        for item in (load_items(start_ts, end_ts) if items is None else items)
+        if item.published_ts is not None and start_ts <= item.published_ts <= end_ts
+    ]
+    prepared_items.sort(key=lambda item: item.published_ts, reverse=True)
+    # History rows carry the aiScore of their last upsert; rank them by their recency now.
+    apply_ai_scores(prepared_items, generated_at, load_digest_rules())
 
     platform_counter: Counter[str] = Counter()
     stage_counter: Counter[str] = Counter()
@@ -172,7 +173,7 @@ def build_report() -> dict[str, Any]:
 
     top_items = sorted(
         prepared_items,
-        key=lambda item: (float(item.get("aiScore", 0) or 0), item["_publishedAt"]),
+        key=lambda item: (float(item.get("aiScore", 0) or 0), item.published_ts),
         reverse=True,
     )[:TOP_ITEM_LIMIT]
 
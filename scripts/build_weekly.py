@@ -1,12 +1,17 @@
 #!/usr/bin/env python3
-"""Build weekly AI news digest from data/news.json.
+"""Build weekly AI news digest from the news history store.
+
+Items come from data/news_history.sqlite3 (every item update_news.py has
+published), falling back to data/news.json when the store does not exist.
 
 Generates:
   - weekly/YYYY-WNN.html  (the digest page for the current ISO week)
   - weekly/index.json      (listing of all weekly digests)
 
-Uses only Python stdlib. Idempotent: running multiple times for the same week
-overwrites the same file.
+Items are rescored with update_news's digest scoring model as of the run, so
+a row's aiScore from its last upsert (with the recency it had back then)
+does not decide the ranking. Idempotent: running multiple times for the same
+week overwrites the same file.
 """
 
 from __future__ import annotations
@@ -16,6 +21,10 @@ import os
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+from news_history import open_news_history
+from news_item import NewsItem, parse_timestamp, to_news_items
+from update_news import apply_ai_scores, load_digest_rules
+
 ROOT = Path(__file__).resolve().parent.parent
 NEWS_FILE = ROOT / "data" / "news.json"
 WEEKLY_DIR = ROOT / "weekly"
@@ -28,19 +37,6 @@ TOP_N = 10
 # Helpers
 # ---------------------------------------------------------------------------
 
-def parse_dt(raw: str) -> datetime | None:
-    """Parse an ISO datetime string into a UTC-aware datetime."""
-    if not raw:
-        return None
-    try:
-        dt = datetime.fromisoformat(raw.replace("Z", "+00:00"))
-    except ValueError:
-        return None
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    return dt.astimezone(timezone.utc)
-
-
 def iso_week_range(iso_year: int, iso_week: int) -> tuple[str, str]:
     """Return (start_date, end_date) strings for an ISO week (Mon-Sun)."""
     # Jan 4 is always in ISO week 1
@@ -201,11 +197,17 @@ def build_digest_html(
 # Main
 # ---------------------------------------------------------------------------
 
-def main() -> None:
-    # Load news data
+def load_items(start_ts: float | None = None, end_ts: float | None = None, order: str = "published") -> list[NewsItem]:
+    """Items from the history store (only the requested window), else all of news.json."""
+    history = open_news_history()
+    if history is not None:
+        with history:
+            return history.query(since=start_ts, until=end_ts, order=order)
     payload = json.loads(NEWS_FILE.read_text(encoding="utf-8"))
-    all_items: list[dict] = payload.get("items", []) if isinstance(payload, dict) else payload
+    return to_news_items(payload.get("items", []) if isinstance(payload, dict) else payload)
 
+
+def main() -> None:
     # Determine current ISO week
     now = datetime.now(timezone.utc)
     iso_year, iso_week, _ = now.isocalendar()
@@ -219,19 +221,26 @@ def main() -> None:
         hours=23, minutes=59, seconds=59
     )
 
+    # Load news data
+    all_items = load_items(start_dt.timestamp(), end_dt.timestamp())
+
     week_items = []
     for item in all_items:
-        pub = parse_dt(item.get("publishedAt") or "")
+        pub = item.published_ts
         if pub is None:
             # Fall back to date field
             date_str = item.get("date", "")
             if date_str:
-                pub = parse_dt(date_str + "T00:00:00+00:00")
+                pub = parse_timestamp(date_str + "T00:00:00+00:00")
         if pub is None:
             continue
-        if start_dt <= pub <= end_dt:
+        if start_dt.timestamp() <= pub <= end_dt.timestamp():
             week_items.append(item)
 
+    # History rows carry the aiScore of their last upsert; rescore them as of now.
+    rules = load_digest_rules()
+    apply_ai_scores(week_items, now, rules)
+
     # Sort by aiScore descending, take top N
     week_items.sort(key=lambda x: int(x.get("aiScore", 0) or 0), reverse=True)
     top_items = week_items[:TOP_N]
@@ -240,7 +249,9 @@ def main() -> None:
         print(f"[weekly] No items found for {iso_year}-W{iso_week:02d} ({date_start} to {date_end})")
         print("[weekly] Falling back to top items from all available data")
         # Fall back: use whatever data we have
-        fallback = sorted(all_items, key=lambda x: int(x.get("aiScore", 0) or 0), reverse=True)
+        fallback = load_items(order="score")
+        apply_ai_scores(fallback, now, rules)
+        fallback.sort(key=lambda x: int(x.get("aiScore", 0) or 0), reverse=True)
         top_items = fallback[:TOP_N]
         if not top_items:
             print("[weekly] No data at all. Aborting.")
@@ -20,7 +20,9 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
-import requests
+from keyword_matcher import KeywordMatcher
+import news_http
+from news_item import NewsItem, json_default
 
 ROOT = Path(__file__).resolve().parent.parent
 DEFAULT_CONFIG_FILE = ROOT / "data" / "x_discovery_config.json"
@@ -90,7 +92,7 @@ class UserAggregate:
         del self.examples[max_examples:]
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Build X watchlist and post feed snapshots.")
     parser.add_argument(
         "--config",
@@ -121,11 +123,11 @@ def parse_args() -> argparse.Namespace:
         default=DEFAULT_TIMEOUT_SECONDS,
         help=f"HTTP timeout in seconds (default: {DEFAULT_TIMEOUT_SECONDS})",
     )
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
-def main() -> int:
-    args = parse_args()
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
     config = load_json_file(args.config)
     if not config:
         print(f"[x-watchlist] config not found or invalid: {args.config}", file=sys.stderr)
@@ -169,7 +171,7 @@ def load_json_file(path: Path) -> dict[str, Any]:
 
 def write_json(path: Path, payload: dict[str, Any]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2, default=json_default), encoding="utf-8")
 
 
 def discover_users(config: dict[str, Any], api: "XApiClient") -> dict[str, UserAggregate]:
@@ -177,8 +179,10 @@ def discover_users(config: dict[str, Any], api: "XApiClient") -> dict[str, UserA
     tracks = config.get("tracks", {}) if isinstance(config.get("tracks"), dict) else {}
     limits = config.get("limits", {}) if isinstance(config.get("limits"), dict) else {}
     search_limit = safe_int(limits.get("searchResultsPerKeyword"), 40, 5, 100)
-    commercial_signals = make_signal_set(config.get("commercialSignals", []))
-    research_signals = make_signal_set(config.get("researchSignals", []))
+    signal_matcher = make_signal_matcher(
+        commercial=config.get("commercialSignals", []),
+        research=config.get("researchSignals", []),
+    )
 
     if api.enabled:
         for track_key, track_cfg in tracks.items():
@@ -196,8 +200,7 @@ def discover_users(config: dict[str, Any], api: "XApiClient") -> dict[str, UserA
                         row=row,
                         track_key=track_key,
                         keyword=keyword_text,
-                        commercial_signals=commercial_signals,
-                        research_signals=research_signals,
+                        signal_matcher=signal_matcher,
                     )
     else:
         print("[x-watchlist] token missing, discovery fallback to seed users only.")
@@ -239,8 +242,7 @@ def collect_tweet(
     row: dict[str, Any],
     track_key: str,
     keyword: str,
-    commercial_signals: set[str],
-    research_signals: set[str],
+    signal_matcher: KeywordMatcher,
 ) -> None:
     username = normalize_username(
         row.get("userScreenName") or row.get("screenName") or row.get("username") or row.get("authorUsername")
@@ -276,10 +278,10 @@ def collect_tweet(
     if created_at > aggregate.last_active_at:
         aggregate.last_active_at = created_at
 
-    text_lower = text.lower()
-    if contains_any(text_lower, commercial_signals):
+    signal_hits = signal_matcher.scan(text)
+    if "commercial" in signal_hits:
         aggregate.commercial_signal_hits += 1
-    if contains_any(text_lower, research_signals):
+    if "research" in signal_hits:
         aggregate.research_signal_hits += 1
 
     if text:
@@ -471,7 +473,7 @@ def build_feed_payload(config: dict[str, Any], api: "XApiClient", watchlist_user
     user_by_name = {normalize_username(item.get("username")): item for item in watchlist_users}
     sorted_users = [item for item in watchlist_users if normalize_username(item.get("username"))][:feed_user_limit]
 
-    collected: list[dict[str, Any]] = []
+    collected: list[NewsItem] = []
     for user_item in sorted_users:
         username = normalize_username(user_item.get("username"))
         if not username:
@@ -486,7 +488,7 @@ def build_feed_payload(config: dict[str, Any], api: "XApiClient", watchlist_user
         if len(collected) >= feed_size:
             break
 
-    collected.sort(key=lambda item: item.get("publishedAt", ""), reverse=True)
+    collected.sort(key=lambda item: item.published_ts or 0.0, reverse=True)
     deduped = dedupe_items(collected)[:feed_size]
 
     if not deduped:
@@ -499,7 +501,7 @@ def build_feed_payload(config: dict[str, Any], api: "XApiClient", watchlist_user
     }
 
 
-def normalize_tweet_to_news_item(row: dict[str, Any], user_item: dict[str, Any]) -> dict[str, Any] | None:
+def normalize_tweet_to_news_item(row: dict[str, Any], user_item: dict[str, Any]) -> NewsItem | None:
     username = normalize_username(
         row.get("userScreenName") or row.get("screenName") or row.get("username") or user_item.get("username")
     )
@@ -535,7 +537,7 @@ def normalize_tweet_to_news_item(row: dict[str, Any], user_item: dict[str, Any])
     if reason:
         action = f"{action} 账号理由：{reason}"
 
-    return {
+    return NewsItem.from_dict({
         "title": f"@{username} · X监控",
         "titleOriginal": f"@{username} · X monitor",
         "titleZh": f"@{username} · X监控",
@@ -558,7 +560,7 @@ def normalize_tweet_to_news_item(row: dict[str, Any], user_item: dict[str, Any])
             "replies": replies,
         },
         "watchScore": user_item.get("score"),
-    }
+    })
 
 
 def build_feed_fallback_item(now: str) -> dict[str, Any]:
@@ -649,7 +651,7 @@ class XApiClient:
             "Content-Type": "application/json",
         }
         try:
-            response = requests.post(url, headers=headers, json=payload, timeout=self.timeout_seconds)
+            response = news_http.post(url, headers=headers, json=payload, timeout=self.timeout_seconds)
             if not response.ok:
                 print(
                     f"[x-watchlist] request failed: {response.status_code} endpoint={endpoint}",
@@ -749,16 +751,15 @@ def as_list(value: Any) -> list[Any]:
     return []
 
 
-def make_signal_set(values: Any) -> set[str]:
-    if not isinstance(values, list):
-        return set()
-    return {safe_text(item).lower() for item in values if safe_text(item)}
-
-
-def contains_any(text: str, signals: set[str]) -> bool:
-    if not text or not signals:
-        return False
-    return any(signal in text for signal in signals)
+def make_signal_matcher(**signal_sets: Any) -> KeywordMatcher:
+    """One automaton for every signal list; scan() yields the names of the lists that hit."""
+    matcher = KeywordMatcher()
+    for name, values in signal_sets.items():
+        if not isinstance(values, list):
+            continue
+        for item in values:
+            matcher.add(safe_text(item), name)
+    return matcher
 
 
 def truncate_text(text: str, max_len: int) -> str:
@@ -10,33 +10,35 @@ from __future__ import annotations
 
 import json
 import os
-import re
-import signal
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
-import feedparser
-import requests
-
 try:
     from deep_translator import GoogleTranslator
 except ImportError:
     GoogleTranslator = None
 
+from fast_feed import parse_entries
+from feed_validators import FeedValidatorStore, content_hash, response_validators
+from keyword_matcher import KeywordMatcher
+import news_http
+from news_item import NewsItem, json_default, to_news_items
+from translation import BatchTranslator, point_translator
+from translation_cache import TranslationCache, open_translation_cache
+
 ROOT = Path(__file__).resolve().parent.parent
 CONFIG_FILE = ROOT / "data" / "yt_discovery_config.json"
 WATCHLIST_OUT = ROOT / "data" / "yt_watchlist.json"
 FEED_OUT = ROOT / "data" / "yt_feed.json"
-TRANSLATION_CACHE_FILE = ROOT / "data" / "translation_cache.json"
+FEED_VALIDATORS_FILE = ROOT / "data" / "yt_feed_validators.json"
 
-YT_RSS_TEMPLATE = "https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
+YT_RSS_BASE_ENV = "YT_RSS_BASE"
+DEFAULT_YT_RSS_BASE = "https://www.youtube.com"
 DEFAULT_TIMEOUT = 15
 SUMMARY_MAX_LEN = 700
 SUMMARY_AI_SCAN_LEN = 260
-TRANSLATION_TIMEOUT_SECONDS = 8
-TRANSLATION_FAILURE_LIMIT = 5
 DEFAULT_AI_KEYWORDS = [
     "ai",
     "llm",
@@ -67,10 +69,6 @@ DEFAULT_AI_KEYWORDS = [
 ]
 
 
-def _translation_timeout_handler(signum: int, frame: Any) -> None:
-    raise TimeoutError("translation timed out")
-
-
 def main() -> int:
     config = load_json(CONFIG_FILE)
     if not config:
@@ -86,15 +84,15 @@ def main() -> int:
     per_channel_limit = safe_int(limits.get("perChannelFeedLimit"), 5, 1, 15)
     feed_size = safe_int(limits.get("feedSize"), 100, 10, 500)
     feed_channel_limit = safe_int(limits.get("feedChannelLimit"), 30, 5, 100)
-    ai_keywords = load_ai_keywords(config.get("aiKeywords"))
+    ai_keywords = compile_ai_keywords(load_ai_keywords(config.get("aiKeywords")))
 
     translator, cache = init_translator()
     translation_state = {"failures": 0, "disabled": False}
+    batch_translator = BatchTranslator(translator, cache, translation_state, label="[yt-watchlist]")
+    validators = FeedValidatorStore(FEED_VALIDATORS_FILE)
     now = datetime.now(timezone.utc).isoformat()
 
-    watchlist_channels = []
-    all_items: list[dict[str, Any]] = []
-
+    fetched_channels: list[tuple[dict[str, Any], list[NewsItem], bool]] = []
     for ch_cfg in channels[:feed_channel_limit]:
         channel_id = safe_text(ch_cfg.get("channelId", ""))
         channel_name = safe_text(ch_cfg.get("name", ""))
@@ -103,31 +101,54 @@ def main() -> int:
         if not channel_id:
             continue
 
-        entries = fetch_channel_feed(channel_id)
-        entries = entries[:per_channel_limit]
+        url = channel_feed_url(channel_id)
+        fetched = fetch_channel_feed(channel_id, validators, per_channel_limit)
+        cached_items = validators.cached_items(url) if fetched["notModified"] else None
+        if cached_items is not None:
+            channel_items = to_news_items(cached_items[:per_channel_limit])
+        else:
+            channel_items = []
+            for entry in fetched["entries"]:
+                item = normalize_entry(entry, channel_id, channel_name, tags)
+                if item:
+                    channel_items.append(item)
+            if fetched["bodyHash"]:
+                validators.update(
+                    url, fetched["validators"], fetched["bodyHash"], [item.to_dict() for item in channel_items]
+                )
+        fetched_channels.append((ch_cfg, channel_items, cached_items is not None))
 
+    watchlist_channels = []
+    all_items: list[NewsItem] = []
+
+    for ch_cfg, channel_items, unchanged in fetched_channels:
         latest_at = ""
         ai_video_count = 0
-        for entry in entries:
-            item = normalize_entry(entry, channel_id, channel_name, tags, translator, cache, translation_state)
-            if item and is_ai_related_item(item, ai_keywords):
+        for item in channel_items:
+            if is_ai_related_item(item, ai_keywords):
                 all_items.append(item)
                 ai_video_count += 1
                 if item["publishedAt"] > latest_at:
                     latest_at = item["publishedAt"]
 
+        channel_name = safe_text(ch_cfg.get("name", ""))
         watchlist_channels.append({
-            "channelId": channel_id,
+            "channelId": safe_text(ch_cfg.get("channelId", "")),
             "name": channel_name,
-            "tags": tags,
+            "tags": ch_cfg.get("tags", []) if isinstance(ch_cfg.get("tags"), list) else [],
             "latestVideoAt": latest_at or now,
             "videoCount": ai_video_count,
         })
 
-        print(f"[yt-watchlist] {channel_name}: raw={len(entries)} ai={ai_video_count}")
+        print(
+            f"[yt-watchlist] {channel_name}: raw={len(channel_items)} ai={ai_video_count}"
+            + (" (unchanged)" if unchanged else "")
+        )
 
-    all_items.sort(key=lambda x: x.get("publishedAt", ""), reverse=True)
+    all_items.sort(key=lambda x: x.published_ts or 0.0, reverse=True)
     deduped = dedupe_items(all_items)[:feed_size]
+    # Only videos that passed the AI filter, dedupe and the feed_size cut get translated.
+    translate_items(deduped, batch_translator)
 
     if not deduped:
         deduped = [build_fallback_item(now)]
@@ -147,35 +168,48 @@ def main() -> int:
     }
     write_json(FEED_OUT, feed_payload)
 
-    save_translation_cache(cache)
+    validators.save()
+    cache.close()
 
     print(f"[yt-watchlist] done: channels={len(watchlist_channels)} items={len(deduped)}")
     return 0
 
 
-def fetch_channel_feed(channel_id: str) -> list[dict[str, Any]]:
-    url = YT_RSS_TEMPLATE.format(channel_id=channel_id)
+def channel_feed_url(channel_id: str) -> str:
+    base = (os.getenv(YT_RSS_BASE_ENV, "").strip() or DEFAULT_YT_RSS_BASE).rstrip("/")
+    return f"{base}/feeds/videos.xml?channel_id={channel_id}"
+
+
+def fetch_channel_feed(
+    channel_id: str, validators: FeedValidatorStore | None = None, limit: int | None = None
+) -> dict[str, Any]:
+    """Fetch one channel RSS (at most `limit` entries); notModified means the stored items can be reused."""
+    url = channel_feed_url(channel_id)
+    result: dict[str, Any] = {"entries": [], "notModified": False, "validators": {}, "bodyHash": ""}
+    headers = validators.request_headers(url) if validators else {}
     try:
-        resp = requests.get(url, timeout=DEFAULT_TIMEOUT)
+        resp = news_http.get(url, headers=headers, timeout=DEFAULT_TIMEOUT)
+        if resp.status_code == 304:
+            result["notModified"] = True
+            return result
         if not resp.ok:
             print(f"[yt-watchlist] RSS fetch failed: {resp.status_code} channel={channel_id}", file=sys.stderr)
-            return []
-        feed = feedparser.parse(resp.text)
-        return feed.entries if hasattr(feed, "entries") else []
+            return result
+        body_hash = content_hash(resp.content)
+        if validators and validators.is_unchanged(url, body_hash):
+            result["notModified"] = True
+            return result
+        result["entries"] = parse_entries(resp.content, limit).entries
+        result["validators"] = response_validators(resp.headers)
+        result["bodyHash"] = body_hash
+        return result
     except Exception as err:
         print(f"[yt-watchlist] RSS error channel={channel_id}: {err}", file=sys.stderr)
-        return []
-
-
-def normalize_entry(
-    entry: Any,
-    channel_id: str,
-    channel_name: str,
-    tags: list[str],
-    translator: Any,
-    cache: dict[str, str],
-    translation_state: dict[str, Any],
-) -> dict[str, Any] | None:
+        return result
+
+
+def normalize_entry(entry: Any, channel_id: str, channel_name: str, tags: list[str]) -> NewsItem | None:
+    """Normalize one RSS entry; zh fields hold the original text until translate_items runs."""
     title_original = safe_text(getattr(entry, "title", ""))
     if not title_original:
         return None
@@ -197,26 +231,18 @@ def normalize_entry(
     summary_original = safe_text(getattr(entry, "summary", "")) or title_original
     summary_original = truncate_text(summary_original, SUMMARY_MAX_LEN)
 
-    title_zh = translate_text(title_original, translator, cache, translation_state)
-    summary_zh = (
-        translate_text(summary_original, translator, cache, translation_state)
-        if summary_original != title_original
-        else title_zh
-    )
-    has_translation = bool(title_zh and title_zh != title_original)
-
     source_url = f"https://www.youtube.com/watch?v={video_id}" if video_id else link
 
     content_tags = dedupe(["YouTube监控"] + [safe_text(t) for t in tags if safe_text(t)])[:8]
 
-    return {
+    return NewsItem.from_dict({
         "title": f"{author} · YouTube监控",
         "titleOriginal": title_original,
-        "titleZh": title_zh or title_original,
-        "summary": summary_zh or summary_original or "暂无摘要",
+        "titleZh": title_original,
+        "summary": summary_original or "暂无摘要",
         "summaryOriginal": summary_original,
-        "summaryZh": summary_zh or summary_original,
-        "hasTranslation": has_translation,
+        "summaryZh": summary_original,
+        "hasTranslation": False,
         "platform": "YouTube",
         "region": "海外",
         "industryStage": "中游",
@@ -231,7 +257,7 @@ def normalize_entry(
             "videoId": video_id,
             "thumbnailUrl": thumbnail,
         },
-    }
+    })
 
 
 def build_fallback_item(now: str) -> dict[str, Any]:
@@ -269,58 +295,39 @@ def dedupe_items(items: list[dict[str, Any]]) -> list[dict[str, Any]]:
     return result
 
 
-def init_translator() -> tuple[Any, dict[str, str]]:
-    cache = load_translation_cache()
+def init_translator() -> tuple[Any, TranslationCache]:
+    cache = open_translation_cache()
     if GoogleTranslator is None:
         return None, cache
     try:
-        return GoogleTranslator(source="en", target="zh-CN"), cache
+        return point_translator(GoogleTranslator(source="en", target="zh-CN")), cache
     except Exception:
         return None, cache
 
 
-def translate_via_service(text: str, translator: Any) -> str:
-    if hasattr(signal, "SIGALRM") and hasattr(signal, "setitimer"):
-        previous_handler = signal.getsignal(signal.SIGALRM)
-        try:
-            signal.signal(signal.SIGALRM, _translation_timeout_handler)
-            signal.setitimer(signal.ITIMER_REAL, TRANSLATION_TIMEOUT_SECONDS)
-            return translator.translate(text)
-        finally:
-            signal.setitimer(signal.ITIMER_REAL, 0)
-            signal.signal(signal.SIGALRM, previous_handler)
-
-    return translator.translate(text)
-
-
-def translate_text(text: str, translator: Any, cache: dict[str, str], translation_state: dict[str, Any]) -> str:
-    if not text or not translator or translation_state.get("disabled"):
-        return text
-    if has_cjk(text):
+def translate_text(text: str, translator: BatchTranslator) -> str:
+    if not text or has_cjk(text):
         return text
+    return translator.lookup(text) or text
 
-    cache_key = f"zh::{text}"
-    if cache_key in cache:
-        return cache[cache_key]
 
-    try:
-        result = translate_via_service(text, translator)
-        translation_state["failures"] = 0
-        if result:
-            cache[cache_key] = result
-            return result
-    except Exception as err:
-        failures = int(translation_state.get("failures", 0)) + 1
-        translation_state["failures"] = failures
-        if failures >= TRANSLATION_FAILURE_LIMIT and not translation_state.get("disabled"):
-            translation_state["disabled"] = True
-            print(
-                f"[yt-watchlist] translation disabled after {failures} failures: {type(err).__name__}: {err}",
-                file=sys.stderr,
-            )
-        else:
-            print(f"[yt-watchlist] translate error: {err}", file=sys.stderr)
-    return text
+def translate_items(items: list[dict[str, Any]], translator: BatchTranslator) -> None:
+    """Fill the zh fields of normalized items in one batched pass; run it on the final feed only."""
+    for item in items:
+        translator.add(item["titleOriginal"])
+        if item["summaryOriginal"] != item["titleOriginal"]:
+            translator.add(item["summaryOriginal"])
+    translator.flush()
+
+    for item in items:
+        title_original = item["titleOriginal"]
+        summary_original = item["summaryOriginal"]
+        title_zh = translate_text(title_original, translator)
+        summary_zh = translate_text(summary_original, translator) if summary_original != title_original else title_zh
+        item["titleZh"] = title_zh or title_original
+        item["summary"] = summary_zh or summary_original or "暂无摘要"
+        item["summaryZh"] = summary_zh or summary_original
+        item["hasTranslation"] = bool(title_zh and title_zh != title_original)
 
 
 def has_cjk(text: str) -> bool:
@@ -341,23 +348,21 @@ def load_ai_keywords(raw: Any) -> list[str]:
     return normalized
 
 
-def is_ai_related_item(item: dict[str, Any], ai_keywords: list[str]) -> bool:
+def compile_ai_keywords(ai_keywords: list[str]) -> KeywordMatcher:
+    """Short ASCII keywords ("ai", "rag") only match as whole words; the rest match as substrings."""
+    matcher = KeywordMatcher()
+    for kw in ai_keywords:
+        matcher.add(kw, kw, word_boundary=is_ascii_word(kw) and len(kw) <= 3)
+    return matcher
+
+
+def is_ai_related_item(item: dict[str, Any], ai_keywords: KeywordMatcher) -> bool:
     title = safe_text(item.get("titleOriginal") or item.get("title") or "")
-    pool = title.lower()
-    return contains_ai_keyword(pool, ai_keywords)
+    return contains_ai_keyword(title, ai_keywords)
 
 
-def contains_ai_keyword(text: str, ai_keywords: list[str]) -> bool:
-    for kw in ai_keywords:
-        if not kw:
-            continue
-        if is_ascii_word(kw) and len(kw) <= 3:
-            if re.search(rf"\b{re.escape(kw)}\b", text):
-                return True
-            continue
-        if kw in text:
-            return True
-    return False
+def contains_ai_keyword(text: str, ai_keywords: KeywordMatcher) -> bool:
+    return ai_keywords.contains_any(text)
 
 
 def is_ascii_word(value: str) -> bool:
@@ -370,22 +375,6 @@ def truncate_text(text: str, limit: int) -> str:
     return f"{text[:limit]}..."
 
 
-def load_translation_cache() -> dict[str, str]:
-    try:
-        return json.loads(TRANSLATION_CACHE_FILE.read_text(encoding="utf-8"))
-    except Exception:
-        return {}
-
-
-def save_translation_cache(cache: dict[str, str]) -> None:
-    try:
-        TRANSLATION_CACHE_FILE.write_text(
-            json.dumps(cache, ensure_ascii=False, indent=2), encoding="utf-8"
-        )
-    except Exception as err:
-        print(f"[yt-watchlist] cache save error: {err}", file=sys.stderr)
-
-
 def load_json(path: Path) -> dict[str, Any]:
     try:
         return json.loads(path.read_text(encoding="utf-8"))
@@ -395,7 +384,7 @@ def load_json(path: Path) -> dict[str, Any]:
 
 def write_json(path: Path, payload: dict[str, Any]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2, default=json_default), encoding="utf-8")
 
 
 def safe_text(value: Any) -> str:
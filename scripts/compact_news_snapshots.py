@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""Compact D1 news history into the content-addressed tables and apply retention.
+
+news_snapshots stored a full copy of every item on every run. History now
+lives in news_contents (one row per distinct content hash) plus
+news_run_items (run -> url -> hash links); see d1/migration_009. This job:
+
+1. migrate: moves legacy news_snapshots rows into the new tables page by page
+   (each page is one D1 batch, so a crash never loses or duplicates rows);
+2. retention: keeps every run of the last --keep-days days, the last run of
+   each day up to --daily-days, and the last run of each ISO week beyond;
+3. gc: deletes news_contents rows no remaining run links to.
+
+Every step is idempotent. Runs against D1 over the HTTP API (same env as
+update_news.py), or against a local SQLite file with --sqlite.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from d1_client import NEWS_COLUMNS, D1Client, D1Error, Statement, insert_statements, news_row_hash
+
+ROOT = Path(__file__).resolve().parent.parent
+CONTENT_STORE_MIGRATION = ROOT / "d1" / "migration_009_content_store.sql"
+
+DEFAULT_KEEP_DAYS = 14
+DEFAULT_DAILY_DAYS = 90
+MIGRATE_PAGE_SIZE = 200
+DELETE_CHUNK = 50
+
+
+def table_exists(client: D1Client, name: str) -> bool:
+    rows = client.select("SELECT name FROM sqlite_master WHERE type = 'table' AND name = ?", [name])
+    return bool(rows)
+
+
+def count_rows(client: D1Client, table: str) -> int:
+    if not table_exists(client, table):
+        return 0
+    rows = client.select(f"SELECT COUNT(*) AS n FROM {table}")
+    return int(rows[0]["n"]) if rows else 0
+
+
+def migrate_snapshots(client: D1Client, page_size: int = MIGRATE_PAGE_SIZE) -> int:
+    if not table_exists(client, "news_snapshots"):
+        return 0
+    columns = ", ".join(NEWS_COLUMNS)
+    moved = 0
+    while True:
+        rows = client.select(
+            f"SELECT id, run_id, captured_at, {columns} FROM news_snapshots ORDER BY id LIMIT ?",
+            [page_size],
+        )
+        if not rows:
+            return moved
+
+        contents: list[list[Any]] = []
+        links: list[list[Any]] = []
+        for row in rows:
+            values = [row[column] for column in NEWS_COLUMNS]
+            values[NEWS_COLUMNS.index("has_translation")] = int(bool(values[NEWS_COLUMNS.index("has_translation")]))
+            row_hash = news_row_hash(values)
+            contents.append([row_hash] + values + [row["captured_at"]])
+            links.append([row["run_id"], row["source_url"], row_hash, row["captured_at"]])
+
+        statements: list[Statement] = insert_statements(
+            f"INSERT OR IGNORE INTO news_contents (content_hash, {columns}, first_seen_at) VALUES\n",
+            contents,
+        )
+        statements += insert_statements(
+            "INSERT OR IGNORE INTO news_run_items (run_id, source_url, content_hash, captured_at) VALUES\n",
+            links,
+        )
+        statements.append(("DELETE FROM news_snapshots WHERE id <= ?", [rows[-1]["id"]]))
+        client.batch(statements)
+        moved += len(rows)
+
+
+def parse_finished_at(value: Any) -> dt.datetime | None:
+    try:
+        parsed = dt.datetime.fromisoformat(str(value or "").replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=dt.timezone.utc)
+
+
+def runs_to_drop(
+    runs: list[dict[str, Any]],
+    now: dt.datetime,
+    keep_days: int = DEFAULT_KEEP_DAYS,
+    daily_days: int = DEFAULT_DAILY_DAYS,
+) -> list[str]:
+    """Run ids outside the retention tiers (full -> one per day -> one per ISO week)."""
+    kept_buckets: set[tuple[Any, ...]] = set()
+    drop: list[str] = []
+    ordered = sorted(runs, key=lambda run: str(run.get("finished_at", "")), reverse=True)
+    for run in ordered:
+        finished = parse_finished_at(run.get("finished_at"))
+        if finished is None:
+            continue
+        age_days = (now - finished).total_seconds() / 86400
+        if age_days <= keep_days:
+            continue
+        if age_days <= daily_days:
+            bucket: tuple[Any, ...] = ("day", finished.date().isoformat())
+        else:
+            bucket = ("week",) + tuple(finished.isocalendar()[:2])
+        if bucket in kept_buckets:
+            drop.append(str(run["run_id"]))
+        else:
+            kept_buckets.add(bucket)
+    return drop
+
+
+def apply_retention(client: D1Client, drop: list[str]) -> None:
+    for start in range(0, len(drop), DELETE_CHUNK):
+        chunk = drop[start : start + DELETE_CHUNK]
+        marks = ", ".join(["?"] * len(chunk))
+        client.batch(
+            [
+                (f"DELETE FROM news_run_items WHERE run_id IN ({marks})", chunk),
+                (f"DELETE FROM fetch_runs WHERE run_id IN ({marks})", chunk),
+            ]
+        )
+
+
+def collect_garbage(client: D1Client) -> int:
+    before = count_rows(client, "news_contents")
+    client.query(
+        "DELETE FROM news_contents WHERE NOT EXISTS "
+        "(SELECT 1 FROM news_run_items r WHERE r.content_hash = news_contents.content_hash)"
+    )
+    return before - count_rows(client, "news_contents")
+
+
+def compact(
+    client: D1Client,
+    keep_days: int = DEFAULT_KEEP_DAYS,
+    daily_days: int = DEFAULT_DAILY_DAYS,
+    dry_run: bool = False,
+    now: dt.datetime | None = None,
+) -> dict[str, int]:
+    now = now or dt.datetime.now(tz=dt.timezone.utc)
+    stats = {"snapshotsMigrated": 0, "runsDropped": 0, "contentsRemoved": 0}
+    runs = client.select("SELECT run_id, finished_at FROM fetch_runs")
+    drop = runs_to_drop(runs, now, keep_days, daily_days)
+    stats["runsDropped"] = len(drop)
+    if dry_run:
+        stats["snapshotsMigrated"] = count_rows(client, "news_snapshots")
+        return stats
+
+    stats["snapshotsMigrated"] = migrate_snapshots(client)
+    apply_retention(client, drop)
+    stats["contentsRemoved"] = collect_garbage(client)
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Migrate and downsample D1 news history.")
+    parser.add_argument("--database", default=os.getenv("D1_DATABASE_NAME", "cyrus-ai-news"))
+    parser.add_argument("--sqlite", type=Path, help="compact a local SQLite file instead of D1")
+    parser.add_argument("--keep-days", type=int, default=DEFAULT_KEEP_DAYS)
+    parser.add_argument("--daily-days", type=int, default=DEFAULT_DAILY_DAYS)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    server = None
+    if args.sqlite:
+        from d1_local_server import start_local_server
+
+        server, base_url = start_local_server(str(args.sqlite), [CONTENT_STORE_MIGRATION])
+        client = D1Client("local", "local", database_id="local", base_url=base_url)
+    else:
+        client = D1Client.from_env(args.database)
+        if client is None:
+            print("[WARN] CLOUDFLARE_ACCOUNT_ID / CLOUDFLARE_API_TOKEN not configured", file=sys.stderr)
+            sys.exit(1)
+
+    started = time.monotonic()
+    try:
+        with client:
+            stats = compact(client, args.keep_days, args.daily_days, args.dry_run)
+            sizes = {table: count_rows(client, table) for table in ("fetch_runs", "news_contents", "news_run_items")}
+    except D1Error as exc:
+        print(f"[WARN] D1 compaction failed: {exc}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    label = "[DRY-RUN]" if args.dry_run else "[OK]"
+    summary = " ".join(f"{key}={value}" for key, value in {**stats, **sizes}.items())
+    print(f"{label} news history compacted in {time.monotonic() - started:.2f}s {summary}")
+
+
+if __name__ == "__main__":
+    main()
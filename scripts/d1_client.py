@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""Cloudflare D1 client over the HTTP query API.
+
+update_news.py used to write a temp SQL file and shell out to
+`wrangler d1 execute` on every run, paying Node/wrangler startup and relying
+on string-concatenated literals. D1Client talks to
+`/accounts/{account}/d1/database/{id}/query` directly:
+
+- requests go through news_http (the pooled keep-alive session the fetchers
+  share) and so follow its retry policy: backoff on connection errors, 429
+  and 5xx, Retry-After capped at news_http.MAX_RETRY_WAIT, and no retry
+  after a read timeout, when the statements may already have run,
+- parameterized statements (`?` placeholders), sent as `{"batch": [...]}`
+  requests of at most D1_BATCH_STATEMENTS statements / D1_BATCH_BYTES.
+  Callers still keep statements idempotent (INSERT OR IGNORE, upserts,
+  deletes), so a batch re-sent by the next run is harmless.
+
+insert_statements() builds multi-row INSERTs that respect D1's
+bound-parameter and statement-size limits. render_script() inlines the
+parameters again for the wrangler fallback (local `D1_REMOTE=0` runs).
+
+Set D1_API_BASE to point the client at scripts/d1_local_server.py for
+offline runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Iterable
+
+import requests
+
+import news_http
+
+D1_API_BASE_ENV = "D1_API_BASE"
+D1_DATABASE_ID_ENV = "D1_DATABASE_ID"
+DEFAULT_D1_API_BASE = "https://api.cloudflare.com/client/v4"
+
+# D1 allows 100 bound parameters and 100 KB per statement.
+D1_MAX_BOUND_PARAMS = 100
+D1_MAX_STATEMENT_BYTES = 90_000
+D1_BATCH_STATEMENTS = 50
+D1_BATCH_BYTES = 900_000
+D1_TIMEOUT_SECONDS = 20
+D1_RETRIES = 3
+D1_RETRY_STATUS = {429, 500, 502, 503, 504}
+
+Statement = tuple[str, list[Any]]
+
+# Content columns shared by latest_news and news_contents, in row order.
+NEWS_COLUMNS = (
+    "source_url",
+    "source_name",
+    "platform",
+    "region",
+    "industry_stage",
+    "title_original",
+    "title_zh",
+    "summary_original",
+    "summary_zh",
+    "has_translation",
+    "action",
+    "published_at",
+    "date",
+    "content_tags_json",
+)
+
+
+class D1Error(RuntimeError):
+    pass
+
+
+def sql_literal(value: Any) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def render_statement(sql: str, params: list[Any]) -> str:
+    parts = sql.split("?")
+    if len(parts) != len(params) + 1:
+        raise ValueError(f"statement has {len(parts) - 1} placeholders but {len(params)} params")
+    out = [parts[0]]
+    for value, part in zip(params, parts[1:]):
+        out.append(sql_literal(value))
+        out.append(part)
+    return "".join(out)
+
+
+def render_script(statements: Iterable[Statement]) -> str:
+    """Inline parameters into a `wrangler d1 execute --file` script."""
+    return "\n".join(render_statement(sql, params) + ";" for sql, params in statements) + "\n"
+
+
+def news_row_hash(row: list[Any]) -> str:
+    """Content address of a NEWS_COLUMNS row (has_translation as 0/1)."""
+    return hashlib.sha256(json.dumps(list(row), ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def insert_statements(head: str, rows: list[list[Any]], tail: str = "") -> list[Statement]:
+    """Pack rows into multi-row `head VALUES (?, ...), ... tail` statements.
+
+    Each statement stays under D1_MAX_BOUND_PARAMS parameters and roughly
+    D1_MAX_STATEMENT_BYTES of SQL plus parameter payload.
+    """
+    statements: list[Statement] = []
+    if not rows:
+        return statements
+
+    width = len(rows[0])
+    placeholder = "(" + ", ".join(["?"] * width) + ")"
+    per_statement = max(1, D1_MAX_BOUND_PARAMS // width)
+    base = len(head.encode("utf-8")) + len(tail.encode("utf-8"))
+
+    def flush(batch: list[list[Any]]) -> None:
+        sql = head + ",\n".join([placeholder] * len(batch)) + tail
+        statements.append((sql, [value for row in batch for value in row]))
+
+    batch: list[list[Any]] = []
+    size = base
+    for row in rows:
+        row_bytes = len(placeholder) + 2 + sum(len(str(value).encode("utf-8")) for value in row)
+        if batch and (len(batch) >= per_statement or size + row_bytes > D1_MAX_STATEMENT_BYTES):
+            flush(batch)
+            batch = []
+            size = base
+        batch.append(row)
+        size += row_bytes
+    flush(batch)
+    return statements
+
+
+class D1Client:
+    def __init__(
+        self,
+        account_id: str,
+        api_token: str,
+        database_id: str = "",
+        database_name: str = "",
+        base_url: str | None = None,
+        timeout: float = D1_TIMEOUT_SECONDS,
+        retries: int = D1_RETRIES,
+    ) -> None:
+        self.account_id = account_id
+        self.database_name = database_name
+        self._database_id = database_id
+        self.base_url = (base_url or os.getenv(D1_API_BASE_ENV) or DEFAULT_D1_API_BASE).rstrip("/")
+        self.timeout = timeout
+        self.retries = max(0, retries)
+        self.requests = 0
+        self.headers = {"Authorization": f"Bearer {api_token}", "Content-Type": "application/json"}
+
+    @classmethod
+    def from_env(cls, database_name: str) -> "D1Client" | None:
+        """Client from CLOUDFLARE_ACCOUNT_ID / CLOUDFLARE_API_TOKEN, or None if either is missing."""
+        account_id = os.getenv("CLOUDFLARE_ACCOUNT_ID", "").strip()
+        api_token = os.getenv("CLOUDFLARE_API_TOKEN", "").strip()
+        if not account_id or not api_token:
+            return None
+        return cls(
+            account_id,
+            api_token,
+            database_id=os.getenv(D1_DATABASE_ID_ENV, "").strip(),
+            database_name=database_name,
+        )
+
+    def close(self) -> None:
+        """Nothing to release: connections belong to the shared news_http session."""
+
+    def __enter__(self) -> "D1Client":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _call(self, method: str, path: str, **kwargs: Any) -> Any:
+        url = f"{self.base_url}/accounts/{self.account_id}/d1/database{path}"
+        try:
+            resp = news_http.request(
+                method,
+                url,
+                retries=self.retries,
+                retry_status=D1_RETRY_STATUS,
+                on_attempt=self._count_attempt,
+                headers=self.headers,
+                timeout=self.timeout,
+                **kwargs,
+            )
+        except (requests.ConnectionError, requests.Timeout) as exc:
+            raise D1Error(f"{method} {path}: {exc}") from exc
+
+        try:
+            body = resp.json()
+        except ValueError:
+            body = {}
+        if resp.status_code >= 400 or not body.get("success", False):
+            errors = body.get("errors") or [{"message": resp.text[:300]}]
+            message = "; ".join(str(err.get("message", err)) for err in errors if isinstance(err, dict))
+            raise D1Error(f"{method} {path}: HTTP {resp.status_code} {message}")
+        return body.get("result")
+
+    def _count_attempt(self, timing: news_http.RequestTiming) -> None:
+        self.requests += 1
+
+    @property
+    def database_id(self) -> str:
+        if not self._database_id:
+            if not self.database_name:
+                raise D1Error("no D1 database id or name configured")
+            rows = self._call("GET", "", params={"name": self.database_name}) or []
+            match = next((row for row in rows if row.get("name") == self.database_name), None)
+            if not match:
+                raise D1Error(f"D1 database not found: {self.database_name}")
+            self._database_id = str(match.get("uuid", ""))
+        return self._database_id
+
+    def query(self, sql: str, params: list[Any] | None = None) -> list[dict[str, Any]]:
+        """Run one statement (or a parameterless multi-statement script)."""
+        body: dict[str, Any] = {"sql": sql}
+        if params:
+            body["params"] = params
+        result = self._call("POST", f"/{self.database_id}/query", data=json.dumps(body, ensure_ascii=False))
+        return result or []
+
+    def select(self, sql: str, params: list[Any] | None = None) -> list[dict[str, Any]]:
+        """Rows returned by a single SELECT."""
+        result = self.query(sql, params)
+        return result[0].get("results", []) if result else []
+
+    def batch(self, statements: list[Statement]) -> list[dict[str, Any]]:
+        """Run statements in order, packed into as few requests as the batch limits allow.
+
+        Each request is one D1 batch, which D1 executes as a transaction.
+        """
+        results: list[dict[str, Any]] = []
+        chunk: list[dict[str, Any]] = []
+        chunk_bytes = 0
+        for sql, params in statements:
+            entry = {"sql": sql, "params": params}
+            entry_bytes = len(json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+            if chunk and (len(chunk) >= D1_BATCH_STATEMENTS or chunk_bytes + entry_bytes > D1_BATCH_BYTES):
+                results.extend(self._send_batch(chunk))
+                chunk = []
+                chunk_bytes = 0
+            chunk.append(entry)
+            chunk_bytes += entry_bytes
+        if chunk:
+            results.extend(self._send_batch(chunk))
+        return results
+
+    def _send_batch(self, chunk: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        payload = json.dumps({"batch": chunk}, ensure_ascii=False).encode("utf-8")
+        return self._call("POST", f"/{self.database_id}/query", data=payload) or []
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a SQL file against D1 over the HTTP API.")
+    parser.add_argument("--database", default=os.getenv("D1_DATABASE_NAME", "cyrus-ai-news"))
+    parser.add_argument("--file", required=True, type=Path)
+    args = parser.parse_args()
+
+    client = D1Client.from_env(args.database)
+    if client is None:
+        print("[WARN] CLOUDFLARE_ACCOUNT_ID / CLOUDFLARE_API_TOKEN not configured", file=sys.stderr)
+        sys.exit(1)
+    with client:
+        started = time.monotonic()
+        client.query(args.file.read_text(encoding="utf-8"))
+        print(f"[OK] D1 executed {args.file} in {time.monotonic() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""SQLite-backed stand-in for the Cloudflare D1 HTTP query API.
+
+Serves the subset of endpoints D1Client uses, so the D1 sync can run
+offline:
+
+- GET  /client/v4/accounts/<account>/d1/database?name=<name>
+- POST /client/v4/accounts/<account>/d1/database/<id>/query
+  with `{"sql", "params"}` or `{"batch": [{"sql", "params"}, ...]}`
+  (a batch runs in one transaction, like D1)
+
+Responses use the Cloudflare envelope (`success`, `errors`, `result`).
+
+    python scripts/d1_local_server.py --db /tmp/d1.sqlite3 --schema d1/schema.sql
+    D1_API_BASE=http://127.0.0.1:8788/client/v4 CLOUDFLARE_ACCOUNT_ID=local \\
+        CLOUDFLARE_API_TOKEN=local python scripts/update_news.py
+
+--fail-first N answers the first N queries with HTTP 503 to exercise retries.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+DATABASE_PATH = re.compile(r"^/client/v4/accounts/[^/]+/d1/database(?:/([^/]+)/query)?/?$")
+
+
+class LocalD1:
+    def __init__(self, db_path: str, schema_files: list[Path] | None = None, fail_first: int = 0) -> None:
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.lock = threading.Lock()
+        self.fail_remaining = fail_first
+        for path in schema_files or []:
+            self.conn.executescript(path.read_text(encoding="utf-8"))
+
+    def run(self, statements: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        with self.lock:
+            results = []
+            self.conn.execute("BEGIN")
+            try:
+                for statement in statements:
+                    results.append(self._execute(statement.get("sql", ""), statement.get("params") or []))
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            return results
+
+    def _execute(self, sql: str, params: list[Any]) -> dict[str, Any]:
+        started = time.perf_counter()
+        before = self.conn.total_changes
+        chunks = [sql] if params else split_script(sql)
+        rows: list[dict[str, Any]] = []
+        for chunk in chunks:
+            # A parameterless multi-statement script (migrations) runs statement by statement.
+            rows = [dict(row) for row in self.conn.execute(chunk, params).fetchall()]
+        return {
+            "results": rows,
+            "success": True,
+            "meta": {
+                "changes": self.conn.total_changes - before,
+                "last_row_id": self.conn.execute("SELECT last_insert_rowid()").fetchone()[0],
+                "duration": round((time.perf_counter() - started) * 1000, 3),
+            },
+        }
+
+
+def split_script(sql: str) -> list[str]:
+    statements: list[str] = []
+    current = ""
+    for line in sql.splitlines(keepends=True):
+        current += line
+        if sqlite3.complete_statement(current):
+            if current.strip():
+                statements.append(current)
+            current = ""
+    if any(line.strip() and not line.strip().startswith("--") for line in current.splitlines()):
+        statements.append(current)
+    return statements
+
+
+def make_handler(d1: LocalD1) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+        def _reply(self, status: int, body: dict[str, Any]) -> None:
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _error(self, status: int, code: int, message: str) -> None:
+            self._reply(status, {"success": False, "errors": [{"code": code, "message": message}], "messages": [], "result": None})
+
+        def do_GET(self) -> None:
+            parsed = urlparse(self.path)
+            match = DATABASE_PATH.match(parsed.path)
+            if not match or match.group(1):
+                self._error(404, 7000, "No route for that URI")
+                return
+            name = (parse_qs(parsed.query).get("name") or ["local"])[0]
+            self._reply(200, {"success": True, "errors": [], "messages": [], "result": [{"uuid": f"local-{name}", "name": name}]})
+
+        def do_POST(self) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length)
+            match = DATABASE_PATH.match(urlparse(self.path).path)
+            if not match or not match.group(1):
+                self._error(404, 7000, "No route for that URI")
+                return
+            if d1.fail_remaining > 0:
+                d1.fail_remaining -= 1
+                self._error(503, 7500, "injected failure")
+                return
+            try:
+                body = json.loads(raw or b"{}")
+                statements = body["batch"] if "batch" in body else [body]
+                results = d1.run(statements)
+            except (ValueError, KeyError, sqlite3.Error) as exc:
+                self._error(400, 7500, f"{type(exc).__name__}: {exc}")
+                return
+            self._reply(200, {"success": True, "errors": [], "messages": [], "result": results})
+
+    return Handler
+
+
+def start_local_server(
+    db_path: str = ":memory:",
+    schema_files: list[Path] | None = None,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    fail_first: int = 0,
+) -> tuple[ThreadingHTTPServer, str]:
+    """Start the stand-in on a daemon thread; returns (server, D1_API_BASE url)."""
+    d1 = LocalD1(db_path, schema_files, fail_first)
+    server = ThreadingHTTPServer((host, port), make_handler(d1))
+    server.d1 = d1  # type: ignore[attr-defined]
+    threading.Thread(target=server.serve_forever, name="d1-local", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/client/v4"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve a local SQLite database through the D1 HTTP query API.")
+    parser.add_argument("--db", default=":memory:")
+    parser.add_argument("--schema", action="append", type=Path, default=[], help="SQL file to apply at startup (repeatable)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8788)
+    parser.add_argument("--fail-first", type=int, default=0)
+    args = parser.parse_args()
+
+    d1 = LocalD1(args.db, args.schema, args.fail_first)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(d1))
+    print(f"[d1-local] serving {args.db} at http://{args.host}:{args.port}/client/v4")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""Streaming RSS 2.0 / Atom parser for the feed fields the builders read.
+
+feedparser.parse() decodes, sanitizes and maps every element of the whole
+document, and update_news.py / build_yt_watchlist.py then keep only the first
+PER_SOURCE_LIMIT * 3 / perChannelFeedLimit entries. parse_entries() walks the
+document with ElementTree.iterparse instead, extracts only id, title, summary,
+link, author, published/updated (+ *_parsed), yt:videoId and media:thumbnail,
+and stops reading once `limit` entries are collected -- or, given a `known`
+predicate, once a newest-first feed reaches a run of already-seen entries.
+
+Entries are FeedEntry objects with the same attribute names and semantics
+feedparser uses for those fields (summary falls back to content /
+media:description, dc:date is `updated` and `updated` falls back to
+`published`, a permalink guid stands in for a missing link, script/style
+bodies are dropped), so normalize_item() and normalize_entry() take either.
+
+Anything the fast path does not handle -- XML errors, undeclared HTML
+entities, unsupported encodings, RSS 1.0 / Atom 0.3 roots, dates
+email.utils / fromisoformat cannot read -- falls back to feedparser for that
+feed. NEWS_FAST_FEED=0 always uses feedparser.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import email.utils
+import io
+import os
+import re
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator, NamedTuple
+
+import feedparser
+
+FAST_FEED_ENV = "NEWS_FAST_FEED"
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+MEDIA = "{http://search.yahoo.com/mrss/}"
+YT = "{http://www.youtube.com/xml/schemas/2015}"
+DC = "{http://purl.org/dc/elements/1.1/}"
+CONTENT = "{http://purl.org/rss/1.0/modules/content/}"
+
+UNSAFE_BLOCK_RE = re.compile(r"<(script|style)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+
+
+class FeedFormatError(ValueError):
+    """The document is well-formed XML but not something the fast path handles."""
+
+
+@dataclass
+class FeedEntry:
+    id: str = ""
+    title: str = ""
+    summary: str = ""
+    link: str = ""
+    author: str = ""
+    published: str = ""
+    published_parsed: time.struct_time | None = None
+    updated: str = ""
+    updated_parsed: time.struct_time | None = None
+    yt_videoid: str = ""
+    media_thumbnail: list[dict[str, str]] = field(default_factory=list)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+
+def fast_feed_enabled() -> bool:
+    return os.getenv(FAST_FEED_ENV, "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def parse_date(raw: str) -> time.struct_time | None:
+    """UTC struct_time for an RFC 822 or ISO 8601 date, as feedparser's *_parsed fields."""
+    if not raw:
+        return None
+    try:
+        parsed = email.utils.parsedate_to_datetime(raw)
+    except (TypeError, ValueError, IndexError):
+        try:
+            parsed = dt.datetime.fromisoformat(raw.replace("Z", "+00:00"))
+        except ValueError:
+            raise FeedFormatError(f"unsupported date {raw!r}") from None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=dt.timezone.utc)
+    return parsed.utctimetuple()
+
+
+def element_text(elem: ET.Element | None) -> str:
+    if elem is None:
+        return ""
+    if elem.get("type") == "xhtml":
+        return "".join(elem.itertext()).strip()
+    return (elem.text or "").strip()
+
+
+def clean_summary(text: str) -> str:
+    return UNSAFE_BLOCK_RE.sub("", text).strip() if "<" in text else text
+
+
+def thumbnails(elem: ET.Element) -> list[dict[str, str]]:
+    return [dict(thumb.attrib) for thumb in elem.iter(f"{MEDIA}thumbnail") if thumb.get("url")]
+
+
+def rss_entry(item: ET.Element) -> FeedEntry:
+    link = element_text(item.find("link"))
+    guid = item.find("guid")
+    if not link and guid is not None and guid.get("isPermaLink", "true").lower() != "false":
+        link = element_text(guid)
+    published = element_text(item.find("pubDate"))
+    updated = element_text(item.find(f"{DC}date")) or published
+    published_parsed = parse_date(published)
+    return FeedEntry(
+        id=element_text(guid),
+        title=element_text(item.find("title")),
+        summary=clean_summary(element_text(item.find("description")) or element_text(item.find(f"{CONTENT}encoded"))),
+        link=link,
+        author=element_text(item.find("author")) or element_text(item.find(f"{DC}creator")),
+        published=published,
+        published_parsed=published_parsed,
+        updated=updated,
+        updated_parsed=published_parsed if updated == published else parse_date(updated),
+        media_thumbnail=thumbnails(item),
+    )
+
+
+def atom_entry(entry: ET.Element) -> FeedEntry:
+    link = ""
+    for candidate in entry.findall(f"{ATOM}link"):
+        if candidate.get("rel", "alternate") == "alternate" and candidate.get("href"):
+            link = candidate.get("href", "").strip()
+            break
+    summary = (
+        element_text(entry.find(f"{ATOM}summary"))
+        or element_text(entry.find(f"{ATOM}content"))
+        or element_text(entry.find(f"{MEDIA}group/{MEDIA}description"))
+        or element_text(entry.find(f"{MEDIA}description"))
+    )
+    published = element_text(entry.find(f"{ATOM}published"))
+    updated = element_text(entry.find(f"{ATOM}updated")) or published
+    published_parsed = parse_date(published)
+    return FeedEntry(
+        id=element_text(entry.find(f"{ATOM}id")),
+        title=element_text(entry.find(f"{ATOM}title")),
+        summary=clean_summary(summary),
+        link=link,
+        author=element_text(entry.find(f"{ATOM}author/{ATOM}name")),
+        published=published,
+        published_parsed=published_parsed,
+        updated=updated,
+        updated_parsed=published_parsed if updated == published else parse_date(updated),
+        yt_videoid=element_text(entry.find(f"{YT}videoId")),
+        media_thumbnail=thumbnails(entry),
+    )
+
+
+def iter_entries(content: bytes) -> Iterator[FeedEntry]:
+    """Yield entries in document order; raises ET.ParseError or FeedFormatError on input it does not handle."""
+    events = ET.iterparse(io.BytesIO(content), events=("start", "end"))
+    _, root = next(events)
+    if root.tag == "rss":
+        entry_tag, build = "item", rss_entry
+    elif root.tag == f"{ATOM}feed":
+        entry_tag, build = f"{ATOM}entry", atom_entry
+    else:
+        raise FeedFormatError(f"unsupported root <{root.tag}>")
+
+    for event, elem in events:
+        if event == "end" and elem.tag == entry_tag:
+            yield build(elem)
+            elem.clear()
+
+
+class ParsedEntries(NamedTuple):
+    entries: list[Any]
+    warning: str = ""
+    stopped_at_known: bool = False
+
+
+def take_entries(
+    entries: Iterable[Any], limit: int | None, known: Callable[[Any], bool] | None, known_run: int
+) -> tuple[list[Any], bool]:
+    """Entries up to `limit`, or up to the end of the first `known_run` known entries in a row.
+
+    The known-run stop only applies while the feed looks newest-first: once an
+    entry is dated later than the one before it, every entry is read.
+    """
+    taken: list[Any] = []
+    run = 0
+    previous = None
+    ordered = True
+    for entry in entries:
+        taken.append(entry)
+        if limit is not None and len(taken) >= limit:
+            break
+        if known is None:
+            continue
+        stamp = entry.get("published_parsed") or entry.get("updated_parsed")
+        if stamp and previous and stamp > previous:
+            ordered = False
+        previous = stamp or previous
+        run = run + 1 if known(entry) else 0
+        if ordered and run >= known_run:
+            return taken, True
+    return taken, False
+
+
+def parse_entries(
+    content: bytes,
+    limit: int | None = None,
+    known: Callable[[Any], bool] | None = None,
+    known_run: int = 5,
+) -> ParsedEntries:
+    """Up to `limit` entries of a feed, the parse warning ("" if none) and whether a known run ended it.
+
+    Well-formed RSS 2.0 / Atom goes through the streaming parser and stops
+    reading as soon as take_entries() is done; everything else through
+    feedparser, whose bozo message is the warning.
+    """
+    if fast_feed_enabled():
+        try:
+            entries, stopped = take_entries(iter_entries(content), limit, known, known_run)
+            return ParsedEntries(entries, "", stopped)
+        except (ET.ParseError, FeedFormatError, ValueError, LookupError):
+            pass
+
+    parsed = feedparser.parse(content)
+    warning = ""
+    if getattr(parsed, "bozo", False) and getattr(parsed, "bozo_exception", None):
+        warning = str(parsed.bozo_exception)
+    entries, stopped = take_entries(parsed.entries, limit, known, known_run)
+    return ParsedEntries(entries, warning, stopped)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Persisted HTTP validators for RSS/Atom polling.
+
+Each feed URL remembers the ETag / Last-Modified headers and a SHA-256 of the
+last response body, together with the items that were normalized from it.
+Fetchers send If-None-Match / If-Modified-Since, and when the server answers
+304 (or returns a byte-identical body) they reuse the stored items instead of
+running feedparser and normalization again.
+
+update_news.py also keeps a per-entry index (`seen`: entry GUID/link ->
+[content fingerprint, sourceUrl of the item it produced or ""]), so a feed
+whose body changed only re-normalizes the entries that are new or edited.
+
+Used by scripts/update_news.py and scripts/build_yt_watchlist.py; each builder
+keeps its own store file under data/.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def response_validators(headers: Any) -> dict[str, str]:
+    """Pick the validator headers out of a (case-insensitive) response header map."""
+    return {
+        "ETag": str(headers.get("ETag") or ""),
+        "Last-Modified": str(headers.get("Last-Modified") or ""),
+    }
+
+
+class FeedValidatorStore:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.entries: dict[str, dict[str, Any]] = {}
+        self.touched: set[str] = set()
+        self.dirty = False
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            payload = {}
+        if isinstance(payload, dict):
+            for url, entry in payload.items():
+                if isinstance(entry, dict):
+                    self.entries[url] = entry
+
+    def request_headers(self, url: str) -> dict[str, str]:
+        """Conditional-GET headers for url; empty unless stored items can be reused."""
+        self.touched.add(url)
+        entry = self.entries.get(url)
+        if not entry or not isinstance(entry.get("items"), list):
+            return {}
+
+        headers: dict[str, str] = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = str(entry["etag"])
+        if entry.get("lastModified"):
+            headers["If-Modified-Since"] = str(entry["lastModified"])
+        return headers
+
+    def is_unchanged(self, url: str, body_hash: str) -> bool:
+        entry = self.entries.get(url)
+        if not entry or not isinstance(entry.get("items"), list):
+            return False
+        return entry.get("contentHash") == body_hash
+
+    def cached_items(self, url: str) -> list[dict[str, Any]] | None:
+        entry = self.entries.get(url)
+        if not entry or not isinstance(entry.get("items"), list):
+            return None
+        return [item for item in entry["items"] if isinstance(item, dict)]
+
+    def seen_entries(self, url: str) -> dict[str, list[str]]:
+        entry = self.entries.get(url)
+        seen = entry.get("seen") if entry else None
+        if not isinstance(seen, dict):
+            return {}
+        return {key: value for key, value in seen.items() if isinstance(value, list) and len(value) == 2}
+
+    def update(
+        self,
+        url: str,
+        validators: dict[str, str],
+        body_hash: str,
+        items: list[dict[str, Any]],
+        seen: dict[str, list[str]] | None = None,
+    ) -> None:
+        self.touched.add(url)
+        self.entries[url] = {
+            "etag": validators.get("ETag", ""),
+            "lastModified": validators.get("Last-Modified", ""),
+            "contentHash": body_hash,
+            "checkedAt": dt.datetime.now(tz=dt.timezone.utc).isoformat(),
+            "items": items,
+        }
+        if seen is not None:
+            self.entries[url]["seen"] = seen
+        self.dirty = True
+
+    def save(self) -> None:
+        """Write the store, dropping URLs that were not polled in this run."""
+        stale = [url for url in self.entries if url not in self.touched]
+        for url in stale:
+            del self.entries[url]
+        if not self.dirty and not stale:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.entries, ensure_ascii=False, indent=2), encoding="utf-8")
+        self.dirty = False
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Multi-pattern keyword matching for rule tables (Aho–Corasick).
+
+The builders classify text against several keyword tables (AI filter,
+action / stage / tag rules, X signal sets). Rather than running one substring
+check per keyword per table, every table is compiled into a single automaton
+and each text is scanned once; the scan returns the labels of every rule that
+matched.
+
+Keywords are matched case-insensitively (text is lowercased before the scan).
+A keyword can opt into word-boundary matching, which follows the semantics of
+`re`'s `\\b`: "ai" then matches "ai tools" but not "said".
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Hashable, Iterable
+
+
+def is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def at_word_boundary(text: str, index: int) -> bool:
+    before = index > 0 and is_word_char(text[index - 1])
+    after = index < len(text) and is_word_char(text[index])
+    return before != after
+
+
+class KeywordMatcher:
+    """Compile (keyword, label) pairs once, then scan texts in a single pass."""
+
+    def __init__(self, rules: Iterable[tuple[str, Hashable]] = (), word_boundary: bool = False) -> None:
+        self.word_boundary = word_boundary
+        self.patterns: list[tuple[str, Hashable, bool]] = []
+        self.compiled = False
+        for keyword, label in rules:
+            self.add(keyword, label)
+
+    def add(self, keyword: str, label: Hashable, word_boundary: bool | None = None) -> None:
+        keyword = (keyword or "").lower()
+        if not keyword:
+            return
+        boundary = self.word_boundary if word_boundary is None else word_boundary
+        self.patterns.append((keyword, label, boundary))
+        self.compiled = False
+
+    def compile(self) -> None:
+        # goto[state] maps a character to the next state; outputs[state] lists pattern ids ending there.
+        goto: list[dict[str, int]] = [{}]
+        outputs: list[list[int]] = [[]]
+        for pattern_id, (keyword, _, _) in enumerate(self.patterns):
+            state = 0
+            for ch in keyword:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    outputs.append([])
+                state = nxt
+            outputs[state].append(pattern_id)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                link = fail[state]
+                while link and ch not in goto[link]:
+                    link = fail[link]
+                fail[nxt] = goto[link].get(ch, 0)
+                outputs[nxt] = outputs[nxt] + outputs[fail[nxt]]
+
+        self.goto = goto
+        self.fail = fail
+        self.outputs = outputs
+        self.compiled = True
+
+    def scan(self, text: str) -> set[Hashable]:
+        """Return the labels of every keyword found in text."""
+        if not self.compiled:
+            self.compile()
+        if not text or not self.patterns:
+            return set()
+
+        lower = text.lower()
+        goto, fail, outputs, patterns = self.goto, self.fail, self.outputs, self.patterns
+        hits: set[Hashable] = set()
+        seen: set[int] = set()
+        state = 0
+        for index, ch in enumerate(lower):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for pattern_id in outputs[state]:
+                if pattern_id in seen:
+                    continue
+                keyword, label, boundary = patterns[pattern_id]
+                if boundary:
+                    end = index + 1
+                    if not (at_word_boundary(lower, end - len(keyword)) and at_word_boundary(lower, end)):
+                        continue
+                seen.add(pattern_id)
+                hits.add(label)
+        return hits
+
+    def contains_any(self, text: str) -> bool:
+        return bool(self.scan(text))
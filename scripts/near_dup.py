@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""Near-duplicate story detection (MinHash + LSH).
+
+The same announcement is often syndicated by several feeds with slightly
+different titles and summaries, so exact sourceUrl/title dedupe lets every
+copy through. Each story yields two sets of character shingles: its
+normalized title, and the title plus the start of its summary. Both get a
+MinHash signature split into LSH bands; only stories sharing a band bucket
+are compared, so the work stays close to linear in the number of items.
+
+Titles are compared without their source template: a leading or trailing
+" · GitHub Trending"-style segment shared by TEMPLATE_MIN_TITLES or more
+titles is dropped first, so the boilerplate cannot make two stories look
+alike. Candidates are confirmed with exact shingle Jaccard similarity. The
+titles must be at least TITLE_FLOOR similar, which keeps templated or
+boilerplate summaries from merging unrelated stories. Then either the titles
+or the title+summary documents must reach the threshold. Titles shorter
+than SHORT_TITLE_WORDS words (repo or product names) carry too little text to
+decide on their own: those pairs need similar documents, or identical titles
+when a summary is missing.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import struct
+from collections import defaultdict
+from typing import Hashable, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # optional: signatures fall back to pure Python
+    np = None
+
+SHINGLE_SIZE = 4
+SUMMARY_PREFIX_CHARS = 160
+NEAR_DUP_THRESHOLD = 0.6
+TITLE_FLOOR = 0.4
+SHORT_TITLE_WORDS = 4
+TEMPLATE_MIN_TITLES = 3
+# 64 hashes in 16 bands of 4 rows: a signature at the threshold shares a band
+# with p ~ 0.89 (~0.99 over the title and doc signatures together), while
+# unrelated titles (Jaccard ~ 0.2) collide with p ~ 0.03.
+NUM_PERM = 64
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERM // LSH_BANDS
+# One BLAKE2b digest holds at most 32 16-bit lanes; more lanes come from salted digests.
+_LANES_PER_DIGEST = 32
+
+_NON_WORD = re.compile(r"[\W_]+")
+_TITLE_SEPARATOR = re.compile(r"\s+[·|｜•–—-]\s+")
+_UNPACK = struct.Struct(f"<{_LANES_PER_DIGEST}H").unpack
+_SALTS = [bytes([index]) for index in range(NUM_PERM // _LANES_PER_DIGEST)]
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(_NON_WORD.sub(" ", (text or "").lower()).split())
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> frozenset[str]:
+    if len(text) < size:
+        return frozenset([text]) if text else frozenset()
+    return frozenset(text[index : index + size] for index in range(len(text) - size + 1))
+
+
+def strip_templates(titles: Sequence[str]) -> list[str]:
+    """Titles without leading/trailing separator segments shared by TEMPLATE_MIN_TITLES or more titles."""
+    edges: list[tuple[str, str]] = []
+    counts: dict[tuple[str, str], int] = defaultdict(int)
+    for title in titles:
+        parts = _TITLE_SEPARATOR.split(title or "")
+        edge = (normalize_text(parts[0]), normalize_text(parts[-1])) if len(parts) > 1 else ("", "")
+        edges.append(edge)
+        if edge[0]:
+            counts[("head", edge[0])] += 1
+        if edge[1]:
+            counts[("tail", edge[1])] += 1
+
+    stripped: list[str] = []
+    for title, (head, tail) in zip(titles, edges):
+        parts = _TITLE_SEPARATOR.split(title or "")
+        start = 1 if head and counts[("head", head)] >= TEMPLATE_MIN_TITLES else 0
+        end = len(parts) - 1 if tail and counts[("tail", tail)] >= TEMPLATE_MIN_TITLES else len(parts)
+        stripped.append(" ".join(parts[start:end]) if 0 < end - start < len(parts) else title)
+    return stripped
+
+
+def shingle_hashes(
+    shingle_set: frozenset[str], cache: dict[str, tuple[int, ...]] | None = None
+) -> dict[str, tuple[int, ...]]:
+    """NUM_PERM hash values per shingle, read as 16-bit lanes of salted BLAKE2b digests.
+
+    16-bit lanes make unrelated band collisions slightly likelier, but every
+    candidate is verified with the exact Jaccard anyway. Pass one `cache` for
+    a whole batch: most shingles recur across stories and are hashed once.
+    """
+    cache = {} if cache is None else cache
+    digest_size = _LANES_PER_DIGEST * 2
+    for shingle in shingle_set:
+        if shingle in cache:
+            continue
+        data = shingle.encode("utf-8")
+        lanes: tuple[int, ...] = ()
+        for salt in _SALTS:
+            lanes += _UNPACK(hashlib.blake2b(data, digest_size=digest_size, salt=salt).digest())
+        cache[shingle] = lanes
+    return cache
+
+
+def minhash(shingle_set: frozenset[str], hashes: dict[str, tuple[int, ...]]) -> tuple[int, ...]:
+    return tuple(map(min, zip(*(hashes[shingle] for shingle in shingle_set))))
+
+
+def minhash_all(
+    shingle_sets: Sequence[frozenset[str]], cache: dict[str, tuple[int, ...]] | None = None
+) -> list[tuple[int, ...]]:
+    """MinHash signature of every set (() for an empty one); row minima run in numpy when installed."""
+    vocabulary: dict[str, int] = {}
+    for shingle_set in shingle_sets:
+        for shingle in shingle_set:
+            vocabulary.setdefault(shingle, len(vocabulary))
+    hashes = shingle_hashes(frozenset(vocabulary), cache)
+    if np is None or not vocabulary:
+        return [minhash(shingle_set, hashes) if shingle_set else () for shingle_set in shingle_sets]
+
+    matrix = np.array([hashes[shingle] for shingle in vocabulary], dtype=np.uint16)
+    return [
+        tuple(matrix[[vocabulary[shingle] for shingle in shingle_set]].min(axis=0).tolist()) if shingle_set else ()
+        for shingle_set in shingle_sets
+    ]
+
+
+def jaccard(a: frozenset[str], b: frozenset[str]) -> float:
+    if not a or not b:
+        return 0.0
+    inter = len(a & b)
+    return inter / (len(a) + len(b) - inter)
+
+
+def find_clusters(
+    titles: Sequence[str],
+    summaries: Sequence[str],
+    groups: Sequence[Hashable] | None = None,
+    threshold: float = NEAR_DUP_THRESHOLD,
+) -> list[list[int]]:
+    """Indices of near-duplicate stories, grouped; only clusters of two or more are returned.
+
+    Stories with the same `groups` label (e.g. the same source) are never
+    paired directly, so a feed's own series posts are not folded together.
+    """
+    parent = list(range(len(titles)))
+
+    def find(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    title_sets: list[frozenset[str]] = []
+    doc_sets: list[frozenset[str]] = []
+    short_titles: list[bool] = []
+    has_summary: list[bool] = []
+    for title, summary in zip(strip_templates(titles), summaries):
+        title_text = normalize_text(title)
+        title_set = shingles(title_text)
+        title_sets.append(title_set)
+        doc_sets.append(shingles(normalize_text(f"{title_text} {(summary or '')[:SUMMARY_PREFIX_CHARS]}")) | title_set)
+        short_titles.append(len(set(title_text.split())) < SHORT_TITLE_WORDS)
+        has_summary.append(bool((summary or "").strip()))
+
+    # The doc set contains the title set, so its signature only needs the summary shingles on top.
+    hash_cache: dict[str, tuple[int, ...]] = {}
+    title_signatures = minhash_all(title_sets, hash_cache)
+    summary_signatures = minhash_all([doc - title for doc, title in zip(doc_sets, title_sets)], hash_cache)
+    buckets: dict[tuple[str, int, tuple[int, ...]], list[int]] = defaultdict(list)
+    for index, (title_signature, summary_signature) in enumerate(zip(title_signatures, summary_signatures)):
+        if not title_signature:
+            continue
+        doc_signature = tuple(map(min, title_signature, summary_signature)) if summary_signature else title_signature
+        for kind, signature in (("title", title_signature), ("doc", doc_signature)):
+            for band in range(LSH_BANDS):
+                buckets[(kind, band, signature[band * LSH_ROWS : (band + 1) * LSH_ROWS])].append(index)
+
+    checked: set[tuple[int, int]] = set()
+    for members in buckets.values():
+        for position in range(1, len(members)):
+            right = members[position]
+            for left in members[:position]:
+                # Stop as soon as right joins a cluster already present in this bucket.
+                if find(left) == find(right):
+                    break
+                if (left, right) in checked:
+                    continue
+                checked.add((left, right))
+                if groups is not None and groups[left] == groups[right]:
+                    continue
+                title_similarity = jaccard(title_sets[left], title_sets[right])
+                if title_similarity < TITLE_FLOOR:
+                    continue
+                if not (short_titles[left] or short_titles[right]):
+                    similarity = max(title_similarity, jaccard(doc_sets[left], doc_sets[right]))
+                elif has_summary[left] and has_summary[right]:
+                    similarity = jaccard(doc_sets[left], doc_sets[right])
+                else:
+                    similarity = float(title_sets[left] == title_sets[right])
+                if similarity >= threshold:
+                    parent[find(right)] = find(left)
+                    break
+
+    clusters: dict[int, list[int]] = defaultdict(list)
+    for index in range(len(titles)):
+        clusters[find(index)].append(index)
+    return [members for members in clusters.values() if len(members) > 1]
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""Embedded SQLite history of every news item update_news.py has published.
+
+data/news.json only holds the latest MAX_ITEMS items, so anything that falls
+out of it was lost to the weekly page, the 48h report and the daily digest.
+update_news.py now upserts every run's items here (keyed by sourceUrl, so a
+re-scored or re-translated item replaces its older row), and the builders
+query the rows they need instead of re-parsing news.json:
+
+    with open_news_history() as history:
+        items = history.query(since=start_ts, until=end_ts)
+
+Items keep their full JSON (`data`) next to indexed columns for published
+time, platform, stage, score and tags (item_tags). Rows older than
+NEWS_HISTORY_KEEP_DAYS are pruned on write. When the database does not exist
+yet (fresh checkout, local runs), open_news_history() returns None and the
+builders fall back to news.json.
+
+scripts/run_pipeline.py shares one store across builders running on
+different threads (share_news_history()); its methods are lock-protected and
+close() on the shared store is a no-op.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterable
+
+from news_item import NewsItem, published_timestamp
+
+ROOT = Path(__file__).resolve().parent.parent
+NEWS_HISTORY_DB = ROOT / "data" / "news_history.sqlite3"
+NEWS_HISTORY_KEEP_DAYS_ENV = "NEWS_HISTORY_KEEP_DAYS"
+DEFAULT_KEEP_DAYS = 400
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+  source_url TEXT PRIMARY KEY,
+  published_ts REAL,
+  date TEXT NOT NULL DEFAULT '',
+  platform TEXT NOT NULL DEFAULT '',
+  industry_stage TEXT NOT NULL DEFAULT '',
+  source_name TEXT NOT NULL DEFAULT '',
+  ai_score INTEGER NOT NULL DEFAULT 0,
+  first_seen_at REAL NOT NULL,
+  last_seen_at REAL NOT NULL,
+  data TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_items_published ON items(published_ts);
+CREATE INDEX IF NOT EXISTS idx_items_platform ON items(platform, published_ts);
+CREATE INDEX IF NOT EXISTS idx_items_stage ON items(industry_stage, published_ts);
+CREATE INDEX IF NOT EXISTS idx_items_score ON items(ai_score);
+
+CREATE TABLE IF NOT EXISTS item_tags (
+  tag TEXT NOT NULL,
+  source_url TEXT NOT NULL,
+  published_ts REAL,
+  PRIMARY KEY (tag, source_url)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_item_tags_url ON item_tags(source_url);
+"""
+
+ORDER_BY = {
+    "published": "published_ts DESC",
+    "score": "ai_score DESC, published_ts DESC",
+}
+
+
+class NewsHistory:
+    def __init__(self, path: Path | str = NEWS_HISTORY_DB) -> None:
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self) -> "NewsHistory":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self is _shared_history:
+            return
+        with self.lock:
+            self.conn.close()
+
+    def upsert(self, items: Iterable[Any], seen_at: float | None = None) -> int:
+        """Insert or refresh items by sourceUrl; first_seen_at survives refreshes."""
+        seen_at = time.time() if seen_at is None else seen_at
+        rows = []
+        tags = []
+        for item in items:
+            url = str(item.get("sourceUrl") or "")
+            if not url:
+                continue
+            data = item.to_dict() if isinstance(item, NewsItem) else dict(item)
+            published = published_timestamp(item)
+            rows.append(
+                (
+                    url,
+                    published,
+                    str(item.get("date") or ""),
+                    str(item.get("platform") or ""),
+                    str(item.get("industryStage") or ""),
+                    str(item.get("sourceName") or ""),
+                    int(item.get("aiScore", 0) or 0),
+                    seen_at,
+                    seen_at,
+                    json.dumps(data, ensure_ascii=False),
+                )
+            )
+            tags.extend((str(tag), url, published) for tag in item.get("contentTags") or [])
+
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO items (source_url, published_ts, date, platform, industry_stage, source_name, "
+                "ai_score, first_seen_at, last_seen_at, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(source_url) DO UPDATE SET published_ts=excluded.published_ts, date=excluded.date, "
+                "platform=excluded.platform, industry_stage=excluded.industry_stage, "
+                "source_name=excluded.source_name, ai_score=excluded.ai_score, "
+                "last_seen_at=excluded.last_seen_at, data=excluded.data",
+                rows,
+            )
+            self.conn.executemany("DELETE FROM item_tags WHERE source_url = ?", [(row[0],) for row in rows])
+            self.conn.executemany("INSERT OR IGNORE INTO item_tags (tag, source_url, published_ts) VALUES (?, ?, ?)", tags)
+        return len(rows)
+
+    def prune(self, keep_days: int | None = None, now: float | None = None) -> int:
+        if keep_days is None:
+            keep_days = int(os.getenv(NEWS_HISTORY_KEEP_DAYS_ENV, str(DEFAULT_KEEP_DAYS)))
+        cutoff = (time.time() if now is None else now) - keep_days * 86400
+        with self.lock, self.conn:
+            removed = self.conn.execute(
+                "DELETE FROM items WHERE COALESCE(published_ts, last_seen_at) < ?", (cutoff,)
+            ).rowcount
+            if removed:
+                self.conn.execute("DELETE FROM item_tags WHERE source_url NOT IN (SELECT source_url FROM items)")
+        return removed
+
+    def query(
+        self,
+        since: float | None = None,
+        until: float | None = None,
+        platform: str | None = None,
+        stage: str | None = None,
+        tag: str | None = None,
+        order: str = "published",
+        limit: int | None = None,
+    ) -> list[NewsItem]:
+        """Items matching every given filter; `since`/`until` bound published_ts (epoch seconds, inclusive)."""
+        where: list[str] = []
+        params: list[Any] = []
+        if since is not None:
+            where.append("published_ts >= ?")
+            params.append(since)
+        if until is not None:
+            where.append("published_ts <= ?")
+            params.append(until)
+        if platform is not None:
+            where.append("platform = ?")
+            params.append(platform)
+        if stage is not None:
+            where.append("industry_stage = ?")
+            params.append(stage)
+        if tag is not None:
+            where.append("source_url IN (SELECT source_url FROM item_tags WHERE tag = ?)")
+            params.append(tag)
+
+        sql = "SELECT data FROM items"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {ORDER_BY[order]}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self.lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [NewsItem.from_dict(json.loads(data)) for (data,) in rows]
+
+    def count(self) -> int:
+        with self.lock:
+            return int(self.conn.execute("SELECT COUNT(*) FROM items").fetchone()[0])
+
+
+_shared_history: NewsHistory | None = None
+
+
+def share_news_history(history: NewsHistory | None) -> None:
+    global _shared_history
+    _shared_history = history
+
+
+def open_news_history(path: Path | str = NEWS_HISTORY_DB, create: bool = False) -> NewsHistory | None:
+    """Open the history store; None if it does not exist yet and create is False."""
+    if _shared_history is not None and _shared_history.path == Path(path):
+        return _shared_history
+    if not create and not Path(path).exists():
+        return None
+    try:
+        return NewsHistory(path)
+    except sqlite3.Error as exc:
+        print(f"[WARN] news history unavailable ({exc}), falling back to news.json")
+        return None
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""Shared HTTP client for the news fetchers.
+
+Every fetcher used bare `requests.get` / `requests.post`: a new connection
+(and TLS handshake) per call, and retry logic only where someone hand-rolled
+it. get() / post() / request() go through one process-wide pooled
+requests.Session instead, so calls to the same host reuse keep-alive
+connections and builders running in one process (scripts/run_pipeline.py)
+share the pool. On top of the session:
+
+- retries on connection errors (connect timeouts included) and
+  RETRY_STATUS, for every method, with jittered exponential backoff; Retry-After
+  (seconds or HTTP date) and exhausted X-RateLimit-Reset windows are
+  honored, capped at MAX_RETRY_WAIT, and no retry starts past the per-call
+  deadline;
+- Accept-Encoding negotiated from what urllib3 can decode (gzip/deflate, plus
+  br when brotli is installed);
+- at most NEWS_HTTP_HOST_LIMIT in-flight requests per host;
+- timing hooks called after every attempt with a RequestTiming, and a
+  per-host summary() of requests, retries, time and opened connections.
+"""
+
+from __future__ import annotations
+
+import email.utils
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+HOST_LIMIT_ENV = "NEWS_HTTP_HOST_LIMIT"
+DEFAULT_HOST_LIMIT = 2
+POOL_CONNECTIONS = 32
+POOL_MAXSIZE = 16
+DEFAULT_RETRIES = 2
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+BACKOFF_BASE = 0.5
+MAX_RETRY_WAIT = 30.0
+DEFAULT_DEADLINE = 60.0
+ACCEPT_ENCODING = make_headers(accept_encoding=True)["accept-encoding"]
+
+
+@dataclass
+class RequestTiming:
+    method: str
+    url: str
+    host: str
+    status: int | None
+    seconds: float
+    attempt: int
+    error: str = ""
+
+
+TimingHook = Callable[[RequestTiming], None]
+
+_session: requests.Session | None = None
+_lock = threading.Lock()
+_host_limits: dict[str, threading.BoundedSemaphore] = {}
+_hooks: list[TimingHook] = []
+_stats: dict[str, dict[str, float]] = {}
+
+
+def session() -> requests.Session:
+    global _session
+    with _lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+            _session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        return _session
+
+
+def host_limit(host: str) -> threading.BoundedSemaphore:
+    with _lock:
+        if host not in _host_limits:
+            limit = max(1, int(os.getenv(HOST_LIMIT_ENV, str(DEFAULT_HOST_LIMIT))))
+            _host_limits[host] = threading.BoundedSemaphore(limit)
+        return _host_limits[host]
+
+
+def add_timing_hook(hook: TimingHook) -> None:
+    with _lock:
+        _hooks.append(hook)
+
+
+def remove_timing_hook(hook: TimingHook) -> None:
+    with _lock:
+        if hook in _hooks:
+            _hooks.remove(hook)
+
+
+def _record(timing: RequestTiming, on_attempt: TimingHook | None = None) -> None:
+    with _lock:
+        stats = _stats.setdefault(timing.host, {"requests": 0, "retries": 0, "errors": 0, "seconds": 0.0})
+        stats["requests"] += 1
+        stats["retries"] += 1 if timing.attempt else 0
+        stats["errors"] += 1 if timing.error else 0
+        stats["seconds"] += timing.seconds
+        hooks = list(_hooks)
+    for hook in hooks:
+        hook(timing)
+    if on_attempt is not None:
+        on_attempt(timing)
+
+
+def retry_delay(response: requests.Response | None, attempt: int, max_wait: float = MAX_RETRY_WAIT) -> float:
+    """Seconds to wait before retry `attempt + 1`: the server's hint if any, else jittered backoff."""
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "").strip()
+        if retry_after:
+            if retry_after.isdigit():
+                return min(float(retry_after), max_wait)
+            try:
+                when = email.utils.parsedate_to_datetime(retry_after).timestamp()
+                return min(max(when - time.time(), 0.0), max_wait)
+            except (TypeError, ValueError):
+                pass
+        reset = response.headers.get("X-RateLimit-Reset", "").strip()
+        if response.headers.get("X-RateLimit-Remaining") == "0" and reset.isdigit():
+            return min(max(int(reset) - time.time(), 0.0) + 1, max_wait)
+    ceiling = min(BACKOFF_BASE * (2**attempt), max_wait)
+    return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+
+def request(
+    method: str,
+    url: str,
+    retries: int = DEFAULT_RETRIES,
+    retry_status: frozenset[int] | set[int] = RETRY_STATUS,
+    max_wait: float = MAX_RETRY_WAIT,
+    deadline: float | None = DEFAULT_DEADLINE,
+    on_attempt: TimingHook | None = None,
+    **kwargs: Any,
+) -> requests.Response:
+    """Send a request with per-host limiting and retries.
+
+    RETRY_STATUS responses and connection errors (connect timeouts included)
+    are retried for any method: the server did not apply the request. Read
+    timeouts are not, since the request may already have been applied and
+    another full timeout would only stretch the call. A retry is skipped
+    when its wait would end more than `deadline` seconds after the call
+    started (None: no limit).
+
+    `on_attempt` is called with every attempt's RequestTiming, after the
+    global timing hooks. The last response is returned even if its status is
+    still retryable; the last connection error or timeout is raised.
+    """
+    host = urlparse(url).netloc.lower()
+    limit = host_limit(host)
+    http = session()
+    give_up_at = time.monotonic() + deadline if deadline is not None else float("inf")
+    for attempt in range(retries + 1):
+        started = time.perf_counter()
+        response: requests.Response | None = None
+        try:
+            with limit:
+                started = time.perf_counter()
+                response = http.request(method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as exc:
+            timing = RequestTiming(method, url, host, None, time.perf_counter() - started, attempt, str(exc))
+            _record(timing, on_attempt)
+            delay = retry_delay(None, attempt, max_wait)
+            # ConnectTimeout is a ConnectionError (nothing was sent); ReadTimeout is not.
+            retryable = isinstance(exc, requests.ConnectionError)
+            if not retryable or attempt >= retries or time.monotonic() + delay > give_up_at:
+                raise
+        else:
+            timing = RequestTiming(method, url, host, response.status_code, time.perf_counter() - started, attempt)
+            _record(timing, on_attempt)
+            delay = retry_delay(response, attempt, max_wait)
+            if response.status_code not in retry_status or attempt >= retries or time.monotonic() + delay > give_up_at:
+                return response
+        time.sleep(delay)
+    raise AssertionError("unreachable")
+
+
+def get(url: str, **kwargs: Any) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs: Any) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+
+def connections_opened() -> dict[str, int]:
+    """New connections (TCP/TLS handshakes) per host since the session was created."""
+    opened: dict[str, int] = {}
+    with _lock:
+        if _session is None:
+            return opened
+        adapters = {id(adapter): adapter for adapter in _session.adapters.values()}
+    for adapter in adapters.values():
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                opened[pool.host] = opened.get(pool.host, 0) + pool.num_connections
+    return opened
+
+
+def summary() -> dict[str, dict[str, float]]:
+    """Per-host requests, retries, errors, seconds and connections opened."""
+    opened = connections_opened()
+    with _lock:
+        result = {host: dict(stats) for host, stats in _stats.items()}
+    for host, stats in result.items():
+        stats["connections"] = opened.get(host.split(":")[0], 0)
+    return result
+
+
+def close() -> None:
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+        _stats.clear()
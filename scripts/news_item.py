@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""Compact item record shared by the news builders and report scripts.
+
+Builders used to pass plain dicts around and re-parse `publishedAt` in every
+sort key and window filter. NewsItem keeps the same JSON shape but:
+
+- stores field values in a list against a key layout shared by every item
+  with the same keys (no per-item hash table),
+- parses `publishedAt` once into `published_ts` (UTC epoch seconds, None when
+  missing or invalid),
+- interns the low-cardinality strings (platform, region, source name, stage,
+  content tags) so thousands of items share one copy of each,
+- builds its dict form lazily, only when it is serialized.
+
+It supports the read/write mapping surface the builders already use
+(`item["k"]`, `item.get`, `item["k"] = v`, `"k" in item`, `dict(item)`), so
+scoring, dedupe and D1 code work on it unchanged. Serialize payloads holding
+items with `json.dumps(..., default=json_default)`; pickling sends only the
+key tuple and values (update_news' normalize process pool).
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import sys
+from typing import Any, Iterator
+
+INTERNED_FIELDS = frozenset({"platform", "region", "sourceName", "industryStage", "date"})
+
+
+def parse_timestamp(value: Any) -> float | None:
+    raw = str(value or "").strip()
+    if not raw:
+        return None
+    try:
+        parsed = dt.datetime.fromisoformat(raw.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=dt.timezone.utc)
+    return parsed.timestamp()
+
+
+def intern_value(key: str, value: Any) -> Any:
+    if key in INTERNED_FIELDS and isinstance(value, str):
+        return sys.intern(value)
+    if key == "contentTags" and isinstance(value, list):
+        return [sys.intern(tag) if isinstance(tag, str) else tag for tag in value]
+    return value
+
+
+class ItemLayout:
+    """Key order plus key -> slot index, shared by all items with the same keys."""
+
+    __slots__ = ("keys", "index", "extended")
+
+    _cache: dict[tuple[str, ...], "ItemLayout"] = {}
+
+    def __init__(self, keys: tuple[str, ...]) -> None:
+        self.keys = keys
+        self.index = {key: position for position, key in enumerate(keys)}
+        self.extended: dict[str, ItemLayout] = {}
+
+    @classmethod
+    def of(cls, keys: tuple[str, ...]) -> "ItemLayout":
+        layout = cls._cache.get(keys)
+        if layout is None:
+            layout = cls._cache[keys] = cls(keys)
+        return layout
+
+    def with_key(self, key: str) -> "ItemLayout":
+        layout = self.extended.get(key)
+        if layout is None:
+            layout = self.extended[key] = ItemLayout.of(self.keys + (key,))
+        return layout
+
+
+class NewsItem:
+    __slots__ = ("layout", "values", "published_ts", "_json")
+
+    def __init__(self, layout: ItemLayout, values: list[Any]) -> None:
+        self.layout = layout
+        self.values = values
+        self._json: dict[str, Any] | None = None
+        position = layout.index.get("publishedAt")
+        self.published_ts = parse_timestamp(values[position]) if position is not None else None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "NewsItem":
+        if isinstance(data, NewsItem):
+            return data
+        layout = ItemLayout.of(tuple(data))
+        return cls(layout, [intern_value(key, value) for key, value in data.items()])
+
+    def __getitem__(self, key: str) -> Any:
+        position = self.layout.index.get(key)
+        if position is None:
+            raise KeyError(key)
+        return self.values[position]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        position = self.layout.index.get(key)
+        return default if position is None else self.values[position]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        value = intern_value(key, value)
+        position = self.layout.index.get(key)
+        if position is None:
+            self.layout = self.layout.with_key(key)
+            self.values.append(value)
+        else:
+            self.values[position] = value
+        if key == "publishedAt":
+            self.published_ts = parse_timestamp(value)
+        self._json = None
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.layout.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.layout.keys)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def keys(self) -> tuple[str, ...]:
+        return self.layout.keys
+
+    def items(self) -> Iterator[tuple[str, Any]]:
+        return zip(self.layout.keys, self.values)
+
+    @property
+    def published_at(self) -> dt.datetime | None:
+        if self.published_ts is None:
+            return None
+        return dt.datetime.fromtimestamp(self.published_ts, tz=dt.timezone.utc)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Plain dict in the original key order; cached until the item changes."""
+        if self._json is None:
+            self._json = dict(zip(self.layout.keys, self.values))
+        return self._json
+
+    def __repr__(self) -> str:
+        return f"NewsItem({self.to_dict()!r})"
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Pickled as (keys, values): items sharing a layout share one keys tuple,
+        # which pickle memoizes, so a batch sent between processes stays compact.
+        return restore_item, (self.layout.keys, self.values)
+
+
+def restore_item(keys: tuple[str, ...], values: list[Any]) -> NewsItem:
+    return NewsItem(ItemLayout.of(keys), [intern_value(key, value) for key, value in zip(keys, values)])
+
+
+def to_news_items(rows: Any) -> list[NewsItem]:
+    if not isinstance(rows, list):
+        return []
+    return [NewsItem.from_dict(row) for row in rows if isinstance(row, (dict, NewsItem))]
+
+
+def published_timestamp(item: Any) -> float | None:
+    """Parsed publish time for a NewsItem (cached) or a plain dict row (parsed now)."""
+    if isinstance(item, NewsItem):
+        return item.published_ts
+    return parse_timestamp(item.get("publishedAt"))
+
+
+def json_default(value: Any) -> Any:
+    if isinstance(value, NewsItem):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -62,15 +62,6 @@ PY
   fi
 }
 
-run_optional_step() {
-  local label="$1"
-  shift
-
-  if ! "$@"; then
-    echo "Warn: ${label} failed, keep last successful snapshot."
-  fi
-}
-
 resolve_wrangler() {
   if [ -x "/opt/homebrew/bin/wrangler" ]; then
     echo "/opt/homebrew/bin/wrangler"
@@ -96,9 +87,6 @@ fi
 
 mkdir -p "$PROJECT_DIR/logs"
 
-"$PYTHON_BIN" "$PROJECT_DIR/scripts/update_news.py"
-"$PYTHON_BIN" "$PROJECT_DIR/scripts/build_news_48h_report.py"
-
 if [ -z "${TWITTER_TOKEN:-}" ] || [ "${TWITTER_TOKEN:-}" = "replace_me" ]; then
   export TWITTER_TOKEN="$(load_secret CYRUS_TWITTER_TOKEN)"
 fi
@@ -107,14 +95,8 @@ if [ -z "${OPENNEWS_TOKEN:-}" ] || [ "${OPENNEWS_TOKEN:-}" = "replace_me" ]; the
   export OPENNEWS_TOKEN="$(load_secret CYRUS_OPENNEWS_TOKEN)"
 fi
 
-if [ -n "${TWITTER_TOKEN:-}" ] || [ -n "${OPENNEWS_TOKEN:-}" ]; then
-  run_optional_step "X watchlist build" "$PYTHON_BIN" "$PROJECT_DIR/scripts/build_x_watchlist.py"
-else
-  echo "Skip X watchlist build: TWITTER_TOKEN / OPENNEWS_TOKEN not configured."
-fi
-
-run_optional_step "GitHub trending build" "$PYTHON_BIN" "$PROJECT_DIR/scripts/build_github_trending.py"
-run_optional_step "YouTube watchlist build" "$PYTHON_BIN" "$PROJECT_DIR/scripts/build_yt_watchlist.py"
+# news and report48h are required; x/github/youtube keep their last snapshot on failure.
+"$PYTHON_BIN" "$PROJECT_DIR/scripts/run_pipeline.py" --stages news,report48h,x,github,youtube
 
 if [ "${SKIP_DEPLOY:-0}" = "1" ]; then
   echo "Skip deploy: SKIP_DEPLOY=1"
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""Run the news builders as one in-process stage DAG.
+
+The workflow and run_news_update.sh used to start a fresh interpreter per
+builder, each re-importing feedparser/requests/deep_translator and reopening
+the translation cache. Here every builder's main() is a stage:
+
+    news ──┬── report48h
+           └── weekly
+    x, github, youtube, rss   (independent)
+
+A stage starts as soon as its dependencies succeed, on a thread pool, so
+wall time approaches the slowest branch. The stages share one HTTP session
+(news_http), one translation cache and one news history store.
+
+Each stage's output files are snapshotted before it runs; when an optional
+stage fails its outputs are restored ("keep last successful snapshot") and
+the run continues. A failed required stage makes the exit code nonzero and
+skips its dependents.
+
+    python scripts/run_pipeline.py
+    python scripts/run_pipeline.py --stages news,report48h,x,github,youtube
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+import news_http
+from news_history import NEWS_HISTORY_DB, open_news_history, share_news_history
+from translation_cache import open_translation_cache, share_translation_cache
+
+ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = ROOT / "data"
+
+
+def has_x_token() -> bool:
+    return bool(os.getenv("TWITTER_TOKEN", "").strip() or os.getenv("OPENNEWS_TOKEN", "").strip())
+
+
+@dataclass
+class Stage:
+    name: str
+    module: str
+    deps: tuple[str, ...] = ()
+    required: bool = False
+    outputs: tuple[Path, ...] = ()
+    argv: list[str] | None = None
+    enabled: Callable[[], bool] | None = None
+    skip_reason: str = ""
+
+
+@dataclass
+class StageResult:
+    name: str
+    status: str
+    seconds: float = 0.0
+    error: str = ""
+
+
+STAGES = [
+    Stage(
+        "news",
+        "update_news",
+        required=True,
+        outputs=(
+            DATA_DIR / "news.json",
+            DATA_DIR / "news_digest.json",
+            DATA_DIR / "digest",
+            DATA_DIR / "news_feed_validators.json",
+            DATA_DIR / "d1_sync_manifest.json",
+        ),
+    ),
+    Stage("report48h", "build_news_48h_report", deps=("news",), required=True, outputs=(DATA_DIR / "news_48h_report.json",)),
+    Stage("weekly", "build_weekly", deps=("news",), outputs=(ROOT / "weekly",)),
+    Stage(
+        "x",
+        "build_x_watchlist",
+        outputs=(DATA_DIR / "x_watchlist.json", DATA_DIR / "x_feed.json"),
+        argv=[],
+        enabled=has_x_token,
+        skip_reason="TWITTER_TOKEN / OPENNEWS_TOKEN not configured",
+    ),
+    Stage("github", "build_github_trending", outputs=(DATA_DIR / "github_trending.json",)),
+    Stage(
+        "youtube",
+        "build_yt_watchlist",
+        outputs=(DATA_DIR / "yt_watchlist.json", DATA_DIR / "yt_feed.json", DATA_DIR / "yt_feed_validators.json"),
+    ),
+    Stage("rss", "build_rss", outputs=(ROOT / "feed.xml",)),
+]
+
+
+def output_files(paths: tuple[Path, ...]) -> list[Path]:
+    files: list[Path] = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(child for child in path.rglob("*") if child.is_file())
+        else:
+            files.append(path)
+    return files
+
+
+def snapshot_outputs(paths: tuple[Path, ...]) -> dict[Path, bytes | None]:
+    """Current bytes of every output file (directories are walked); None marks a missing file."""
+    return {path: path.read_bytes() if path.is_file() else None for path in output_files(paths)}
+
+
+def restore_outputs(paths: tuple[Path, ...], snapshot: dict[Path, bytes | None]) -> int:
+    """Put outputs back as they were before the stage ran; returns files touched."""
+    touched = 0
+    for path in set(output_files(paths)) | set(snapshot):
+        before = snapshot.get(path)
+        if before is None:
+            if path.is_file():
+                path.unlink()
+                touched += 1
+        elif not path.is_file() or path.read_bytes() != before:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(before)
+            touched += 1
+    return touched
+
+
+def run_stage(stage: Stage) -> StageResult:
+    started = time.monotonic()
+    snapshot = snapshot_outputs(stage.outputs)
+    try:
+        module = importlib.import_module(stage.module)
+        code = module.main() if stage.argv is None else module.main(stage.argv)
+        if code:
+            raise RuntimeError(f"main() returned {code}")
+    except (Exception, SystemExit) as exc:
+        error = f"{type(exc).__name__}: {exc}"
+        if not stage.required:
+            restored = restore_outputs(stage.outputs, snapshot)
+            print(f"[WARN] [pipeline] {stage.name} failed ({error}), keep last successful snapshot ({restored} files restored)")
+        else:
+            print(f"[ERROR] [pipeline] {stage.name} failed ({error})", file=sys.stderr)
+        return StageResult(stage.name, "failed", time.monotonic() - started, error)
+    return StageResult(stage.name, "ok", time.monotonic() - started)
+
+
+def run_pipeline(stages: list[Stage], workers: int | None = None) -> list[StageResult]:
+    """Run stages as soon as their dependencies are done; returns results in completion order."""
+    names = {stage.name for stage in stages}
+    pending = {stage.name: stage for stage in stages}
+    results: dict[str, StageResult] = {}
+    order: list[StageResult] = []
+    running: dict[Future[StageResult], str] = {}
+
+    def finish(result: StageResult) -> None:
+        results[result.name] = result
+        order.append(result)
+
+    with ThreadPoolExecutor(max_workers=workers or len(stages) or 1, thread_name_prefix="stage") as pool:
+        while pending or running:
+            for name, stage in list(pending.items()):
+                deps = [dep for dep in stage.deps if dep in names]
+                if any(dep not in results for dep in deps):
+                    continue
+                del pending[name]
+                failed = [dep for dep in deps if results[dep].status != "ok"]
+                if failed:
+                    print(f"[WARN] [pipeline] skip {name}: {', '.join(failed)} did not succeed")
+                    finish(StageResult(name, "skipped", error=f"dependency {', '.join(failed)}"))
+                elif stage.enabled is not None and not stage.enabled():
+                    print(f"[INFO] [pipeline] skip {name}: {stage.skip_reason}")
+                    finish(StageResult(name, "skipped", error=stage.skip_reason))
+                else:
+                    print(f"[INFO] [pipeline] start {name}")
+                    running[pool.submit(run_stage, stage)] = name
+            if not running:
+                if pending:
+                    raise RuntimeError(f"unresolvable stage dependencies: {', '.join(pending)}")
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                del running[future]
+                finish(future.result())
+    return order
+
+
+def print_summary(results: list[StageResult], wall: float) -> None:
+    print("[pipeline] stage       status    seconds")
+    for result in results:
+        print(f"[pipeline] {result.name:<11} {result.status:<9} {result.seconds:7.2f}")
+    busy = sum(result.seconds for result in results)
+    print(f"[pipeline] wall {wall:.2f}s, stage total {busy:.2f}s")
+    for host, stats in sorted(news_http.summary().items()):
+        print(
+            f"[pipeline] http {host}: {stats['requests']} requests, {stats['retries']} retries, "
+            f"{stats['errors']} errors, {stats['connections']} connections, {stats['seconds']:.2f}s"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    all_names = [stage.name for stage in STAGES]
+    parser = argparse.ArgumentParser(description="Run the news builders as a parallel stage DAG.")
+    parser.add_argument("--stages", default=",".join(all_names), help=f"comma-separated subset of {','.join(all_names)}")
+    parser.add_argument("--workers", type=int, default=0, help="thread pool size (default: one per stage)")
+    args = parser.parse_args(argv)
+
+    selected = [name.strip() for name in args.stages.split(",") if name.strip()]
+    unknown = sorted(set(selected) - set(all_names))
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(unknown)}")
+    stages = [stage for stage in STAGES if stage.name in selected]
+
+    cache = open_translation_cache()
+    history = open_news_history(NEWS_HISTORY_DB, create=True)
+    share_translation_cache(cache)
+    share_news_history(history)
+    started = time.monotonic()
+    try:
+        results = run_pipeline(stages, args.workers or None)
+        print_summary(results, time.monotonic() - started)
+    finally:
+        share_translation_cache(None)
+        share_news_history(None)
+        cache.close()
+        if history is not None:
+            history.close()
+        news_http.close()
+
+    required = {stage.name for stage in stages if stage.required}
+    return 1 if any(result.name in required and result.status != "ok" for result in results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
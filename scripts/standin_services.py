@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""Local stand-ins for every service the news builders call.
+
+One threaded HTTP server emulates, with synthetic but well-formed payloads:
+
+- RSS feeds           GET  /rss/<host>/<path>            (update_news, NEWS_FEED_BASE)
+- YouTube channel RSS GET  /feeds/videos.xml?channel_id=  (build_yt_watchlist, YT_RSS_BASE)
+- GitHub search       GET  /search/repositories?q=        (build_github_trending, GITHUB_API_BASE)
+- 6551 X API          POST /open/twitter_search, /open/twitter_user_tweets (TWITTER_API_BASE)
+- Google Translate    GET  /m?q=&tl=&sl=                  (deep_translator, GOOGLE_TRANSLATE_URL)
+
+Failure behavior is configurable: base latency plus jitter, a 5xx error
+rate, and a rate-limit rate answered with 429 (403 + X-RateLimit-* on the
+GitHub route) and Retry-After. Feed responses carry ETag / Last-Modified and
+answer conditional requests with 304; --rotate-seconds changes feed content
+periodically (RSS feeds slide: one new item on top per period, the rest
+shift down unchanged). --items / --results set the payload volume. Everything is
+seeded, so two runs with the same flags serve the same bytes (apart from
+which requests draw an injected failure).
+
+    python scripts/standin_services.py --port 8790 --latency-ms 80 --error-rate 0.05 --rate-limit-rate 0.05
+    eval "$(python scripts/standin_services.py --port 8790 --print-env)"
+    python scripts/run_pipeline.py --stages news,github,youtube,x
+
+GET /__stats returns request counts per route and status.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import html
+import json
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+AI_TERMS = [
+    "OpenAI", "Anthropic", "Claude", "GPT", "LLM", "agent", "RAG", "inference", "GPU", "NVIDIA",
+    "benchmark", "open-source model", "fine-tuning", "multimodal", "reasoning", "startup", "funding",
+    "API pricing", "workflow automation", "chip", "data center", "evaluation", "paper", "robotics",
+]
+FILLER_WORDS = [
+    "launches", "new", "update", "for", "developers", "with", "faster", "release", "adds", "support",
+    "research", "shows", "team", "builds", "production", "scale", "cost", "cuts", "users", "enterprise",
+    "platform", "tool", "guide", "how", "we", "the", "a", "in", "to", "of", "on", "and",
+]
+CJK_TERMS = ["大模型", "智能体", "推理", "算力", "开源", "融资", "评测", "多模态", "芯片", "落地", "发布", "应用"]
+LANGUAGES = ["Python", "TypeScript", "Rust", "Go", "C++", "Jupyter Notebook"]
+
+
+@dataclass
+class StandinConfig:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after: int = 1
+    items: int = 30
+    results: int = 30
+    rotate_seconds: int = 0
+    seed: int = 0
+
+
+class StandinServices:
+    def __init__(self, config: StandinConfig) -> None:
+        self.config = config
+        self.started = int(time.time()) // 3600 * 3600
+        self.rng = random.Random(config.seed)
+        self.lock = threading.Lock()
+        self.stats: Counter[str] = Counter()
+
+    def record(self, route: str, status: int) -> None:
+        with self.lock:
+            self.stats[f"{route} {status}"] += 1
+
+    def draw(self) -> float:
+        with self.lock:
+            return self.rng.random()
+
+    def epoch(self) -> int:
+        rotate = self.config.rotate_seconds
+        return int(time.time()) // rotate if rotate > 0 else 0
+
+    def content_rng(self, *key: Any) -> random.Random:
+        return random.Random(f"{self.config.seed}:{self.epoch()}:" + ":".join(str(part) for part in key))
+
+    def epoch_start(self) -> int:
+        rotate = self.config.rotate_seconds
+        return self.epoch() * rotate if rotate > 0 else self.started
+
+    def published(self, rng: random.Random, index: int) -> int:
+        """Newest-first timestamps: one rotation apart, else spread over the two days before the epoch."""
+        step = self.config.rotate_seconds or 3600 * 48 // max(self.config.items, 1)
+        return self.epoch_start() - index * step - rng.randint(0, min(600, max(step - 1, 0)))
+
+    # -- payloads --------------------------------------------------------
+
+    def headline(self, rng: random.Random, cjk: bool = False) -> str:
+        if cjk:
+            return "".join(rng.choice(CJK_TERMS) for _ in range(rng.randint(3, 6)))
+        words = [rng.choice(AI_TERMS)] + [rng.choice(FILLER_WORDS) for _ in range(rng.randint(4, 9))]
+        words.insert(rng.randint(1, len(words)), rng.choice(AI_TERMS))
+        return " ".join(words).capitalize()
+
+    def rss_feed(self, feed: str) -> bytes:
+        cjk = random.Random(f"{self.config.seed}:rss:{feed}").random() < 0.25
+        out = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            '<rss version="2.0"><channel>',
+            f"<title>Stand-in {html.escape(feed)}</title>",
+            f"<link>https://standin.invalid/{html.escape(feed)}</link>",
+            "<description>synthetic feed</description>",
+        ]
+        for index in range(self.config.items):
+            # Each item is seeded by its slot, so rotating shifts items down instead of replacing them.
+            slot = self.epoch() - index
+            rng = random.Random(f"{self.config.seed}:rss:{feed}:{slot}")
+            title = self.headline(rng, cjk)
+            link = f"https://standin.invalid/{feed}/{slot}-{rng.getrandbits(32):08x}"
+            if rng.random() < 0.3:
+                summary = (
+                    f"Article URL: {link} Comments URL: https://news.ycombinator.com/item?id={rng.randint(10**7, 10**8)} "
+                    f"Points: {rng.randint(1, 900)} # Comments: {rng.randint(0, 400)}"
+                )
+            else:
+                summary = " ".join(self.headline(rng, cjk) for _ in range(rng.randint(1, 4)))
+            out += [
+                "<item>",
+                f"<title>{html.escape(title)}</title>",
+                f"<link>{html.escape(link)}</link>",
+                f"<guid>{html.escape(link)}</guid>",
+                f"<description>{html.escape(summary)}</description>",
+                f"<pubDate>{formatdate(self.published(rng, index), usegmt=True)}</pubDate>",
+                "</item>",
+            ]
+        out.append("</channel></rss>")
+        return "\n".join(out).encode("utf-8")
+
+    def youtube_feed(self, channel_id: str) -> bytes:
+        rng = self.content_rng("yt", channel_id)
+        out = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:yt="http://www.youtube.com/xml/schemas/2015" '
+            'xmlns:media="http://search.yahoo.com/mrss/">',
+            f"<title>Channel {html.escape(channel_id)}</title>",
+            f"<yt:channelId>{html.escape(channel_id)}</yt:channelId>",
+        ]
+        for index in range(self.config.items):
+            video_id = f"{rng.getrandbits(40):010x}"
+            stamp = time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime(self.published(rng, index)))
+            title = html.escape(self.headline(rng))
+            out += [
+                "<entry>",
+                f"<id>yt:video:{video_id}</id>",
+                f"<yt:videoId>{video_id}</yt:videoId>",
+                f"<title>{title}</title>",
+                f'<link rel="alternate" href="https://www.youtube.com/watch?v={video_id}"/>',
+                f"<author><name>Channel {html.escape(channel_id[-6:])}</name></author>",
+                f"<published>{stamp}</published>",
+                f"<updated>{stamp}</updated>",
+                "<media:group>",
+                f"<media:title>{title}</media:title>",
+                f'<media:thumbnail url="https://i.ytimg.com/vi/{video_id}/hqdefault.jpg" width="480" height="360"/>',
+                f"<media:description>{html.escape(self.headline(rng))}</media:description>",
+                "</media:group>",
+                "</entry>",
+            ]
+        out.append("</feed>")
+        return "\n".join(out).encode("utf-8")
+
+    def github_search(self, query: str) -> dict[str, Any]:
+        rng = self.content_rng("github", query)
+        items = []
+        for index in range(self.config.results):
+            owner = f"org{rng.randint(1, 500)}"
+            name = "-".join(rng.choice(FILLER_WORDS + ["llm", "agent", "rag", "infer"]) for _ in range(2))
+            stamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.published(rng, index)))
+            items.append(
+                {
+                    "full_name": f"{owner}/{name}",
+                    "name": name,
+                    "owner": {"login": owner},
+                    "html_url": f"https://github.com/{owner}/{name}",
+                    "description": self.headline(rng),
+                    "stargazers_count": rng.randint(50, 50_000),
+                    "forks_count": rng.randint(0, 5_000),
+                    "open_issues_count": rng.randint(0, 300),
+                    "language": rng.choice(LANGUAGES),
+                    "topics": rng.sample(["llm", "agents", "rag", "ai", "inference", "mcp"], 2),
+                    "license": {"spdx_id": rng.choice(["MIT", "Apache-2.0", "NOASSERTION"])},
+                    "created_at": stamp,
+                    "pushed_at": stamp,
+                }
+            )
+        return {"total_count": len(items) * 10, "incomplete_results": False, "items": items}
+
+    def x_rows(self, key: str, username: str | None, limit: int) -> dict[str, Any]:
+        rng = self.content_rng("x", key)
+        rows = []
+        for index in range(min(limit, self.config.results)):
+            user = username or f"user{rng.randint(1, 400)}"
+            rows.append(
+                {
+                    "id": str(rng.getrandbits(60)),
+                    "userScreenName": user,
+                    "userName": user.title(),
+                    "text": " ".join(self.headline(rng) for _ in range(rng.randint(1, 3))),
+                    "createdAt": time.strftime("%a %b %d %H:%M:%S +0000 %Y", time.gmtime(self.published(rng, index))),
+                    "favoriteCount": rng.randint(0, 5_000),
+                    "retweetCount": rng.randint(0, 800),
+                    "replyCount": rng.randint(0, 300),
+                }
+            )
+        return {"success": True, "data": rows}
+
+
+def translate_html(text: str, target: str) -> bytes:
+    lines = [f"[{target}] {line}" if line.strip() else line for line in text.split("\n")]
+    return f'<html><body><div class="result-container">{html.escape(chr(10).join(lines))}</div></body></html>'.encode("utf-8")
+
+
+def make_handler(services: StandinServices) -> type[BaseHTTPRequestHandler]:
+    config = services.config
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+        def _send(self, route: str, status: int, body: bytes, content_type: str, headers: dict[str, str] | None = None) -> None:
+            services.record(route, status)
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _json(self, route: str, status: int, payload: Any, headers: dict[str, str] | None = None) -> None:
+            self._send(route, status, json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json", headers)
+
+        def _inject(self, route: str) -> bool:
+            """Apply latency and maybe answer with an injected failure; True if handled."""
+            delay = config.latency_ms + (services.draw() * config.jitter_ms if config.jitter_ms else 0)
+            if delay:
+                time.sleep(delay / 1000)
+            draw = services.draw()
+            if draw < config.rate_limit_rate:
+                headers = {"Retry-After": str(config.retry_after)}
+                if route == "github":
+                    headers.update(
+                        {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(time.time()) + config.retry_after)}
+                    )
+                    self._json(route, 403, {"message": "API rate limit exceeded"}, headers)
+                else:
+                    self._json(route, 429, {"message": "rate limited"}, headers)
+                return True
+            if draw < config.rate_limit_rate + config.error_rate:
+                self._json(route, 503, {"message": "injected failure"})
+                return True
+            return False
+
+        def _feed(self, route: str, body: bytes, content_type: str) -> None:
+            etag = '"' + hashlib.sha256(body).hexdigest()[:20] + '"'
+            modified = formatdate(services.epoch_start(), usegmt=True)
+            headers = {"ETag": etag, "Last-Modified": modified}
+            if self.headers.get("If-None-Match") == etag or (
+                not self.headers.get("If-None-Match") and self.headers.get("If-Modified-Since") == modified
+            ):
+                self._send(route, 304, b"", content_type, headers)
+                return
+            self._send(route, 200, body, content_type, headers)
+
+        def do_GET(self) -> None:
+            parsed = urlparse(self.path)
+            query = parse_qs(parsed.query)
+            if parsed.path == "/__stats":
+                self._json("stats", 200, dict(services.stats))
+                return
+            if parsed.path.startswith("/rss/"):
+                route = "rss"
+            elif parsed.path == "/feeds/videos.xml":
+                route = "youtube"
+            elif parsed.path == "/search/repositories":
+                route = "github"
+            elif parsed.path in {"/m", "/translate"}:
+                route = "translate"
+            else:
+                self._json("unknown", 404, {"message": "no stand-in for this path"})
+                return
+            if self._inject(route):
+                return
+
+            if route == "rss":
+                self._feed(route, services.rss_feed(parsed.path[len("/rss/") :]), "application/rss+xml; charset=utf-8")
+            elif route == "youtube":
+                channel_id = (query.get("channel_id") or ["UCstandin"])[0]
+                self._feed(route, services.youtube_feed(channel_id), "application/atom+xml; charset=utf-8")
+            elif route == "github":
+                self._json(route, 200, services.github_search((query.get("q") or [""])[0]))
+            else:
+                text = (query.get("q") or [""])[0]
+                self._send(route, 200, translate_html(text, (query.get("tl") or ["zh-CN"])[0]), "text/html; charset=utf-8")
+
+        def do_POST(self) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length)
+            path = urlparse(self.path).path
+            if path not in {"/open/twitter_search", "/open/twitter_user_tweets"}:
+                self._json("unknown", 404, {"message": "no stand-in for this path"})
+                return
+            if self._inject("x"):
+                return
+            try:
+                body = json.loads(raw or b"{}")
+            except ValueError:
+                self._json("x", 400, {"success": False, "message": "invalid JSON"})
+                return
+            username = body.get("username") if path.endswith("user_tweets") else None
+            key = username or str(body.get("keywords", ""))
+            self._json("x", 200, services.x_rows(key, username, int(body.get("maxResults") or 20)))
+
+    return Handler
+
+
+def start_standin_server(
+    config: StandinConfig | None = None, host: str = "127.0.0.1", port: int = 0
+) -> tuple[ThreadingHTTPServer, str]:
+    """Start the stand-ins on a daemon thread; returns (server, base url)."""
+    services = StandinServices(config or StandinConfig())
+    server = ThreadingHTTPServer((host, port), make_handler(services))
+    server.daemon_threads = True
+    server.services = services  # type: ignore[attr-defined]
+    threading.Thread(target=server.serve_forever, name="standin", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def standin_env(base_url: str) -> dict[str, str]:
+    """Environment that points every builder at the stand-ins."""
+    return {
+        "NEWS_FEED_BASE": base_url,
+        "YT_RSS_BASE": base_url,
+        "GITHUB_API_BASE": base_url,
+        "TWITTER_API_BASE": base_url,
+        "TWITTER_TOKEN": "standin",
+        "GOOGLE_TRANSLATE_URL": f"{base_url}/m",
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve local stand-ins for the RSS, YouTube, GitHub, X and translate APIs.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8790)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 503")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share answered with 429 (GitHub: 403)")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds on rate-limit answers")
+    parser.add_argument("--items", type=int, default=30, help="entries per RSS / YouTube feed")
+    parser.add_argument("--results", type=int, default=30, help="rows per GitHub / X search")
+    parser.add_argument("--rotate-seconds", type=int, default=0, help="change feed content every N seconds (0 = never); RSS feeds slide by one item")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--print-env", action="store_true", help="print export lines for the builders and exit")
+    args = parser.parse_args()
+
+    base_url = f"http://{args.host}:{args.port}"
+    if args.print_env:
+        for key, value in standin_env(base_url).items():
+            print(f"export {key}={value}")
+        return
+
+    config = StandinConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        items=args.items,
+        results=args.results,
+        rotate_seconds=args.rotate_seconds,
+        seed=args.seed,
+    )
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(StandinServices(config)))
+    server.daemon_threads = True
+    print(f"[standin] serving at {base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""Batched zh-CN translation shared by the news builders.
+
+Builders first register every string they want translated with
+BatchTranslator.add(), then call flush() once. Uncached strings are packed
+into size-bounded requests (joined by newlines, split back afterwards), so a
+cold run costs a handful of round-trips instead of one per title/summary.
+Each batch fails independently; the failure counter and circuit breaker
+keep the TRANSLATION_FAILURE_LIMIT semantics the builders had before. A
+failed string gets a negative cache entry: the cache's full retry window when
+the service rejected the text itself (PERMANENT_ERRORS), otherwise (429,
+5xx, timeouts) only TRANSIENT_RETRY_SECONDS, so an outage does not suppress
+translation for hours. A packed batch that hits a permanent error is retried
+one string at a time to find the string it was about.
+
+Requests run on TranslationExecutor worker threads rather than under
+SIGALRM, so translation works off the main thread and several batches can be
+in flight at once. Every call has its own TRANSLATION_TIMEOUT_SECONDS
+deadline; a call that misses it is cancelled (or abandoned if already
+running) and counted as a failure. cancel() stops a flush() from another
+thread the same way.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any, Callable
+
+from translation_cache import TranslationCache
+
+try:
+    from deep_translator.exceptions import NotValidLength, NotValidPayload, TranslationNotFound
+except ImportError:  # optional: without deep_translator every error counts as transient
+    PERMANENT_ERRORS: tuple[type[Exception], ...] = ()
+else:
+    PERMANENT_ERRORS = (NotValidLength, NotValidPayload, TranslationNotFound)
+
+TRANSLATION_TIMEOUT_SECONDS = 8
+TRANSLATION_FAILURE_LIMIT = 5
+TRANSLATION_MAX_IN_FLIGHT = 4
+BATCH_MAX_CHARS = 4500
+BATCH_MAX_ITEMS = 40
+BATCH_SEPARATOR = "\n"
+CANCEL_POLL_SECONDS = 0.2
+GOOGLE_TRANSLATE_URL_ENV = "GOOGLE_TRANSLATE_URL"
+TRANSIENT_RETRY_SECONDS = 15 * 60
+
+
+def point_translator(service: Any) -> Any:
+    """Send a deep_translator GoogleTranslator to GOOGLE_TRANSLATE_URL when set (local stand-ins)."""
+    url = os.getenv(GOOGLE_TRANSLATE_URL_ENV, "").strip()
+    if service is not None and url:
+        service._base_url = url
+    return service
+
+
+def has_cjk(text: str) -> bool:
+    for ch in text:
+        code = ord(ch)
+        if 0x4E00 <= code <= 0x9FFF or 0x3400 <= code <= 0x4DBF:
+            return True
+    return False
+
+
+class TranslationExecutor:
+    """Run translation calls on daemon worker threads.
+
+    Python threads cannot be killed, so a call that blows its deadline is
+    abandoned: it is cancelled if it has not started, otherwise its worker is
+    left to finish in the background and a replacement worker is started so
+    capacity stays at max_in_flight. Workers are daemons, so a hung request
+    never blocks interpreter exit.
+    """
+
+    def __init__(self, max_in_flight: int = TRANSLATION_MAX_IN_FLIGHT) -> None:
+        self.max_in_flight = max(1, max_in_flight)
+        self.tasks: queue.Queue[tuple[Future, Callable[..., Any], tuple[Any, ...]] | None] = queue.Queue()
+        self.workers = 0
+        for _ in range(self.max_in_flight):
+            self._spawn_worker()
+
+    def _spawn_worker(self) -> None:
+        self.workers += 1
+        threading.Thread(target=self._work, name=f"translate-{self.workers}", daemon=True).start()
+
+    def _work(self) -> None:
+        while True:
+            task = self.tasks.get()
+            if task is None:
+                return
+            future, fn, args = task
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except BaseException as exc:
+                future.set_exception(exc)
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        future: Future = Future()
+        self.tasks.put((future, fn, args))
+        return future
+
+    def abandon(self, future: Future) -> None:
+        if not future.cancel():
+            self._spawn_worker()
+
+    def shutdown(self) -> None:
+        for _ in range(self.workers):
+            self.tasks.put(None)
+
+
+def pack_batches(texts: list[str]) -> list[list[str]]:
+    """Group texts into requests bounded by BATCH_MAX_CHARS / BATCH_MAX_ITEMS.
+
+    Texts that contain the separator (or are too long to share a request) are
+    sent on their own so splitting the response stays unambiguous.
+    """
+    batches: list[list[str]] = []
+    current: list[str] = []
+    current_chars = 0
+
+    for text in texts:
+        if BATCH_SEPARATOR in text or len(text) >= BATCH_MAX_CHARS:
+            batches.append([text])
+            continue
+
+        extra = len(text) + (len(BATCH_SEPARATOR) if current else 0)
+        if current and (current_chars + extra > BATCH_MAX_CHARS or len(current) >= BATCH_MAX_ITEMS):
+            batches.append(current)
+            current = []
+            current_chars = 0
+            extra = len(text)
+
+        current.append(text)
+        current_chars += extra
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+class BatchTranslator:
+    """Collect strings for one run, then translate the uncached ones in batches."""
+
+    def __init__(
+        self,
+        translator: Any,
+        cache: TranslationCache,
+        state: dict[str, Any] | None = None,
+        label: str = "[translate]",
+        max_in_flight: int = TRANSLATION_MAX_IN_FLIGHT,
+        timeout: float = TRANSLATION_TIMEOUT_SECONDS,
+    ) -> None:
+        self.translator = translator
+        self.cache = cache
+        self.state = state if state is not None else {"failures": 0, "disabled": False}
+        self.label = label
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.state_lock = threading.Lock()
+        self.cancelled = threading.Event()
+        self.pending: dict[str, None] = {}
+        self.requests = 0
+
+    @staticmethod
+    def cache_key(text: str) -> str:
+        return f"zh::{text}"
+
+    def add(self, text: str) -> None:
+        stripped = (text or "").strip()
+        if not stripped or has_cjk(stripped) or self.cache_key(stripped) in self.cache:
+            return
+        self.pending[stripped] = None
+
+    def cancel(self) -> None:
+        """Stop a flush() running on another thread: no new batches, in-flight ones are abandoned."""
+        self.cancelled.set()
+
+    def lookup(self, text: str) -> str | None:
+        return self.cache.get(self.cache_key((text or "").strip()))
+
+    def flush(self) -> int:
+        """Translate every pending string; returns how many were translated.
+
+        `requests` counts the requests this flush() sent.
+        """
+        texts = list(self.pending)
+        self.pending.clear()
+        self.requests = 0
+        if not texts or self.translator is None or self.state.get("disabled"):
+            return 0
+
+        executor = TranslationExecutor(self.max_in_flight)
+        jobs = deque(pack_batches(texts))
+        inflight: dict[Future, tuple[list[str], float]] = {}
+        translated = 0
+        try:
+            while (jobs or inflight) and not self.state.get("disabled") and not self.cancelled.is_set():
+                while jobs and len(inflight) < executor.max_in_flight:
+                    batch = jobs.popleft()
+                    self.requests += 1
+                    future = executor.submit(self._request, batch)
+                    inflight[future] = (batch, time.monotonic() + self.timeout)
+
+                next_deadline = min(deadline for _, deadline in inflight.values())
+                timeout = min(max(next_deadline - time.monotonic(), 0), CANCEL_POLL_SECONDS)
+                done, _ = wait(list(inflight), timeout=timeout, return_when=FIRST_COMPLETED)
+                now = time.monotonic()
+                for future in list(inflight):
+                    batch, deadline = inflight[future]
+                    if future in done:
+                        del inflight[future]
+                        try:
+                            results = future.result()
+                        except Exception as exc:
+                            if len(batch) > 1 and isinstance(exc, PERMANENT_ERRORS):
+                                jobs.extend([text] for text in batch)
+                            else:
+                                self._fail_batch(batch, exc)
+                            continue
+                        if results is None:
+                            # The service merged or split lines; retry this batch one string at a time.
+                            jobs.extend([text] for text in batch)
+                            continue
+                        translated += self._store_batch(batch, results)
+                    elif now >= deadline:
+                        del inflight[future]
+                        executor.abandon(future)
+                        self._fail_batch(batch, TimeoutError("translation timed out"))
+        finally:
+            for future in inflight:
+                executor.abandon(future)
+            executor.shutdown()
+            self.cache.commit()
+
+        print(f"{self.label} translated {translated}/{len(texts)} strings in {self.requests} requests")
+        return translated
+
+    def _request(self, batch: list[str]) -> list[str] | None:
+        """Runs on a worker thread; None means the packed response did not split back cleanly."""
+        if len(batch) == 1:
+            return [self.translator.translate(batch[0])]
+
+        packed = self.translator.translate(BATCH_SEPARATOR.join(batch)) or ""
+        parts = packed.split(BATCH_SEPARATOR)
+        if len(parts) != len(batch):
+            return None
+        return parts
+
+    def _store_batch(self, batch: list[str], results: list[str]) -> int:
+        with self.state_lock:
+            self.state["failures"] = 0
+        count = 0
+        for source, result in zip(batch, results):
+            text = (result or "").strip()
+            if text:
+                self.cache[self.cache_key(source)] = text
+                count += 1
+        return count
+
+    def _fail_batch(self, batch: list[str], exc: Exception) -> None:
+        self._record_failure(exc)
+        retry_seconds = None if isinstance(exc, PERMANENT_ERRORS) else TRANSIENT_RETRY_SECONDS
+        for source in batch:
+            self.cache.mark_failed(self.cache_key(source), retry_seconds)
+
+    def _record_failure(self, exc: Exception) -> None:
+        with self.state_lock:
+            failures = int(self.state.get("failures", 0)) + 1
+            self.state["failures"] = failures
+            tripped = failures >= TRANSLATION_FAILURE_LIMIT and not self.state.get("disabled")
+            if tripped:
+                self.state["disabled"] = True
+        if tripped:
+            print(
+                f"{self.label} translation disabled after {failures} failures: {type(exc).__name__}: {exc}",
+                file=sys.stderr,
+            )
+        else:
+            print(f"{self.label} translate error: {exc}", file=sys.stderr)
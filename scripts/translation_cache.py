@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""SQLite-backed translation cache shared by the news builders.
+
+Replaces data/translation_cache.json, which every builder loaded and rewrote
+in full. Entries are keyed by a 16-byte BLAKE2b digest of the cache key
+("zh::<source text>") and looked up on demand, so startup cost does not grow
+with the number of entries and writes only touch the rows that changed.
+
+- Positive entries carry created/last-hit timestamps; close() evicts rows not
+  hit within ttl_days and then trims the least recently hit rows beyond
+  max_entries (true LRU/TTL instead of insertion-order FIFO).
+- Negative entries record strings that failed to translate; they answer
+  `key in cache` until their retry_after passes (negative_retry_seconds by
+  default, shorter for transient service errors), so a string the service
+  rejects is not retried on every run.
+
+The cache exposes the small dict-like surface BatchTranslator uses:
+`key in cache`, `cache.get(key)`, `cache[key] = value`, `cache.mark_failed(key, retry_seconds)`.
+
+When the builders run in one process (scripts/run_pipeline.py), a single
+cache is shared via share_translation_cache(): open_translation_cache()
+returns it and the builders' close() only commits.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+TRANSLATION_CACHE_DB = ROOT / "data" / "translation_cache.sqlite3"
+LEGACY_CACHE_FILE = ROOT / "data" / "translation_cache.json"
+
+DEFAULT_TTL_DAYS = 90
+DEFAULT_MAX_ENTRIES = 20_000
+NEGATIVE_RETRY_SECONDS = 6 * 3600
+# PRAGMA user_version once the legacy JSON import has run.
+LEGACY_IMPORTED_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+  key BLOB PRIMARY KEY,
+  translated TEXT,
+  created_at REAL NOT NULL,
+  last_hit_at REAL NOT NULL,
+  retry_after REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_translations_last_hit ON translations(last_hit_at);
+"""
+
+
+def hash_key(key: str) -> bytes:
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+
+
+def legacy_rows(path: Path) -> list[tuple[bytes, str, float, float]]:
+    try:
+        legacy = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return []
+    if not isinstance(legacy, dict):
+        return []
+    now = time.time()
+    return [
+        (hash_key(str(key)), value, now, now)
+        for key, value in legacy.items()
+        if isinstance(value, str) and value.strip()
+    ]
+
+
+class TranslationCache:
+    def __init__(
+        self,
+        path: Path | str = TRANSLATION_CACHE_DB,
+        ttl_days: int = DEFAULT_TTL_DAYS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        negative_retry_seconds: int = NEGATIVE_RETRY_SECONDS,
+    ) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_days * 86400
+        self.max_entries = max_entries
+        self.negative_retry_seconds = negative_retry_seconds
+        self.hits: dict[bytes, float] = {}
+        self.lock = threading.Lock()
+
+        if isinstance(path, Path):
+            path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path), check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+
+    def __contains__(self, key: str) -> bool:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT translated, retry_after FROM translations WHERE key = ?",
+                (hash_key(key),),
+            ).fetchone()
+        if row is None:
+            return False
+        translated, retry_after = row
+        return translated is not None or (retry_after or 0) > time.time()
+
+    def get(self, key: str, default: str | None = None) -> str | None:
+        digest = hash_key(key)
+        with self.lock:
+            row = self.conn.execute("SELECT translated FROM translations WHERE key = ?", (digest,)).fetchone()
+            if row is None or row[0] is None:
+                return default
+            self.hits[digest] = time.time()
+        return row[0]
+
+    def __setitem__(self, key: str, value: str) -> None:
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO translations (key, translated, created_at, last_hit_at, retry_after) "
+                "VALUES (?, ?, ?, ?, NULL) "
+                "ON CONFLICT(key) DO UPDATE SET translated=excluded.translated, "
+                "last_hit_at=excluded.last_hit_at, retry_after=NULL",
+                (hash_key(key), value, now, now),
+            )
+
+    def mark_failed(self, key: str, retry_seconds: float | None = None) -> None:
+        """Record a negative entry for retry_seconds (default negative_retry_seconds); translations are kept."""
+        now = time.time()
+        retry_seconds = self.negative_retry_seconds if retry_seconds is None else retry_seconds
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO translations (key, translated, created_at, last_hit_at, retry_after) "
+                "VALUES (?, NULL, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET retry_after=excluded.retry_after, "
+                "last_hit_at=excluded.last_hit_at WHERE translated IS NULL",
+                (hash_key(key), now, now, now + retry_seconds),
+            )
+
+    def __len__(self) -> int:
+        with self.lock:
+            return int(self.conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0])
+
+    def import_legacy(self, path: Path = LEGACY_CACHE_FILE) -> int:
+        """One-off import of the old JSON cache into a new database.
+
+        The database records the attempt in PRAGMA user_version, so the JSON is
+        never read again, even after eviction empties the table.
+        """
+        with self.lock:
+            if int(self.conn.execute("PRAGMA user_version").fetchone()[0]) >= LEGACY_IMPORTED_VERSION:
+                return 0
+        rows = [] if len(self) > 0 else legacy_rows(path)
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO translations (key, translated, created_at, last_hit_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self.conn.execute(f"PRAGMA user_version = {LEGACY_IMPORTED_VERSION}")
+            self.conn.commit()
+        return len(rows)
+
+    def evict(self) -> int:
+        now = time.time()
+        with self.lock:
+            removed = self.conn.execute(
+                "DELETE FROM translations WHERE last_hit_at < ? OR (translated IS NULL AND retry_after < ?)",
+                (now - self.ttl_seconds, now),
+            ).rowcount
+            total = int(self.conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0])
+            overflow = total - self.max_entries
+            if overflow > 0:
+                removed += self.conn.execute(
+                    "DELETE FROM translations WHERE key IN "
+                    "(SELECT key FROM translations ORDER BY last_hit_at ASC LIMIT ?)",
+                    (overflow,),
+                ).rowcount
+        return removed
+
+    def commit(self) -> None:
+        with self.lock:
+            if self.hits:
+                self.conn.executemany(
+                    "UPDATE translations SET last_hit_at = ? WHERE key = ?",
+                    [(hit_at, digest) for digest, hit_at in self.hits.items()],
+                )
+                self.hits.clear()
+            self.conn.commit()
+
+    def close(self) -> None:
+        self.commit()
+        if self is _shared_cache:
+            return
+        self.evict()
+        with self.lock:
+            self.conn.commit()
+            self.conn.close()
+
+
+_shared_cache: TranslationCache | None = None
+
+
+def share_translation_cache(cache: TranslationCache | None) -> None:
+    global _shared_cache
+    _shared_cache = cache
+
+
+def open_translation_cache(path: Path | str = TRANSLATION_CACHE_DB, **kwargs: Any) -> TranslationCache:
+    if _shared_cache is not None and str(_shared_cache.path) == str(path):
+        return _shared_cache
+    cache = TranslationCache(path, **kwargs)
+    if isinstance(path, Path) and path == TRANSLATION_CACHE_DB:
+        imported = cache.import_legacy()
+        if imported:
+            print(f"[translation-cache] imported {imported} entries from {LEGACY_CACHE_FILE.name}")
+    return cache
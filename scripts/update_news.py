@@ -2,7 +2,7 @@
 """Build data/news.json by aggregating AI-related feeds.
 
 Capabilities:
-- Pull RSS/Atom sources from data/news_sources.json
+- Pull RSS/Atom sources from data/news_sources.json concurrently (bounded pool, per-host cap)
 - Keep original source URL for each item
 - Tag each item with AI industry stage (upstream/midstream/downstream)
 - Tag each item with content labels
@@ -16,46 +16,92 @@ from __future__ import annotations
 
 import calendar
 import datetime as dt
+import hashlib
+import heapq
 import html
 import json
 import math
+import multiprocessing
 import os
+import queue
 import re
-import signal
+import sqlite3
 import subprocess
 import tempfile
+import threading
+import time
 import uuid
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 from zoneinfo import ZoneInfo
 
-import feedparser
 import requests
 from deep_translator import GoogleTranslator
 
+try:
+    import numpy as np
+except ImportError:  # optional: ScoringModel falls back to pure Python
+    np = None
+
+from d1_client import NEWS_COLUMNS, D1Client, D1Error, Statement, insert_statements, news_row_hash, render_script
+from fast_feed import parse_entries
+from feed_validators import FeedValidatorStore, content_hash, response_validators
+from keyword_matcher import KeywordMatcher
+from near_dup import find_clusters
+import news_http
+from news_history import NEWS_HISTORY_DB, NewsHistory, open_news_history
+from news_item import NewsItem, json_default, published_timestamp, to_news_items
+from translation import BATCH_MAX_ITEMS, BatchTranslator, point_translator
+from translation_cache import TranslationCache, open_translation_cache
+
 ROOT = Path(__file__).resolve().parent.parent
 SOURCES_FILE = ROOT / "data" / "news_sources.json"
 OUTPUT_FILE = ROOT / "data" / "news.json"
 DIGEST_OUTPUT_FILE = ROOT / "data" / "news_digest.json"
 DIGEST_RULES_FILE = ROOT / "data" / "digest_scoring_rules.json"
-TRANSLATION_CACHE_FILE = ROOT / "data" / "translation_cache.json"
+DIGEST_SHARD_DIR = ROOT / "data" / "digest"
+D1_SYNC_MANIFEST_FILE = ROOT / "data" / "d1_sync_manifest.json"
+FEED_VALIDATORS_FILE = ROOT / "data" / "news_feed_validators.json"
 
 USER_AGENT = "Mozilla/5.0 (compatible; CyrusNewsBot/1.0; +https://cyrustyj.xyz)"
 REQUEST_TIMEOUT = 20
 MAX_ITEMS = 80
 PER_SOURCE_LIMIT = 15
-TRANSLATION_TIMEOUT_SECONDS = 8
-TRANSLATION_FAILURE_LIMIT = 5
+FETCH_MAX_WORKERS = 8
+NORMALIZE_WORKERS_ENV = "NEWS_NORMALIZE_WORKERS"
+# Below this many feeds, starting worker processes costs more than it saves.
+NORMALIZE_POOL_MIN_FEEDS = 24
+INGEST_QUEUE_SIZE = 16
+QUEUE_POLL_SECONDS = 0.2
+# Pre-translate a partial batch once no new items arrived for this long.
+PRETRANSLATE_IDLE_SECONDS = 1.0
+# A newest-first feed is read no further after this many already-seen entries in a row.
+SEEN_RUN_STOP = 5
+# Part of every entry fingerprint; bump it when normalize_item output changes so stored items are rebuilt.
+ENTRY_INDEX_VERSION = 2
+# Serve every feed from one base URL (scripts/standin_services.py) instead of its real host.
+FEED_BASE_ENV = "NEWS_FEED_BASE"
 
 DEFAULT_D1_DATABASE_NAME = "cyrus-ai-news"
 D1_DATABASE_NAME_ENV = "D1_DATABASE_NAME"
 D1_ENABLE_ENV = "ENABLE_D1_SYNC"
 D1_REMOTE_ENV = "D1_REMOTE"
+D1_SYNC_MODE_ENV = "D1_SYNC_MODE"
+NEAR_DEDUPE_ENV = "NEWS_NEAR_DEDUPE"
+DIGEST_INCREMENTAL_ENV = "DIGEST_INCREMENTAL"
+DIGEST_VERIFY_ENV = "DIGEST_VERIFY"
 
 SHANGHAI_TZ = ZoneInfo("Asia/Shanghai")
 
+D1_SYNC_MANIFEST_LIMIT = 5000
+
+D1_NEWS_COLUMNS = ", ".join(NEWS_COLUMNS)
+
 KEYWORDS = [
     "ai",
     "artificial intelligence",
@@ -234,49 +280,18 @@ DEFAULT_DIGEST_RULES: dict[str, Any] = {
 HTML_TAG_RE = re.compile(r"<[^>]+>")
 SPACE_RE = re.compile(r"\s+")
 CJK_RE = re.compile(r"[\u4e00-\u9fff]")
-POINTS_RE = re.compile(r"points?\s*[:：]\s*(\d+)", re.IGNORECASE)
-COMMENTS_RE = re.compile(r"comments?\s*[:：]\s*(\d+)", re.IGNORECASE)
-CN_POINTS_RE = re.compile(r"积分\s*[:：]?\s*(\d+)")
-CN_COMMENTS_RE = re.compile(r"评论\s*[:：]?\s*(\d+)")
-
-
-def _translation_timeout_handler(signum: int, frame: Any) -> None:
-    raise TimeoutError("translation timed out")
+POINTS_RE = re.compile(r"points?\s*:\s*(\d+)", re.IGNORECASE)
+COMMENTS_RE = re.compile(r"comments?\s*:\s*(\d+)", re.IGNORECASE)
+HN_BOILERPLATE_RE = re.compile(
+    r"(?:Article|Comments) URL\s*:\s*\S+|Points\s*:\s*\d+|#\s*Comments\s*:\s*\d+", re.IGNORECASE
+)
+REDDIT_BOILERPLATE_RE = re.compile(r"\s*submitted by\s+/u/\S+(?:\s*\[link\])?(?:\s*\[comments\])?\s*$", re.IGNORECASE)
 
 
 def load_sources() -> list[dict[str, Any]]:
     return json.loads(SOURCES_FILE.read_text(encoding="utf-8"))
 
 
-def load_translation_cache() -> dict[str, str]:
-    if not TRANSLATION_CACHE_FILE.exists():
-        return {}
-    try:
-        return json.loads(TRANSLATION_CACHE_FILE.read_text(encoding="utf-8"))
-    except Exception:
-        return {}
-
-
-def save_translation_cache(cache: dict[str, str]) -> None:
-    MAX_CACHE_AGE_DAYS = 30
-    pruned = _prune_old_cache_entries(cache, MAX_CACHE_AGE_DAYS)
-    TRANSLATION_CACHE_FILE.write_text(json.dumps(pruned, ensure_ascii=False, indent=2), encoding="utf-8")
-
-
-def _prune_old_cache_entries(cache: dict[str, str], max_age_days: int) -> dict[str, str]:
-    """Keep cache under control by limiting total entries.
-
-    Translation cache keys are source text, not timestamped, so we can't
-    prune by date. Instead, keep the most recent N entries (FIFO by dict
-    insertion order, which is preserved in Python 3.7+).
-    """
-    max_entries = 20_000
-    if len(cache) <= max_entries:
-        return cache
-    items = list(cache.items())
-    return dict(items[-max_entries:])
-
-
 def load_digest_rules() -> dict[str, Any]:
     rules = deep_copy(DEFAULT_DIGEST_RULES)
     if not DIGEST_RULES_FILE.exists():
@@ -345,9 +360,43 @@ def parse_datetime(value: Any) -> dt.datetime:
     return parsed.astimezone(dt.timezone.utc)
 
 
-def contains_keyword(text: str) -> bool:
-    lower = text.lower()
-    return any(keyword in lower for keyword in KEYWORDS)
+def item_timestamp(item: Any) -> float:
+    """publishedAt as epoch seconds (parsed once for NewsItem); unparseable values count as now."""
+    ts = published_timestamp(item)
+    return ts if ts is not None else time.time()
+
+
+def build_rule_matcher() -> KeywordMatcher:
+    """Compile KEYWORDS and the action/stage/tag tables into one automaton.
+
+    Labels are ("keyword",), ("action", rule_index), ("stage", stage, keyword)
+    and ("tag", tag); rules keep the substring semantics they always had.
+    """
+    matcher = KeywordMatcher()
+    for keyword in KEYWORDS:
+        matcher.add(keyword, ("keyword",))
+    for index, (keywords, _) in enumerate(ACTION_RULES):
+        for keyword in keywords:
+            matcher.add(keyword, ("action", index))
+    for stage, keywords in STAGE_RULES.items():
+        for keyword in keywords:
+            matcher.add(keyword, ("stage", stage, keyword))
+    for tag, keywords in TAG_RULES:
+        for keyword in keywords:
+            matcher.add(keyword, ("tag", tag))
+    return matcher
+
+
+RULE_MATCHER = build_rule_matcher()
+
+
+def rule_hits(text: str) -> set[Any]:
+    return RULE_MATCHER.scan(text)
+
+
+def contains_keyword(text: str, hits: set[Any] | None = None) -> bool:
+    hits = rule_hits(text) if hits is None else hits
+    return ("keyword",) in hits
 
 
 def clean_url(url: str) -> str:
@@ -367,19 +416,19 @@ def clean_url(url: str) -> str:
     return urlunparse(cleaned)
 
 
-def infer_action(text: str) -> str:
-    lower = text.lower()
-    for keywords, action in ACTION_RULES:
-        if any(keyword in lower for keyword in keywords):
+def infer_action(text: str, hits: set[Any] | None = None) -> str:
+    hits = rule_hits(text) if hits is None else hits
+    for index, (_, action) in enumerate(ACTION_RULES):
+        if ("action", index) in hits:
             return action
     return DEFAULT_ACTION_FALLBACK
 
 
-def infer_industry_stage(text: str) -> str:
-    lower = text.lower()
+def infer_industry_stage(text: str, hits: set[Any] | None = None) -> str:
+    hits = rule_hits(text) if hits is None else hits
     scores: dict[str, int] = {}
     for stage, keywords in STAGE_RULES.items():
-        scores[stage] = sum(1 for kw in keywords if kw in lower)
+        scores[stage] = sum(1 for kw in keywords if ("stage", stage, kw) in hits)
 
     max_score = max(scores.values()) if scores else 0
     if max_score <= 0:
@@ -392,12 +441,12 @@ def infer_industry_stage(text: str) -> str:
     return "中游"
 
 
-def infer_content_tags(text: str) -> list[str]:
-    lower = text.lower()
+def infer_content_tags(text: str, hits: set[Any] | None = None) -> list[str]:
+    hits = rule_hits(text) if hits is None else hits
     tags: list[str] = []
 
-    for tag, keywords in TAG_RULES:
-        if any(keyword in lower for keyword in keywords):
+    for tag, _ in TAG_RULES:
+        if ("tag", tag) in hits:
             tags.append(tag)
         if len(tags) >= 3:
             break
@@ -412,26 +461,7 @@ def has_cjk(text: str) -> bool:
     return bool(CJK_RE.search(text or ""))
 
 
-def translate_via_service(text: str, translator: GoogleTranslator) -> str:
-    if hasattr(signal, "SIGALRM") and hasattr(signal, "setitimer"):
-        previous_handler = signal.getsignal(signal.SIGALRM)
-        try:
-            signal.signal(signal.SIGALRM, _translation_timeout_handler)
-            signal.setitimer(signal.ITIMER_REAL, TRANSLATION_TIMEOUT_SECONDS)
-            return translator.translate(text)
-        finally:
-            signal.setitimer(signal.ITIMER_REAL, 0)
-            signal.signal(signal.SIGALRM, previous_handler)
-
-    return translator.translate(text)
-
-
-def translate_to_zh(
-    text: str,
-    translator: GoogleTranslator | None,
-    cache: dict[str, str],
-    state: dict[str, Any],
-) -> tuple[str, bool]:
+def translate_to_zh(text: str, translator: BatchTranslator) -> tuple[str, bool]:
     stripped = (text or "").strip()
     if not stripped:
         return "", False
@@ -439,39 +469,54 @@ def translate_to_zh(
     if has_cjk(stripped):
         return stripped, False
 
-    key = f"zh::{stripped}"
-    if key in cache:
-        translated = cache[key]
-        return translated, translated.strip() != stripped
-
-    if translator is None or state.get("disabled"):
+    translated = translator.lookup(stripped)
+    if translated is None:
         return stripped, False
-
-    try:
-        translated = translate_via_service(stripped, translator)
-        state["failures"] = 0
-    except Exception as exc:
-        failures = int(state.get("failures", 0)) + 1
-        state["failures"] = failures
-        if failures >= TRANSLATION_FAILURE_LIMIT and not state.get("disabled"):
-            state["disabled"] = True
-            print(
-                f"[WARN] translation disabled after {failures} failures: {type(exc).__name__}: {exc}"
-            )
-        translated = stripped
-
-    translated = (translated or stripped).strip()
-    cache[key] = translated
-    return translated, translated != stripped
+    return translated, translated.strip() != stripped
+
+
+def translate_items(items: list[dict[str, Any]], translator: BatchTranslator) -> None:
+    """Fill the zh fields of overseas items in one batched pass; run it on the final item list only."""
+    overseas = [item for item in items if item.get("region") == "海外"]
+    for item in overseas:
+        translator.add(item["titleOriginal"])
+        translator.add(item["summaryOriginal"])
+    translator.flush()
+
+    for item in overseas:
+        title_zh, title_changed = translate_to_zh(item["titleOriginal"], translator)
+        summary_zh, summary_changed = translate_to_zh(item["summaryOriginal"], translator)
+        item["title"] = title_zh
+        item["summary"] = summary_zh
+        item["titleZh"] = title_zh
+        item["summaryZh"] = summary_zh
+        item["hasTranslation"] = title_changed or summary_changed
+
+
+def hacker_news_metrics(summary: str) -> tuple[str, dict[str, int]]:
+    """hnrss summaries are "Article URL: … Comments URL: … Points: N # Comments: M"."""
+    metrics: dict[str, int] = {}
+    if points := POINTS_RE.search(summary):
+        metrics["points"] = int(points.group(1))
+    if comments := COMMENTS_RE.search(summary):
+        metrics["comments"] = int(comments.group(1))
+    return SPACE_RE.sub(" ", HN_BOILERPLATE_RE.sub(" ", summary)).strip(), metrics
+
+
+def reddit_metrics(summary: str) -> tuple[str, dict[str, int]]:
+    """Reddit RSS carries no vote counts, only a "submitted by /u/… [link] [comments]" trailer."""
+    return REDDIT_BOILERPLATE_RE.sub("", summary).strip(), {}
+
+
+# Source platform -> extractor returning (summary without boilerplate, engagement metrics).
+METRIC_EXTRACTORS: dict[str, Callable[[str], tuple[str, dict[str, int]]]] = {
+    "Hacker News": hacker_news_metrics,
+    "Reddit": reddit_metrics,
+}
 
 
-def normalize_item(
-    source: dict[str, Any],
-    entry: Any,
-    translator: GoogleTranslator | None,
-    translation_cache: dict[str, str],
-    translation_state: dict[str, Any],
-) -> dict[str, Any] | None:
+def normalize_item(source: dict[str, Any], entry: Any) -> NewsItem | None:
+    """Normalize one feed entry; zh fields hold the original text until translate_items runs."""
     title_raw = strip_html(getattr(entry, "title", ""))
     if not title_raw:
         return None
@@ -481,35 +526,32 @@ def normalize_item(
     if not link:
         return None
 
+    metrics: dict[str, int] = {}
+    extractor = METRIC_EXTRACTORS.get(source["platform"])
+    if extractor is not None:
+        summary_raw, metrics = extractor(summary_raw)
+
     text_for_filter = f"{title_raw} {summary_raw}"
-    if source.get("keywords_only", False) and not contains_keyword(text_for_filter):
+    hits = rule_hits(text_for_filter)
+    if source.get("keywords_only", False) and not contains_keyword(text_for_filter, hits):
         return None
 
     published = entry_datetime(entry)
-    action = infer_action(text_for_filter)
-    stage = infer_industry_stage(text_for_filter)
-    tags = infer_content_tags(text_for_filter)
+    action = infer_action(text_for_filter, hits)
+    stage = infer_industry_stage(text_for_filter, hits)
+    tags = infer_content_tags(text_for_filter, hits)
 
     title_original = shorten(title_raw, 140)
     summary_original = shorten(summary_raw or title_raw, 190)
 
-    if source["region"] == "海外":
-        title_zh, title_changed = translate_to_zh(title_original, translator, translation_cache, translation_state)
-        summary_zh, summary_changed = translate_to_zh(summary_original, translator, translation_cache, translation_state)
-        has_translation = title_changed or summary_changed
-    else:
-        title_zh = title_original
-        summary_zh = summary_original
-        has_translation = False
-
-    return {
-        "title": title_zh,
-        "summary": summary_zh,
+    item = {
+        "title": title_original,
+        "summary": summary_original,
         "titleOriginal": title_original,
         "summaryOriginal": summary_original,
-        "titleZh": title_zh,
-        "summaryZh": summary_zh,
-        "hasTranslation": has_translation,
+        "titleZh": title_original,
+        "summaryZh": summary_original,
+        "hasTranslation": False,
         "platform": source["platform"],
         "region": source["region"],
         "industryStage": stage,
@@ -520,47 +562,430 @@ def normalize_item(
         "sourceName": source["name"],
         "publishedAt": published.isoformat(),
     }
+    if metrics:
+        item["metrics"] = metrics
+    return NewsItem.from_dict(item)
+
+
+@dataclass
+class FeedFetchResult:
+    source: dict[str, Any]
+    content: bytes | None
+    elapsed: float
+    error: str = ""
+    not_modified: bool = False
+    body_hash: str = ""
+    validators: dict[str, str] = field(default_factory=dict)
+    items: list[NewsItem] = field(default_factory=list)
+    from_cache: bool = False
+    parsed: ParsedFeed | None = None
+
+
+@dataclass
+class ParsedFeed:
+    items: list[NewsItem]
+    warning: str = ""
+    seen: dict[str, list[str]] = field(default_factory=dict)
+    normalized: int = 0
+    reused: int = 0
+    stopped_at_known: bool = False
+
+
+def feed_request_url(url: str) -> str:
+    base = os.getenv(FEED_BASE_ENV, "").strip().rstrip("/")
+    if not base:
+        return url
+    parsed = urlparse(url)
+    return f"{base}/rss/{parsed.netloc}{parsed.path}" + (f"?{parsed.query}" if parsed.query else "")
 
 
-def fetch_feed(
-    source: dict[str, Any],
-    translator: GoogleTranslator | None,
-    translation_cache: dict[str, str],
-    translation_state: dict[str, Any],
-) -> list[dict[str, Any]]:
-    url = source["url"]
+def fetch_feed(source: dict[str, Any], conditional_headers: dict[str, str] | None = None) -> FeedFetchResult:
+    url = feed_request_url(source["url"])
     headers = {
         "User-Agent": USER_AGENT,
         "Accept": "application/rss+xml, application/xml, text/xml;q=0.9, */*;q=0.8",
     }
+    headers.update(conditional_headers or {})
 
+    started = time.perf_counter()
     try:
-        response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+        response = news_http.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+        if response.status_code == 304:
+            return FeedFetchResult(
+                source=source,
+                content=None,
+                elapsed=time.perf_counter() - started,
+                not_modified=True,
+                validators=response_validators(response.headers),
+            )
         response.raise_for_status()
+        return FeedFetchResult(
+            source=source,
+            content=response.content,
+            elapsed=time.perf_counter() - started,
+            body_hash=content_hash(response.content),
+            validators=response_validators(response.headers),
+        )
     except requests.RequestException as exc:
-        print(f"[WARN] failed {source['name']}: {exc}")
-        return []
+        return FeedFetchResult(source=source, content=None, elapsed=time.perf_counter() - started, error=str(exc))
+
+
+def entry_key(entry: Any) -> str:
+    return str(entry.get("id") or entry.get("link") or "").strip()
+
+
+def entry_fingerprint(source: dict[str, Any], entry: Any) -> str:
+    """Hash of everything normalize_item reads from an entry (and its source settings)."""
+    parts = [
+        str(ENTRY_INDEX_VERSION),
+        source["name"],
+        source["platform"],
+        source["region"],
+        str(bool(source.get("keywords_only", False))),
+        str(entry.get("title") or ""),
+        str(entry.get("summary") or entry.get("description") or ""),
+        str(entry.get("link") or ""),
+        str(entry.get("published") or ""),
+        str(entry.get("updated") or ""),
+    ]
+    return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=8).hexdigest()
 
-    parsed = feedparser.parse(response.content)
-    if getattr(parsed, "bozo", False):
-        bozo_exc = getattr(parsed, "bozo_exception", None)
-        if bozo_exc:
-            print(f"[WARN] parse issue {source['name']}: {bozo_exc}")
 
-    normalized: list[dict[str, Any]] = []
-    for entry in parsed.entries[: PER_SOURCE_LIMIT * 3]:
-        item = normalize_item(source, entry, translator, translation_cache, translation_state)
+def parse_feed_items(
+    source: dict[str, Any],
+    content: bytes,
+    seen: dict[str, list[str]] | None = None,
+    previous: list[dict[str, Any]] | None = None,
+) -> ParsedFeed:
+    """Untranslated items of one raw feed; runs in normalize pool workers.
+
+    `seen` is the source's entry index from the last run and `previous` the
+    items it produced. Entries whose fingerprint is unchanged reuse their
+    stored item (or stay rejected) instead of being normalized again, and a
+    newest-first feed is read only until SEEN_RUN_STOP unchanged entries in
+    a row; the items below that point are carried over from `previous`.
+    """
+    seen = seen or {}
+    stored = {str(row.get("sourceUrl") or ""): row for row in previous or []}
+
+    def known(entry: Any) -> bool:
+        record = seen.get(entry_key(entry))
+        return bool(record) and record[0] == entry_fingerprint(source, entry)
+
+    entries, warning, stopped = parse_entries(content, PER_SOURCE_LIMIT * 3, known=known, known_run=SEEN_RUN_STOP)
+
+    parsed = ParsedFeed(items=[], warning=warning, stopped_at_known=stopped)
+    for entry in entries:
+        key = entry_key(entry)
+        fingerprint = entry_fingerprint(source, entry)
+        record = seen.get(key)
+        if record and record[0] == fingerprint and (not record[1] or record[1] in stored):
+            item = NewsItem.from_dict(stored[record[1]]) if record[1] else None
+            parsed.reused += 1
+        else:
+            item = normalize_item(source, entry)
+            parsed.normalized += 1
+        if key:
+            parsed.seen[key] = [fingerprint, item["sourceUrl"] if item else ""]
         if item:
-            normalized.append(item)
-            if len(normalized) >= PER_SOURCE_LIMIT:
+            parsed.items.append(item)
+            if len(parsed.items) >= PER_SOURCE_LIMIT:
                 break
 
-    return normalized
+    if stopped:
+        for key, record in seen.items():
+            if len(parsed.seen) >= PER_SOURCE_LIMIT * 3:
+                break
+            parsed.seen.setdefault(key, record)
+        urls = {item["sourceUrl"] for item in parsed.items}
+        for url, row in stored.items():
+            if len(parsed.items) >= PER_SOURCE_LIMIT:
+                break
+            if url and url not in urls:
+                parsed.items.append(NewsItem.from_dict(row))
+    return parsed
+
+
+def normalize_workers() -> int:
+    """NEWS_NORMALIZE_WORKERS: 1 (default, in-process), N, or "auto" for one per core; capped at the core count."""
+    cores = os.cpu_count() or 1
+    raw = os.getenv(NORMALIZE_WORKERS_ENV, "1").strip().lower()
+    try:
+        requested = cores if raw == "auto" else int(raw)
+    except ValueError:
+        requested = 1
+    return max(1, min(requested, cores))
+
+
+def normalize_context() -> Any:
+    # Workers fork from a clean forkserver with this module preloaded: no
+    # per-worker import, and no fork of a process with live fetch threads.
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload([__name__])
+    return context
+
+
+def normalize_content(
+    source: dict[str, Any],
+    content: bytes,
+    seen: dict[str, list[str]],
+    previous: list[dict[str, Any]] | None,
+    pool: ProcessPoolExecutor | None,
+) -> ParsedFeed:
+    if pool is not None:
+        try:
+            return pool.submit(parse_feed_items, source, content, seen, previous).result()
+        except (OSError, BrokenProcessPool) as exc:
+            print(f"[WARN] normalize pool unavailable ({exc}), normalizing {source['name']} in-process")
+    return parse_feed_items(source, content, seen, previous)
+
+
+def fetch_and_normalize(
+    source: dict[str, Any], validators: FeedValidatorStore, pool: ProcessPoolExecutor | None = None
+) -> FeedFetchResult:
+    """Conditional fetch of one feed, then its items: stored ones if unchanged, freshly normalized otherwise."""
+    url = source["url"]
+    result = fetch_feed(source, validators.request_headers(url))
+    if result.content is not None and validators.is_unchanged(url, result.body_hash):
+        result.not_modified = True
+    if result.not_modified:
+        cached = validators.cached_items(url)
+        if cached is not None:
+            result.items = to_news_items(cached)
+            result.from_cache = True
+            return result
+    if result.content is not None:
+        result.parsed = normalize_content(
+            source, result.content, validators.seen_entries(url), validators.cached_items(url), pool
+        )
+        result.items = result.parsed.items
+    return result
+
+
+def put_until_stopped(target: queue.Queue, value: Any, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            target.put(value, timeout=QUEUE_POLL_SECONDS)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def get_until_stopped(source: queue.Queue, stop: threading.Event) -> Any:
+    """Next queued value; None (the end-of-stream marker) once stop is set."""
+    while not stop.is_set():
+        try:
+            return source.get(timeout=QUEUE_POLL_SECONDS)
+        except queue.Empty:
+            continue
+    return None
+
+
+def pretranslate(fresh: queue.Queue, translator: BatchTranslator, stop: threading.Event) -> None:
+    """Translate likely survivors while feeds are still arriving.
 
+    Only items among the MAX_ITEMS newest seen so far can survive
+    dedupe_and_sort, and that cutoff only rises as feeds arrive. Once
+    MAX_ITEMS items have been seen, overseas items still above the cutoff are
+    sent when BATCH_MAX_ITEMS strings are waiting or no new items arrived for
+    PRETRANSLATE_IDLE_SECONDS. What is left when the stream ends goes to
+    translate_items() after dedupe, which translates exactly the survivors.
+    """
+    newest: list[float] = []
+    waiting: list[NewsItem] = []
+    idle_since = time.monotonic()
+
+    def send() -> None:
+        for item in waiting:
+            if (item.published_ts or 0.0) >= newest[0]:
+                translator.add(item["titleOriginal"])
+                translator.add(item["summaryOriginal"])
+        waiting.clear()
+        translator.flush()
+
+    while not stop.is_set():
+        try:
+            items = fresh.get(timeout=QUEUE_POLL_SECONDS)
+        except queue.Empty:
+            idle = time.monotonic() - idle_since >= PRETRANSLATE_IDLE_SECONDS
+            if waiting and idle and len(newest) >= MAX_ITEMS:
+                send()
+            continue
+        if items is None:
+            return
+        idle_since = time.monotonic()
+        for item in items:
+            published = item.published_ts or 0.0
+            if len(newest) < MAX_ITEMS:
+                heapq.heappush(newest, published)
+            elif published > newest[0]:
+                heapq.heapreplace(newest, published)
+            else:
+                continue
+            if item.get("region") == "海外":
+                waiting.append(item)
+        if len(newest) >= MAX_ITEMS and 2 * len(waiting) >= BATCH_MAX_ITEMS:
+            send()
+
+
+def ingest_feeds(
+    sources: list[dict[str, Any]], validators: FeedValidatorStore, translator: BatchTranslator
+) -> list[NewsItem]:
+    """Fetch, normalize and pre-translate every source as one streaming pipeline.
+
+        fetch + normalize workers --queue--> collector --queue--> pretranslate
+
+    FETCH_MAX_WORKERS threads download feeds (news_http caps in-flight
+    requests per host) and normalize each body as soon as it arrives, in the
+    process pool when NEWS_NORMALIZE_WORKERS enables it. The collector (the
+    calling thread) logs results and records validators in completion order.
+    pretranslate() runs on its own thread, so translation requests for early
+    feeds overlap with later downloads and the run takes about
+    max(fetch, translate) rather than their sum; translate_items() after
+    dedupe only fills in what was not pre-translated.
+
+    Queues are bounded, so a slow translator stalls the collector and then
+    the fetch workers instead of buffering every feed. Any exception
+    (KeyboardInterrupt included) sets the stop event: queued fetches are
+    cancelled, a running translation flush is cancelled, every stage exits at
+    its next queue operation and the exception is re-raised. Returns items in
+    source order.
+    """
+    if not sources:
+        return []
 
-def dedupe_and_sort(items: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    stop = threading.Event()
+    errors: list[BaseException] = []
+    fetched: queue.Queue[tuple[int, FeedFetchResult] | None] = queue.Queue(INGEST_QUEUE_SIZE)
+    fresh: queue.Queue[list[NewsItem] | None] = queue.Queue(INGEST_QUEUE_SIZE)
+    per_source: list[list[NewsItem]] = [[] for _ in sources]
+    workers = normalize_workers() if len(sources) >= NORMALIZE_POOL_MIN_FEEDS else 1
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=normalize_context()) if workers > 1 else None
+
+    def guarded(stage: Callable[[], None]) -> Callable[[], None]:
+        def run() -> None:
+            try:
+                stage()
+            except BaseException as exc:
+                errors.append(exc)
+                stop.set()
+
+        return run
+
+    def fetch_one(index: int, source: dict[str, Any]) -> None:
+        if not stop.is_set():
+            put_until_stopped(fetched, (index, fetch_and_normalize(source, validators, pool)), stop)
+
+    def fetch_stage() -> None:
+        try:
+            fetch_workers = min(FETCH_MAX_WORKERS, len(sources))
+            with ThreadPoolExecutor(max_workers=fetch_workers, thread_name_prefix="fetch") as fetch_pool:
+                futures = [fetch_pool.submit(fetch_one, index, source) for index, source in enumerate(sources)]
+                try:
+                    for future in as_completed(futures):
+                        future.result()
+                except BaseException:
+                    stop.set()
+                    fetch_pool.shutdown(cancel_futures=True)
+                    raise
+        finally:
+            put_until_stopped(fetched, None, stop)
+
+    normalized = reused = stopped_early = 0
+    started = time.perf_counter()
+    stages = [
+        threading.Thread(target=guarded(fetch_stage), name="ingest-fetch", daemon=True),
+        threading.Thread(
+            target=guarded(lambda: pretranslate(fresh, translator, stop)), name="ingest-translate", daemon=True
+        ),
+    ]
+    for stage in stages:
+        stage.start()
+    try:
+        while (entry := get_until_stopped(fetched, stop)) is not None:
+            index, result = entry
+            if result.error:
+                print(f"[WARN] failed {result.source['name']}: {result.error} ({result.elapsed:.2f}s)")
+                continue
+            if result.parsed and result.parsed.warning:
+                print(f"[WARN] parse issue {result.source['name']}: {result.parsed.warning}")
+            if result.not_modified:
+                print(f"[INFO] unchanged {result.source['name']} in {result.elapsed:.2f}s")
+            else:
+                size = len(result.content or b"")
+                print(f"[INFO] fetched {result.source['name']} in {result.elapsed:.2f}s ({size} bytes)")
+            if result.parsed is not None:
+                validators.update(
+                    result.source["url"],
+                    result.validators,
+                    result.body_hash,
+                    [item.to_dict() for item in result.items],
+                    seen=result.parsed.seen,
+                )
+                normalized += result.parsed.normalized
+                reused += result.parsed.reused
+                stopped_early += result.parsed.stopped_at_known
+            per_source[index] = result.items
+            put_until_stopped(fresh, result.items, stop)
+        put_until_stopped(fresh, None, stop)
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        if stop.is_set():
+            translator.cancel()
+        for stage in stages:
+            stage.join()
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    if errors:
+        raise errors[0]
+
+    print(
+        f"[INFO] ingested {len(sources)} sources in {time.perf_counter() - started:.2f}s "
+        f"({normalized} entries normalized, {reused} reused, {stopped_early} feeds stopped at known entries)"
+    )
+    return [item for items in per_source for item in items]
+
+
+def merge_near_duplicates(items: list[NewsItem], authority: Callable[[Any], int]) -> list[NewsItem]:
+    """Fold syndicated copies of a story into one item.
+
+    The highest-authority copy (earliest published on ties) is kept and the
+    others are listed in its `alsoReportedBy`.
+    """
+    clusters = find_clusters(
+        [item.get("titleOriginal", "") for item in items],
+        [item.get("summaryOriginal", "") for item in items],
+        groups=[item.get("sourceName", "") for item in items],
+    )
+    dropped: set[int] = set()
+    for members in clusters:
+        ranked = sorted(
+            members,
+            key=lambda index: (-authority(items[index]), items[index].published_ts or float("inf"), index),
+        )
+        keeper = items[ranked[0]]
+        keeper["alsoReportedBy"] = [
+            {
+                "sourceName": items[index].get("sourceName", ""),
+                "sourceUrl": items[index].get("sourceUrl", ""),
+                "platform": items[index].get("platform", ""),
+            }
+            for index in ranked[1:]
+        ]
+        dropped.update(ranked[1:])
+    if dropped:
+        print(f"[INFO] near-duplicate stories merged: {len(dropped)} copies in {len(clusters)} clusters")
+    return [item for index, item in enumerate(items) if index not in dropped]
+
+
+def dedupe_and_sort(items: list[NewsItem], authority: Callable[[Any], int] | None = None) -> list[NewsItem]:
     seen: set[str] = set()
-    out: list[dict[str, Any]] = []
+    out: list[NewsItem] = []
 
     for item in items:
         key = item["sourceUrl"] or item["titleOriginal"]
@@ -569,26 +994,33 @@ def dedupe_and_sort(items: list[dict[str, Any]]) -> list[dict[str, Any]]:
         seen.add(key)
         out.append(item)
 
+    near_enabled = os.getenv(NEAR_DEDUPE_ENV, "1").strip().lower() not in {"0", "false", "no", "off"}
+    if authority is not None and near_enabled:
+        out = merge_near_duplicates(out, authority)
+
     out.sort(key=lambda x: x.get("publishedAt", ""), reverse=True)
     return out[:MAX_ITEMS]
 
 
-def build_news() -> tuple[dict[str, Any], dict[str, str]]:
+def build_news() -> tuple[dict[str, Any], TranslationCache]:
     sources = load_sources()
-    translation_cache = load_translation_cache()
+    translation_cache = open_translation_cache()
     translation_state: dict[str, Any] = {"failures": 0, "disabled": False}
 
-    translator: GoogleTranslator | None
+    service: GoogleTranslator | None
     try:
-        translator = GoogleTranslator(source="auto", target="zh-CN")
+        service = point_translator(GoogleTranslator(source="auto", target="zh-CN"))
     except Exception:
-        translator = None
+        service = None
+    translator = BatchTranslator(service, translation_cache, translation_state, label="[translate]")
 
-    items: list[dict[str, Any]] = []
-    for source in sources:
-        items.extend(fetch_feed(source, translator, translation_cache, translation_state))
+    validators = FeedValidatorStore(FEED_VALIDATORS_FILE)
+    items = ingest_feeds(sources, validators, translator)
+    validators.save()
 
-    merged = dedupe_and_sort(items)
+    merged = dedupe_and_sort(items, ScoringModel(load_digest_rules()).authority_score)
+    # Survivors that were not pre-translated during ingest are translated here.
+    translate_items(merged, translator)
     now = dt.datetime.now(tz=dt.timezone.utc)
 
     payload = {
@@ -604,156 +1036,170 @@ def clamp(value: float, lower: float, upper: float) -> float:
     return max(lower, min(value, upper))
 
 
-def compute_recency_score(item: dict[str, Any], generated_at: dt.datetime, rules: dict[str, Any]) -> int:
-    max_score = int(rules.get("weights", {}).get("recency", 35))
-    buckets = rules.get("recencyBuckets", [])
-    published_at = parse_datetime(item.get("publishedAt")).astimezone(SHANGHAI_TZ)
-    generated_bj = generated_at.astimezone(SHANGHAI_TZ)
-    delta_hours = max((generated_bj - published_at).total_seconds() / 3600, 0)
-
-    for bucket in buckets:
-        max_hours = bucket.get("maxHours")
-        score = int(bucket.get("score", 0))
-        if max_hours is None or delta_hours <= float(max_hours):
-            return int(clamp(score, 0, max_score))
-
-    return 0
-
-
-def compute_authority_score(item: dict[str, Any], rules: dict[str, Any]) -> int:
-    authority_rules = rules.get("authority", {})
-    tier_scores = authority_rules.get("tierScores", {})
-    tiers = authority_rules.get("tiers", {})
-
-    platform = str(item.get("platform", "")).strip().lower()
-    matched_tier = ""
-    for tier_name, platforms in tiers.items():
-        if not isinstance(platforms, list):
-            continue
-        lookup = {str(name).strip().lower() for name in platforms if str(name).strip()}
-        if platform in lookup:
-            matched_tier = str(tier_name)
-            break
-
-    if matched_tier:
-        return int(tier_scores.get(matched_tier, tier_scores.get("default", 12)))
-
-    return int(tier_scores.get("default", 12))
-
-
-def compute_topic_score(item: dict[str, Any], rules: dict[str, Any]) -> int:
-    tag_scores = rules.get("topicTagScores", {})
-    tags = item.get("contentTags", []) if isinstance(item.get("contentTags"), list) else []
-    candidates = [float(tag_scores.get(str(tag), 0)) for tag in tags]
-    candidates.sort(reverse=True)
-
-    top_count = max(int(rules.get("topicTopCount", 2)), 1)
-    cap_score = float(rules.get("topicScoreCap", rules.get("weights", {}).get("topic", 20)))
-    score = sum(candidates[:top_count])
-    return int(clamp(round(score), 0, cap_score))
-
-
-def compute_actionability_score(item: dict[str, Any], rules: dict[str, Any]) -> int:
-    action_rules = rules.get("actionability", {})
-    fallback_score = int(action_rules.get("fallbackScore", 4))
-    normal_score = int(action_rules.get("normalScore", 7))
-    strong_score = int(action_rules.get("strongScore", 10))
-    strong_min_length = int(action_rules.get("strongMinLength", 20))
-
-    fallback_actions = {
-        str(text).strip()
-        for text in action_rules.get("fallbackActions", [])
-        if str(text).strip()
-    }
-
-    action = str(item.get("action", "")).strip()
-    if not action or action in fallback_actions:
-        return fallback_score
-    if len(action) >= strong_min_length:
-        return strong_score
-    return normal_score
-
-
-def extract_points_and_comments(text: str) -> tuple[int | None, int | None]:
-    points = None
-    comments = None
-
-    points_match = POINTS_RE.search(text) or CN_POINTS_RE.search(text)
-    comments_match = COMMENTS_RE.search(text) or CN_COMMENTS_RE.search(text)
+UNIX_EPOCH = dt.datetime(1970, 1, 1, tzinfo=dt.timezone.utc)
+MICROSECOND = dt.timedelta(microseconds=1)
 
-    if points_match:
-        points = int(points_match.group(1))
-    if comments_match:
-        comments = int(comments_match.group(1))
 
-    return points, comments
+def epoch_microseconds(value: dt.datetime) -> int:
+    return (value - UNIX_EPOCH) // MICROSECOND
 
 
-def compute_heat_score(item: dict[str, Any], rules: dict[str, Any]) -> int:
-    heat_rules = rules.get("heat", {})
-    default_score = int(heat_rules.get("defaultScore", 5))
-    points_weight = float(heat_rules.get("pointsWeight", 1.0))
-    comments_weight = float(heat_rules.get("commentsWeight", 1.5))
-    reference_value = max(float(heat_rules.get("referenceValue", 500)), 1.0)
-    max_score = int(rules.get("weights", {}).get("heat", 10))
+class ScoringModel:
+    """Digest scoring rules compiled once from load_digest_rules().
 
-    candidates = [
-        str(item.get("summaryOriginal", "")),
-        str(item.get("summaryZh", "")),
-        str(item.get("summary", "")),
-    ]
+    score_batch() scores a whole item list in one pass and gives the same
+    aiScore / aiScoreBreakdown as evaluating the rules item by item. With numpy
+    installed, recency bucketing and the totals run as array operations;
+    authority, topic, actionability and heat are per-item lookups either way
+    (heat reads the `metrics` normalize_item extracted and keeps math.log1p
+    so rounding cannot drift).
+    """
 
-    parsed_points = None
-    parsed_comments = None
-    for text in candidates:
-        points, comments = extract_points_and_comments(text)
-        if points is not None:
-            parsed_points = points
-        if comments is not None:
-            parsed_comments = comments
-        if parsed_points is not None and parsed_comments is not None:
-            break
+    def __init__(self, rules: dict[str, Any]) -> None:
+        weights = rules.get("weights", {})
+        self.max_total = int(sum(float(value) for value in weights.values()))
+
+        recency_max = int(weights.get("recency", 35))
+        self.recency_buckets: list[tuple[float | None, int]] = []
+        for bucket in rules.get("recencyBuckets", []):
+            max_hours = bucket.get("maxHours")
+            score = int(clamp(int(bucket.get("score", 0)), 0, recency_max))
+            self.recency_buckets.append((None if max_hours is None else float(max_hours), score))
+
+        authority_rules = rules.get("authority", {})
+        tier_scores = authority_rules.get("tierScores", {})
+        self.authority_default = int(tier_scores.get("default", 12))
+        self.authority_lookup: dict[str, int] = {}
+        for tier_name, platforms in authority_rules.get("tiers", {}).items():
+            if not isinstance(platforms, list):
+                continue
+            tier = str(tier_name)
+            score = int(tier_scores.get(tier, self.authority_default)) if tier else self.authority_default
+            for name in platforms:
+                key = str(name).strip().lower()
+                if key and key not in self.authority_lookup:
+                    self.authority_lookup[key] = score
+
+        self.topic_scores = {str(tag): float(score) for tag, score in rules.get("topicTagScores", {}).items()}
+        self.topic_top_count = max(int(rules.get("topicTopCount", 2)), 1)
+        self.topic_cap = float(rules.get("topicScoreCap", weights.get("topic", 20)))
+
+        action_rules = rules.get("actionability", {})
+        self.action_fallback_score = int(action_rules.get("fallbackScore", 4))
+        self.action_normal_score = int(action_rules.get("normalScore", 7))
+        self.action_strong_score = int(action_rules.get("strongScore", 10))
+        self.action_strong_min_length = int(action_rules.get("strongMinLength", 20))
+        self.action_fallbacks = {
+            str(text).strip()
+            for text in action_rules.get("fallbackActions", [])
+            if str(text).strip()
+        }
 
-    if parsed_points is None and parsed_comments is None:
-        return int(clamp(default_score, 0, max_score))
+        heat_rules = rules.get("heat", {})
+        self.heat_max = int(weights.get("heat", 10))
+        self.heat_default = int(clamp(int(heat_rules.get("defaultScore", 5)), 0, self.heat_max))
+        self.heat_points_weight = float(heat_rules.get("pointsWeight", 1.0))
+        self.heat_comments_weight = float(heat_rules.get("commentsWeight", 1.5))
+        self.heat_reference_log = math.log1p(max(float(heat_rules.get("referenceValue", 500)), 1.0))
+
+    def recency_scores(self, items: list[dict[str, Any]], generated_at: dt.datetime) -> list[int]:
+        # Age is measured on absolute time; Asia/Shanghai has had a fixed offset since 1991,
+        # so this matches the wall-clock difference the digest reports in.
+        generated_us = epoch_microseconds(generated_at)
+        published_us = [round(item_timestamp(item) * 10**6) for item in items]
+
+        if np is not None and items:
+            hours = np.maximum((generated_us - np.array(published_us, dtype=np.int64)) / 10**6 / 3600, 0)
+            scores = np.zeros(len(items), dtype=np.int64)
+            pending = np.ones(len(items), dtype=bool)
+            for max_hours, score in self.recency_buckets:
+                hit = pending if max_hours is None else pending & (hours <= max_hours)
+                scores[hit] = score
+                pending &= ~hit
+            return scores.tolist()
+
+        result: list[int] = []
+        for value in published_us:
+            delta_hours = max((generated_us - value) / 10**6 / 3600, 0)
+            score = 0
+            for max_hours, bucket_score in self.recency_buckets:
+                if max_hours is None or delta_hours <= max_hours:
+                    score = bucket_score
+                    break
+            result.append(score)
+        return result
+
+    def authority_score(self, item: dict[str, Any]) -> int:
+        platform = str(item.get("platform", "")).strip().lower()
+        return self.authority_lookup.get(platform, self.authority_default)
+
+    def topic_score(self, item: dict[str, Any]) -> int:
+        tags = item.get("contentTags", []) if isinstance(item.get("contentTags"), list) else []
+        candidates = sorted((self.topic_scores.get(str(tag), 0.0) for tag in tags), reverse=True)
+        score = sum(candidates[: self.topic_top_count])
+        return int(clamp(round(score), 0, self.topic_cap))
+
+    def actionability_score(self, item: dict[str, Any]) -> int:
+        action = str(item.get("action", "")).strip()
+        if not action or action in self.action_fallbacks:
+            return self.action_fallback_score
+        if len(action) >= self.action_strong_min_length:
+            return self.action_strong_score
+        return self.action_normal_score
+
+    def heat_score(self, item: dict[str, Any]) -> int:
+        metrics = item.get("metrics") if isinstance(item.get("metrics"), dict) else {}
+        parsed_points = metrics.get("points")
+        parsed_comments = metrics.get("comments")
+        if parsed_points is None and parsed_comments is None:
+            return self.heat_default
+
+        weighted = max(parsed_points or 0, 0) * self.heat_points_weight
+        weighted += max(parsed_comments or 0, 0) * self.heat_comments_weight
+        normalized = math.log1p(max(weighted, 0.0)) / self.heat_reference_log
+        score = round(clamp(normalized, 0, 1) * self.heat_max)
+        return int(clamp(score, 0, self.heat_max))
+
+    def score_batch(self, items: list[dict[str, Any]], generated_at: dt.datetime) -> list[dict[str, int]]:
+        """Return one breakdown dict per item, with the clamped total under "total"."""
+        recency = self.recency_scores(items, generated_at)
+        authority = [self.authority_score(item) for item in items]
+        topic = [self.topic_score(item) for item in items]
+        actionability = [self.actionability_score(item) for item in items]
+        heat = [self.heat_score(item) for item in items]
+
+        cap = self.max_total if self.max_total > 0 else 100
+        if np is not None and items:
+            totals = np.clip(
+                np.array(recency) + np.array(authority) + np.array(topic) + np.array(actionability) + np.array(heat),
+                0,
+                cap,
+            ).tolist()
+        else:
+            totals = [
+                int(clamp(r + a + t + ac + h, 0, cap))
+                for r, a, t, ac, h in zip(recency, authority, topic, actionability, heat)
+            ]
 
-    points_value = max(parsed_points or 0, 0)
-    comments_value = max(parsed_comments or 0, 0)
+        return [
+            {"total": int(total), "recency": r, "authority": a, "topic": t, "actionability": ac, "heat": h}
+            for total, r, a, t, ac, h in zip(totals, recency, authority, topic, actionability, heat)
+        ]
 
-    weighted = points_value * points_weight + comments_value * comments_weight
-    normalized = math.log1p(max(weighted, 0.0)) / math.log1p(reference_value)
-    score = round(clamp(normalized, 0, 1) * max_score)
-    return int(clamp(score, 0, max_score))
+    def apply(self, items: list[dict[str, Any]], generated_at: dt.datetime) -> None:
+        for item, scores in zip(items, self.score_batch(items, generated_at)):
+            item["aiScore"] = scores.pop("total")
+            item["aiScoreBreakdown"] = scores
 
 
 def apply_ai_scores(items: list[dict[str, Any]], generated_at: dt.datetime, rules: dict[str, Any]) -> None:
-    weights = rules.get("weights", {})
-    max_total = int(sum(float(value) for value in weights.values()))
-
-    for item in items:
-        recency = compute_recency_score(item, generated_at, rules)
-        authority = compute_authority_score(item, rules)
-        topic = compute_topic_score(item, rules)
-        actionability = compute_actionability_score(item, rules)
-        heat = compute_heat_score(item, rules)
-
-        total = int(round(recency + authority + topic + actionability + heat))
-        total = int(clamp(total, 0, max_total if max_total > 0 else 100))
-
-        item["aiScore"] = total
-        item["aiScoreBreakdown"] = {
-            "recency": recency,
-            "authority": authority,
-            "topic": topic,
-            "actionability": actionability,
-            "heat": heat,
-        }
+    ScoringModel(rules).apply(items, generated_at)
 
 
 def sort_top_items(items: list[dict[str, Any]]) -> list[dict[str, Any]]:
     def key(item: dict[str, Any]) -> tuple[int, float, str]:
         score = int(item.get("aiScore", 0) or 0)
-        ts = parse_datetime(item.get("publishedAt", "")).timestamp()
+        ts = item_timestamp(item)
         source_url = str(item.get("sourceUrl", "") or "")
         return (-score, -ts, source_url)
 
@@ -820,6 +1266,18 @@ def ensure_daily_entry_shape(entry: dict[str, Any]) -> dict[str, Any] | None:
     except ValueError:
         return None
 
+    # Rows written by a previous run already have this exact shape; reuse them as-is.
+    if (
+        list(entry) == ["date", "label", "top10", "metrics", "briefing"]
+        and entry["date"] == raw_date
+        and isinstance(entry["label"], str)
+        and entry["label"]
+        and isinstance(entry["top10"], list)
+        and isinstance(entry["metrics"], dict)
+        and isinstance(entry["briefing"], list)
+    ):
+        return entry
+
     return {
         "date": raw_date,
         "label": str(entry.get("label") or raw_date),
@@ -832,7 +1290,7 @@ def ensure_daily_entry_shape(entry: dict[str, Any]) -> dict[str, Any] | None:
 def build_current_day_entry(items: list[dict[str, Any]], target_day: dt.date, top_n: int) -> dict[str, Any]:
     day_items: list[dict[str, Any]] = []
     for item in items:
-        published_at = parse_datetime(item.get("publishedAt", "")).astimezone(SHANGHAI_TZ).date()
+        published_at = dt.datetime.fromtimestamp(item_timestamp(item), tz=SHANGHAI_TZ).date()
         if published_at == target_day:
             day_items.append(item)
 
@@ -914,7 +1372,7 @@ def build_weekly_entry(week_key: str, day_entries: list[dict[str, Any]], top_n:
         all_top_items,
         key=lambda row: (
             -int(row.get("aiScore", 0) or 0),
-            -parse_datetime(row.get("publishedAt", "")).timestamp(),
+            -item_timestamp(row),
             str(row.get("sourceUrl", "") or ""),
         ),
     )
@@ -972,18 +1430,51 @@ def build_weekly_entry(week_key: str, day_entries: list[dict[str, Any]], top_n:
     }
 
 
-def build_weekly_history(daily_history: list[dict[str, Any]], top_n: int) -> list[dict[str, Any]]:
+def week_key_of(date_text: str) -> str | None:
+    try:
+        day = dt.date.fromisoformat(date_text)
+    except Exception:
+        return None
+    return week_meta(day)[0]
+
+
+def build_weekly_history(
+    daily_history: list[dict[str, Any]],
+    top_n: int,
+    previous_weekly: list[dict[str, Any]] | None = None,
+    dirty_weeks: set[str] | None = None,
+) -> list[dict[str, Any]]:
+    """Group daily rows into weekly entries.
+
+    With previous_weekly, entries for weeks outside dirty_weeks are reused
+    verbatim (as long as they cover the same number of days) instead of being
+    rebuilt; only the dirty weeks pay for build_weekly_entry.
+    """
     grouped: dict[str, list[dict[str, Any]]] = defaultdict(list)
     for entry in daily_history:
-        try:
-            day = dt.date.fromisoformat(entry.get("date", ""))
-        except Exception:
+        week_key = week_key_of(entry.get("date", ""))
+        if week_key is None:
             continue
-        week_key, _, _, _ = week_meta(day)
         grouped[week_key].append(entry)
 
+    previous: dict[str, dict[str, Any]] = {}
+    for row in previous_weekly or []:
+        if isinstance(row, dict) and row.get("weekKey"):
+            previous[str(row["weekKey"])] = row
+    dirty_weeks = dirty_weeks or set()
+
     weekly_entries: list[dict[str, Any]] = []
     for week_key, entries in grouped.items():
+        reused = previous.get(week_key)
+        if (
+            previous_weekly is not None
+            and week_key not in dirty_weeks
+            and reused is not None
+            and isinstance(reused.get("metrics"), dict)
+            and reused["metrics"].get("daysCovered") == len(entries)
+        ):
+            weekly_entries.append(reused)
+            continue
         sorted_entries = sorted(entries, key=lambda row: row.get("date", ""), reverse=True)
         weekly_entries.append(build_weekly_entry(week_key, sorted_entries, top_n))
 
@@ -991,7 +1482,81 @@ def build_weekly_history(daily_history: list[dict[str, Any]], top_n: int) -> lis
     return weekly_entries
 
 
-def build_news_digest(payload: dict[str, Any], generated_at: dt.datetime, rules: dict[str, Any]) -> dict[str, Any]:
+def load_existing_digest() -> dict[str, Any]:
+    if not DIGEST_OUTPUT_FILE.exists():
+        return {}
+    try:
+        payload = json.loads(DIGEST_OUTPUT_FILE.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+def with_history_day_items(
+    payload: dict[str, Any], history: NewsHistory, generated_at: dt.datetime, rules: dict[str, Any]
+) -> dict[str, Any]:
+    """Payload whose items also cover everything the history store has for today.
+
+    news.json keeps only MAX_ITEMS items, so earlier runs' items for today may
+    have dropped out of it; this run's copies win on overlap, copies this run
+    folded into another item's `alsoReportedBy` stay out, and the earlier
+    items are rescored against `generated_at` so top10 ranks like with like.
+    """
+    target_day = generated_at.astimezone(SHANGHAI_TZ).date()
+    day_start = dt.datetime.combine(target_day, dt.time.min, tzinfo=SHANGHAI_TZ)
+    day_end = day_start + dt.timedelta(days=1)
+    current = payload.get("items", [])
+    covered = {item.get("sourceUrl") for item in current}
+    for item in current:
+        for copy in item.get("alsoReportedBy") or []:
+            covered.add(copy.get("sourceUrl"))
+    earlier = [
+        item
+        for item in history.query(since=day_start.timestamp(), until=day_end.timestamp() - 1e-6)
+        if item.get("sourceUrl") not in covered
+    ]
+    apply_ai_scores(earlier, generated_at, rules)
+    return {**payload, "items": list(current) + earlier}
+
+
+def build_news_digest(
+    payload: dict[str, Any],
+    generated_at: dt.datetime,
+    rules: dict[str, Any],
+    existing_payload: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Build the digest, incrementally unless DIGEST_INCREMENTAL=0.
+
+    With DIGEST_VERIFY=1 the incremental result is compared against a full
+    rebuild; on a mismatch a warning is printed and the full rebuild is used.
+    """
+    if existing_payload is None:
+        existing_payload = load_existing_digest()
+
+    incremental = os.getenv(DIGEST_INCREMENTAL_ENV, "1").strip().lower() not in {"0", "false", "no", "off"}
+    verify = os.getenv(DIGEST_VERIFY_ENV, "0").strip().lower() in {"1", "true", "yes", "on"}
+    if not verify:
+        return assemble_news_digest(payload, generated_at, rules, existing_payload, incremental)
+
+    # build_weekly_entry re-ranks the shared top10 rows in place, so each build gets its own copy.
+    full = assemble_news_digest(payload, generated_at, rules, deep_copy(existing_payload), incremental=False)
+    if not incremental:
+        return full
+    result = assemble_news_digest(payload, generated_at, rules, existing_payload, incremental=True)
+    if result != full:
+        print("[WARN] incremental digest differs from full rebuild, using full rebuild")
+        return full
+    print("[INFO] incremental digest matches full rebuild")
+    return result
+
+
+def assemble_news_digest(
+    payload: dict[str, Any],
+    generated_at: dt.datetime,
+    rules: dict[str, Any],
+    existing_payload: dict[str, Any],
+    incremental: bool,
+) -> dict[str, Any]:
     history_days = max(int(rules.get("historyDays", 90)), 1)
     top_n = max(int(rules.get("topN", 10)), 1)
     target_day = generated_at.astimezone(SHANGHAI_TZ).date()
@@ -999,15 +1564,10 @@ def build_news_digest(payload: dict[str, Any], generated_at: dt.datetime, rules:
     current_day = build_current_day_entry(payload.get("items", []), target_day, top_n)
 
     existing_daily: list[dict[str, Any]] = []
-    if DIGEST_OUTPUT_FILE.exists():
-        try:
-            existing_payload = json.loads(DIGEST_OUTPUT_FILE.read_text(encoding="utf-8"))
-            for row in existing_payload.get("dailyHistory", []) if isinstance(existing_payload, dict) else []:
-                normalized = ensure_daily_entry_shape(row)
-                if normalized:
-                    existing_daily.append(normalized)
-        except Exception:
-            existing_daily = []
+    for row in existing_payload.get("dailyHistory", []) if isinstance(existing_payload.get("dailyHistory"), list) else []:
+        normalized = ensure_daily_entry_shape(row)
+        if normalized:
+            existing_daily.append(normalized)
 
     daily_map: dict[str, dict[str, Any]] = {row["date"]: row for row in existing_daily}
     daily_map[current_day["date"]] = current_day
@@ -1015,7 +1575,18 @@ def build_news_digest(payload: dict[str, Any], generated_at: dt.datetime, rules:
     daily_history = sorted(daily_map.values(), key=lambda row: row.get("date", ""), reverse=True)[:history_days]
     current_day = daily_map.get(target_day.isoformat(), current_day)
 
-    weekly_history = build_weekly_history(daily_history, top_n)
+    if incremental and isinstance(existing_payload.get("weeklyHistory"), list):
+        # Only the current week and weeks that lost days to the historyDays cut can change.
+        kept_dates = {row["date"] for row in daily_history}
+        dirty_weeks = {week_meta(target_day)[0]}
+        for date_text in daily_map:
+            if date_text not in kept_dates:
+                week_key = week_key_of(date_text)
+                if week_key:
+                    dirty_weeks.add(week_key)
+        weekly_history = build_weekly_history(daily_history, top_n, existing_payload["weeklyHistory"], dirty_weeks)
+    else:
+        weekly_history = build_weekly_history(daily_history, top_n)
     current_week_key, current_week_label, current_week_start, current_week_end = week_meta(target_day)
     current_week = next((row for row in weekly_history if row.get("weekKey") == current_week_key), None)
     if current_week is None:
@@ -1049,84 +1620,220 @@ def build_news_digest(payload: dict[str, Any], generated_at: dt.datetime, rules:
     return digest_payload
 
 
-def sql_text(value: Any) -> str:
-    return "'" + str(value).replace("'", "''") + "'"
+def write_shard(path: Path, payload: Any) -> bool:
+    """Write a shard only when its content changed; returns True if the file was written."""
+    text = json.dumps(payload, ensure_ascii=False, indent=2)
+    try:
+        if path.read_text(encoding="utf-8") == text:
+            return False
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return True
+
+
+def write_digest_shards(digest_payload: dict[str, Any], shard_dir: Path = DIGEST_SHARD_DIR) -> dict[str, Any]:
+    """Split the digest into data/digest/{manifest,current}.json plus days/ and weeks/ shards.
+
+    news_digest.json stays the compatibility copy; clients that only render the
+    current day and week fetch current.json, and history views fetch single
+    shards listed in the manifest. Unchanged shards are not rewritten, and
+    shards that fell out of the history are removed.
+    """
+    days_dir = shard_dir / "days"
+    weeks_dir = shard_dir / "weeks"
+    written = 0
+    expected: set[Path] = set()
+
+    days: list[dict[str, Any]] = []
+    for entry in digest_payload.get("dailyHistory", []):
+        path = days_dir / f"{entry['date']}.json"
+        expected.add(path)
+        written += write_shard(path, entry)
+        metrics = entry.get("metrics") if isinstance(entry.get("metrics"), dict) else {}
+        days.append({
+            "date": entry["date"],
+            "label": entry.get("label", ""),
+            "totalItems": int(metrics.get("totalItems", 0) or 0),
+            "path": f"days/{entry['date']}.json",
+        })
+
+    weeks: list[dict[str, Any]] = []
+    for entry in digest_payload.get("weeklyHistory", []):
+        path = weeks_dir / f"{entry['weekKey']}.json"
+        expected.add(path)
+        written += write_shard(path, entry)
+        weeks.append({
+            "weekKey": entry["weekKey"],
+            "weekLabel": entry.get("weekLabel", ""),
+            "range": entry.get("range", {}),
+            "path": f"weeks/{entry['weekKey']}.json",
+        })
+
+    current = {
+        "generatedAt": digest_payload.get("generatedAt", ""),
+        "timezone": digest_payload.get("timezone", "Asia/Shanghai"),
+        "currentDay": digest_payload.get("currentDay"),
+        "currentWeek": digest_payload.get("currentWeek"),
+    }
+    written += write_shard(shard_dir / "current.json", current)
+
+    removed = 0
+    for directory in (days_dir, weeks_dir):
+        for path in directory.glob("*.json") if directory.exists() else []:
+            if path not in expected:
+                path.unlink()
+                removed += 1
+
+    manifest = {
+        "generatedAt": digest_payload.get("generatedAt", ""),
+        "timezone": digest_payload.get("timezone", "Asia/Shanghai"),
+        "current": "current.json",
+        "days": days,
+        "weeks": weeks,
+    }
+    write_shard(shard_dir / "manifest.json", manifest)
+    return {"written": written, "removed": removed, "days": len(days), "weeks": len(weeks)}
+
+
+def d1_news_row(item: Any) -> list[Any]:
+    """Column values for latest_news / news_snapshots, in D1_NEWS_COLUMNS order."""
+    return [
+        item.get("sourceUrl", "") or "",
+        item.get("sourceName", "") or "",
+        item.get("platform", "") or "",
+        item.get("region", "") or "",
+        item.get("industryStage", "中游") or "中游",
+        item.get("titleOriginal", "") or "",
+        item.get("titleZh", item.get("title", "")) or "",
+        item.get("summaryOriginal", "") or "",
+        item.get("summaryZh", item.get("summary", "")) or "",
+        int(bool(item.get("hasTranslation", False))),
+        item.get("action", "") or "",
+        item.get("publishedAt", "") or "",
+        item.get("date", "") or "",
+        json.dumps(item.get("contentTags", []), ensure_ascii=False),
+    ]
+
+
+def load_d1_sync_manifest(db_name: str, remote: bool) -> dict[str, dict[str, str]]:
+    """Last synced content hash (and the run that first stored it) per source_url."""
+    try:
+        payload = json.loads(D1_SYNC_MANIFEST_FILE.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    if not isinstance(payload, dict) or payload.get("database") != db_name or payload.get("remote") != remote:
+        return {}
+    rows = payload.get("items")
+    if not isinstance(rows, dict):
+        return {}
+    return {
+        str(url): row
+        for url, row in rows.items()
+        if isinstance(row, dict) and row.get("hash") and row.get("runId")
+    }
 
 
-def sql_int(value: Any) -> str:
-    return str(int(bool(value)))
+def save_d1_sync_manifest(db_name: str, remote: bool, rows: dict[str, dict[str, str]]) -> None:
+    if len(rows) > D1_SYNC_MANIFEST_LIMIT:
+        rows = dict(list(rows.items())[-D1_SYNC_MANIFEST_LIMIT:])
+    payload = {"database": db_name, "remote": remote, "items": rows}
+    D1_SYNC_MANIFEST_FILE.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
 
 
-def build_d1_sync_sql(
+def build_d1_sync_statements(
     payload: dict[str, Any],
     run_id: str,
     started_at: dt.datetime,
     finished_at: dt.datetime,
-) -> str:
-    items = payload.get("items", [])
-    started_iso = started_at.isoformat()
+    manifest: dict[str, dict[str, str]],
+) -> tuple[list[Statement], dict[str, dict[str, str]], int, int]:
+    """Diff-only sync into the content-addressed history tables.
+
+    Every item gets a thin news_run_items link (run, url, content hash) and
+    an INSERT OR IGNORE of its news_contents row: the link's foreign key
+    needs that row, and compaction may have deleted it since the manifest
+    was written. Only items whose content hash differs from the manifest are
+    upserted into latest_news. Statements are multi-row batches. Pass an
+    empty manifest to rewrite every item. Returns (parameterized statements,
+    updated manifest, changed count, unchanged count).
+    """
     finished_iso = finished_at.isoformat()
-
-    lines = [
-        "PRAGMA foreign_keys = ON;",
+    rows_by_url: dict[str, list[Any]] = {}
+    for item in payload.get("items", []):
+        row = d1_news_row(item)
+        rows_by_url.pop(row[0], None)
+        rows_by_url[row[0]] = row
+
+    updated = dict(manifest)
+    changed: list[tuple[str, list[Any]]] = []
+    contents: dict[str, list[Any]] = {}
+    links: list[list[Any]] = []
+    for url, row in rows_by_url.items():
+        row_hash = news_row_hash(row)
+        contents.setdefault(row_hash, [row_hash] + row + [finished_iso])
+        previous = manifest.get(url)
+        stored_run = previous["runId"] if previous and previous.get("hash") == row_hash else run_id
+        if stored_run == run_id:
+            changed.append((row_hash, row))
+        updated.pop(url, None)
+        updated[url] = {"hash": row_hash, "runId": stored_run}
+        links.append([run_id, url, row_hash, finished_iso])
+
+    unchanged = len(rows_by_url) - len(changed)
+    statements: list[Statement] = [
         (
-            "INSERT INTO fetch_runs (run_id, started_at, finished_at, item_count, status, message) VALUES "
-            f"({sql_text(run_id)}, {sql_text(started_iso)}, {sql_text(finished_iso)}, {int(payload.get('total', 0))}, "
-            f"{sql_text('success')}, {sql_text('auto-sync')});"
-        ),
+            "INSERT OR IGNORE INTO fetch_runs (run_id, started_at, finished_at, item_count, status, message) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                run_id,
+                started_at.isoformat(),
+                finished_iso,
+                int(payload.get("total", 0)),
+                "success",
+                f"diff-sync changed={len(changed)} unchanged={unchanged}",
+            ],
+        )
     ]
+    statements += insert_statements(
+        f"INSERT OR IGNORE INTO news_contents (content_hash, {D1_NEWS_COLUMNS}, first_seen_at) VALUES\n",
+        list(contents.values()),
+    )
+    statements += insert_statements(
+        f"INSERT INTO latest_news ({D1_NEWS_COLUMNS}, updated_at) VALUES\n",
+        [row + [finished_iso] for _, row in changed],
+        "\nON CONFLICT(source_url) DO UPDATE SET "
+        "source_name=excluded.source_name, platform=excluded.platform, region=excluded.region, "
+        "industry_stage=excluded.industry_stage, title_original=excluded.title_original, "
+        "title_zh=excluded.title_zh, summary_original=excluded.summary_original, "
+        "summary_zh=excluded.summary_zh, has_translation=excluded.has_translation, action=excluded.action, "
+        "published_at=excluded.published_at, date=excluded.date, "
+        "content_tags_json=excluded.content_tags_json, updated_at=excluded.updated_at",
+    )
+    statements += insert_statements(
+        "INSERT OR IGNORE INTO news_run_items (run_id, source_url, content_hash, captured_at) VALUES\n",
+        links,
+    )
+    return statements, updated, len(changed), unchanged
 
-    for item in items:
-        source_url = item.get("sourceUrl", "") or ""
-        source_name = item.get("sourceName", "") or ""
-        platform = item.get("platform", "") or ""
-        region = item.get("region", "") or ""
-        stage = item.get("industryStage", "中游") or "中游"
-        title_original = item.get("titleOriginal", "") or ""
-        title_zh = item.get("titleZh", item.get("title", "")) or ""
-        summary_original = item.get("summaryOriginal", "") or ""
-        summary_zh = item.get("summaryZh", item.get("summary", "")) or ""
-        has_translation = item.get("hasTranslation", False)
-        action = item.get("action", "") or ""
-        published_at = item.get("publishedAt", "") or ""
-        date_text = item.get("date", "") or ""
-        content_tags_json = json.dumps(item.get("contentTags", []), ensure_ascii=False)
-
-        lines.append(
-            "INSERT INTO news_snapshots (run_id, source_url, source_name, platform, region, industry_stage, "
-            "title_original, title_zh, summary_original, summary_zh, has_translation, action, published_at, date, "
-            "content_tags_json, captured_at) VALUES "
-            f"({sql_text(run_id)}, {sql_text(source_url)}, {sql_text(source_name)}, {sql_text(platform)}, "
-            f"{sql_text(region)}, {sql_text(stage)}, {sql_text(title_original)}, {sql_text(title_zh)}, "
-            f"{sql_text(summary_original)}, {sql_text(summary_zh)}, {sql_int(has_translation)}, {sql_text(action)}, "
-            f"{sql_text(published_at)}, {sql_text(date_text)}, {sql_text(content_tags_json)}, {sql_text(finished_iso)});"
-        )
 
-        lines.append(
-            "INSERT INTO latest_news (source_url, source_name, platform, region, industry_stage, title_original, title_zh, "
-            "summary_original, summary_zh, has_translation, action, published_at, date, content_tags_json, updated_at) VALUES "
-            f"({sql_text(source_url)}, {sql_text(source_name)}, {sql_text(platform)}, {sql_text(region)}, "
-            f"{sql_text(stage)}, {sql_text(title_original)}, {sql_text(title_zh)}, {sql_text(summary_original)}, "
-            f"{sql_text(summary_zh)}, {sql_int(has_translation)}, {sql_text(action)}, {sql_text(published_at)}, "
-            f"{sql_text(date_text)}, {sql_text(content_tags_json)}, {sql_text(finished_iso)}) "
-            "ON CONFLICT(source_url) DO UPDATE SET "
-            "source_name=excluded.source_name, "
-            "platform=excluded.platform, "
-            "region=excluded.region, "
-            "industry_stage=excluded.industry_stage, "
-            "title_original=excluded.title_original, "
-            "title_zh=excluded.title_zh, "
-            "summary_original=excluded.summary_original, "
-            "summary_zh=excluded.summary_zh, "
-            "has_translation=excluded.has_translation, "
-            "action=excluded.action, "
-            "published_at=excluded.published_at, "
-            "date=excluded.date, "
-            "content_tags_json=excluded.content_tags_json, "
-            "updated_at=excluded.updated_at;"
-        )
+def run_wrangler_sync(db_name: str, remote: bool, statements: list[Statement]) -> None:
+    """Fallback when no API token is configured (e.g. local `wrangler login`, D1_REMOTE=0)."""
+    temp_file: Path | None = None
+    try:
+        with tempfile.NamedTemporaryFile("w", delete=False, encoding="utf-8", suffix=".sql") as tmp:
+            tmp.write("PRAGMA foreign_keys = ON;\n" + render_script(statements))
+            temp_file = Path(tmp.name)
 
-    return "\n".join(lines) + "\n"
+        cmd = ["wrangler", "d1", "execute", db_name]
+        if remote:
+            cmd.append("--remote")
+        cmd.extend(["--file", str(temp_file)])
+        subprocess.run(cmd, check=True, capture_output=True, text=True)
+    finally:
+        if temp_file and temp_file.exists():
+            temp_file.unlink()
 
 
 def sync_to_d1(payload: dict[str, Any], started_at: dt.datetime, finished_at: dt.datetime) -> None:
@@ -1145,30 +1852,35 @@ def sync_to_d1(payload: dict[str, Any], started_at: dt.datetime, finished_at: dt
         return
 
     run_id = f"run_{finished_at.strftime('%Y%m%dT%H%M%SZ')}_{uuid.uuid4().hex[:8]}"
-    sql_script = build_d1_sync_sql(payload, run_id, started_at, finished_at)
-    temp_file: Path | None = None
+    remote = os.getenv(D1_REMOTE_ENV, "1").strip().lower() not in {"0", "false", "no", "off"}
+    diff_mode = os.getenv(D1_SYNC_MODE_ENV, "diff").strip().lower() != "full"
+    previous = load_d1_sync_manifest(db_name, remote) if diff_mode else {}
+    statements, manifest, changed, unchanged = build_d1_sync_statements(
+        payload, run_id, started_at, finished_at, previous
+    )
+    client = D1Client.from_env(db_name) if remote else None
+    sync_started = time.monotonic()
 
     try:
-        with tempfile.NamedTemporaryFile("w", delete=False, encoding="utf-8", suffix=".sql") as tmp:
-            tmp.write(sql_script)
-            temp_file = Path(tmp.name)
-
-        cmd = ["wrangler", "d1", "execute", db_name]
-        remote_raw = os.getenv(D1_REMOTE_ENV, "1").strip().lower()
-        if remote_raw not in {"0", "false", "no", "off"}:
-            cmd.append("--remote")
-        cmd.extend(["--file", str(temp_file)])
-
-        subprocess.run(cmd, check=True, capture_output=True, text=True)
-        print(f"[OK] D1 synced run={run_id} items={payload.get('total', 0)} db={db_name}")
+        if client is not None:
+            with client:
+                client.batch(statements)
+            transport = f"http requests={client.requests}"
+        else:
+            run_wrangler_sync(db_name, remote, statements)
+            transport = "wrangler"
+        save_d1_sync_manifest(db_name, remote, manifest)
+        print(
+            f"[OK] D1 synced run={run_id} items={payload.get('total', 0)} changed={changed} unchanged={unchanged} "
+            f"statements={len(statements)} via {transport} in {time.monotonic() - sync_started:.2f}s db={db_name}"
+        )
+    except D1Error as exc:
+        print(f"[WARN] D1 sync failed: {exc}")
     except FileNotFoundError:
         print("[WARN] wrangler not found, skip D1 sync")
     except subprocess.CalledProcessError as exc:
         details = (exc.stderr or "").strip() or (exc.stdout or "").strip() or str(exc)
         print(f"[WARN] D1 sync failed: {details}")
-    finally:
-        if temp_file and temp_file.exists():
-            temp_file.unlink()
 
 
 def main() -> None:
@@ -1181,14 +1893,39 @@ def main() -> None:
     apply_ai_scores(payload.get("items", []), finished_at, digest_rules)
     payload["total"] = len(payload.get("items", []))
 
-    digest_payload = build_news_digest(payload, finished_at, digest_rules)
+    digest_payload: dict[str, Any] | None = None
+    history_summary = ""
+    history = open_news_history(create=True)
+    if history is not None:
+        try:
+            stored = history.upsert(payload.get("items", []), finished_at.timestamp())
+            pruned = history.prune()
+            history_summary = f"{stored} upserted, {pruned} pruned, {history.count()} stored"
+            digest_payload = build_news_digest(
+                with_history_day_items(payload, history, finished_at, digest_rules), finished_at, digest_rules
+            )
+        except sqlite3.Error as exc:
+            # A corrupt or locked store (or a full disk) must not cost this run its outputs.
+            print(f"[WARN] news history failed ({exc}), building the digest from news.json")
+            history_summary = ""
+        finally:
+            history.close()
+    if digest_payload is None:
+        digest_payload = build_news_digest(payload, finished_at, digest_rules)
 
-    OUTPUT_FILE.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    OUTPUT_FILE.write_text(json.dumps(payload, ensure_ascii=False, indent=2, default=json_default), encoding="utf-8")
     DIGEST_OUTPUT_FILE.write_text(json.dumps(digest_payload, ensure_ascii=False, indent=2), encoding="utf-8")
-    save_translation_cache(translation_cache)
+    shard_stats = write_digest_shards(digest_payload)
+    translation_cache.close()
 
     print(f"[OK] wrote {OUTPUT_FILE} with {payload['total']} items")
     print(f"[OK] wrote {DIGEST_OUTPUT_FILE} with {len(digest_payload.get('dailyHistory', []))} daily records")
+    if history_summary:
+        print(f"[OK] news history {NEWS_HISTORY_DB.name}: {history_summary}")
+    print(
+        f"[OK] digest shards in {DIGEST_SHARD_DIR}: {shard_stats['written']} written, "
+        f"{shard_stats['removed']} removed ({shard_stats['days']} days, {shard_stats['weeks']} weeks)"
+    )
 
     sync_to_d1(payload, started_at, finished_at)
 
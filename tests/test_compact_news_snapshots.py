@@ -0,0 +1,150 @@
+import datetime as dt
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+import compact_news_snapshots as compaction
+from d1_client import NEWS_COLUMNS, D1Client
+from d1_local_server import start_local_server
+
+SCHEMA = Path(__file__).resolve().parent.parent / "d1" / "schema.sql"
+NOW = dt.datetime(2026, 6, 1, 12, tzinfo=dt.timezone.utc)
+DAYS = 120
+ITEMS_PER_RUN = 5
+
+
+def run_times():
+    """Two runs a day (02:00 and 14:00 UTC) for DAYS days before NOW, newest first."""
+    times = []
+    for day in range(DAYS):
+        date = (NOW - dt.timedelta(days=day)).date()
+        for hour in (14, 2):
+            finished = dt.datetime.combine(date, dt.time(hour), tzinfo=dt.timezone.utc)
+            if finished <= NOW:
+                times.append(finished)
+    return times
+
+
+def snapshot_row(run_index, item):
+    # Item content changes every 4 runs, so most runs repeat the previous content.
+    version = run_index // 4
+    return {
+        "source_url": f"https://example.com/{item}",
+        "source_name": "Example",
+        "platform": "Example",
+        "region": "海外",
+        "industry_stage": "中游",
+        "title_original": f"Title {item} v{version}",
+        "title_zh": f"标题 {item} v{version}",
+        "summary_original": "summary",
+        "summary_zh": "摘要",
+        "has_translation": 1,
+        "action": "",
+        "published_at": "2026-01-01T00:00:00+00:00",
+        "date": "2026-01-01",
+        "content_tags_json": "[]",
+    }
+
+
+@pytest.fixture
+def legacy_db(tmp_path):
+    path = tmp_path / "d1.sqlite3"
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA.read_text(encoding="utf-8"))
+    expected = {}
+    for index, finished in enumerate(run_times()):
+        run_id = f"run_{finished:%Y%m%dT%H%M}"
+        stamp = finished.isoformat()
+        conn.execute(
+            "INSERT INTO fetch_runs (run_id, started_at, finished_at, item_count, status, message) VALUES (?, ?, ?, ?, ?, ?)",
+            [run_id, stamp, stamp, ITEMS_PER_RUN, "success", ""],
+        )
+        rows = [snapshot_row(index, item) for item in range(ITEMS_PER_RUN)]
+        for row in rows:
+            conn.execute(
+                f"INSERT INTO news_snapshots (run_id, {', '.join(NEWS_COLUMNS)}, captured_at) "
+                f"VALUES (?, {', '.join(['?'] * len(NEWS_COLUMNS))}, ?)",
+                [run_id] + [row[column] for column in NEWS_COLUMNS] + [stamp],
+            )
+        expected[run_id] = (finished, sorted(tuple(row[column] for column in NEWS_COLUMNS) for row in rows))
+    conn.commit()
+    conn.close()
+    return path, expected
+
+
+@pytest.fixture
+def client_for():
+    servers = []
+
+    def connect(path):
+        server, base_url = start_local_server(str(path), [compaction.CONTENT_STORE_MIGRATION])
+        servers.append(server)
+        return D1Client("local", "local", database_id="local", base_url=base_url)
+
+    yield connect
+    for server in servers:
+        server.shutdown()
+
+
+def test_compaction_migrates_downsamples_and_collects(legacy_db, client_for):
+    path, expected = legacy_db
+    client = client_for(path)
+    with client:
+        stats = compaction.compact(client, now=NOW)
+        kept = {row["run_id"] for row in client.select("SELECT run_id FROM fetch_runs")}
+        history = client.select(f"SELECT run_id, {', '.join(NEWS_COLUMNS)} FROM news_history")
+        dangling = client.select(
+            "SELECT COUNT(*) AS n FROM news_run_items r "
+            "WHERE NOT EXISTS (SELECT 1 FROM news_contents c WHERE c.content_hash = r.content_hash)"
+        )[0]["n"]
+        unreferenced = client.select(
+            "SELECT COUNT(*) AS n FROM news_contents c "
+            "WHERE NOT EXISTS (SELECT 1 FROM news_run_items r WHERE r.content_hash = c.content_hash)"
+        )[0]["n"]
+        snapshots_left = compaction.count_rows(client, "news_snapshots")
+        second = compaction.compact(client, now=NOW)
+
+    assert stats["snapshotsMigrated"] == len(expected) * ITEMS_PER_RUN
+    assert snapshots_left == 0
+    assert dangling == 0
+    assert unreferenced == 0
+    assert stats["contentsRemoved"] > 0
+    assert second == {"snapshotsMigrated": 0, "runsDropped": 0, "contentsRemoved": 0}
+
+    by_tier = {"full": [], "day": {}, "week": {}}
+    for run_id, (finished, _) in expected.items():
+        age_days = (NOW - finished).total_seconds() / 86400
+        if age_days <= compaction.DEFAULT_KEEP_DAYS:
+            by_tier["full"].append(run_id)
+        elif age_days <= compaction.DEFAULT_DAILY_DAYS:
+            by_tier["day"].setdefault(finished.date(), []).append((finished, run_id))
+        else:
+            by_tier["week"].setdefault(finished.isocalendar()[:2], []).append((finished, run_id))
+
+    assert set(by_tier["full"]) <= kept
+    for tier in ("day", "week"):
+        for runs in by_tier[tier].values():
+            latest = max(runs)[1]
+            assert latest in kept
+            assert not ({run_id for _, run_id in runs} - {latest}) & kept
+    assert stats["runsDropped"] == len(expected) - len(kept)
+
+    rebuilt = {}
+    for row in history:
+        rebuilt.setdefault(row["run_id"], []).append(tuple(row[column] for column in NEWS_COLUMNS))
+    assert set(rebuilt) == kept
+    for run_id in kept:
+        assert sorted(rebuilt[run_id]) == expected[run_id][1]
+
+
+def test_dry_run_changes_nothing(legacy_db, client_for):
+    path, expected = legacy_db
+    client = client_for(path)
+    with client:
+        stats = compaction.compact(client, dry_run=True, now=NOW)
+        assert compaction.count_rows(client, "news_snapshots") == len(expected) * ITEMS_PER_RUN
+        assert compaction.count_rows(client, "fetch_runs") == len(expected)
+        assert compaction.count_rows(client, "news_run_items") == 0
+    assert stats["snapshotsMigrated"] == len(expected) * ITEMS_PER_RUN
+    assert stats["runsDropped"] > 0
@@ -0,0 +1,201 @@
+import datetime as dt
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+import news_http
+import update_news
+from d1_client import D1_MAX_BOUND_PARAMS, D1_MAX_STATEMENT_BYTES, D1Client, D1Error, insert_statements
+from d1_local_server import start_local_server
+
+SCHEMA = Path(__file__).resolve().parent.parent / "d1" / "schema.sql"
+
+
+@pytest.fixture
+def local_d1(monkeypatch):
+    monkeypatch.setattr(news_http.time, "sleep", lambda seconds: None)
+    servers = []
+
+    def start(fail_first=0):
+        server, base_url = start_local_server(":memory:", [SCHEMA], fail_first=fail_first)
+        servers.append(server)
+        return server, D1Client("local", "local", database_id="local", base_url=base_url, retries=2)
+
+    yield start
+    for server in servers:
+        server.shutdown()
+
+
+def statement_bytes(sql, params):
+    return len(sql.encode("utf-8")) + sum(len(str(value).encode("utf-8")) for value in params)
+
+
+def test_insert_statements_respect_param_limit():
+    rows = [[f"url-{index}", index, "x"] for index in range(250)]
+    statements = insert_statements("INSERT INTO t (a, b, c) VALUES\n", rows)
+
+    assert all(len(params) <= D1_MAX_BOUND_PARAMS for _, params in statements)
+    assert [len(params) // 3 for _, params in statements] == [33] * 7 + [19]
+    flattened = [params[i : i + 3] for _, params in statements for i in range(0, len(params), 3)]
+    assert flattened == rows
+    for sql, params in statements:
+        assert sql.count("?") == len(params)
+
+
+def test_insert_statements_respect_byte_limit():
+    rows = [[f"url-{index}", "x" * 20_000] for index in range(12)]
+    statements = insert_statements("INSERT INTO t (a, b) VALUES\n", rows, "\nON CONFLICT(a) DO NOTHING")
+
+    assert len(statements) > 1
+    assert all(statement_bytes(sql, params) <= D1_MAX_STATEMENT_BYTES for sql, params in statements)
+    assert all(sql.endswith("ON CONFLICT(a) DO NOTHING") for sql, _ in statements)
+    assert sum(len(params) for _, params in statements) == 24
+
+
+def test_insert_statements_oversized_row_gets_its_own_statement():
+    rows = [["a", "x" * 100_000], ["b", "y"]]
+    statements = insert_statements("INSERT INTO t (a, b) VALUES\n", rows)
+    assert [params[0] for _, params in statements] == ["a", "b"]
+
+
+def test_call_runs_batches_against_local_server(local_d1):
+    _, client = local_d1()
+    rows = [[f"run-{index}", "2026-01-01T00:00:00+00:00", "2026-01-01T00:01:00+00:00", 0, "success", ""] for index in range(40)]
+    statements = insert_statements(
+        "INSERT INTO fetch_runs (run_id, started_at, finished_at, item_count, status, message) VALUES\n", rows
+    )
+    with client:
+        client.batch(statements)
+        assert client.select("SELECT COUNT(*) AS n FROM fetch_runs")[0]["n"] == 40
+        assert client.select("SELECT run_id FROM fetch_runs WHERE run_id = ?", ["run-7"]) == [{"run_id": "run-7"}]
+
+
+def test_call_retries_5xx(local_d1):
+    _, client = local_d1(fail_first=2)
+    with client:
+        assert client.select("SELECT 1 AS one") == [{"one": 1}]
+    assert client.requests == 3
+
+
+def test_call_gives_up_after_retries(local_d1):
+    _, client = local_d1(fail_first=5)
+    with client, pytest.raises(D1Error, match="503"):
+        client.select("SELECT 1")
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.hits += 1
+        threading.Event().wait(0.5)
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+def test_read_timeout_is_not_retried():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    httpd.hits = 0
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    client = D1Client("local", "local", database_id="local", base_url=f"http://127.0.0.1:{httpd.server_address[1]}",
+                      timeout=0.1, retries=2)
+    try:
+        with pytest.raises(D1Error, match="timed out"):
+            client.query("INSERT INTO fetch_runs (run_id) VALUES (?)", ["run-1"])
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+    assert httpd.hits == 1
+    assert client.requests == 1
+
+
+def test_failed_batch_rolls_back(local_d1):
+    _, client = local_d1()
+    with client:
+        with pytest.raises(D1Error):
+            client.batch(
+                [
+                    ("INSERT INTO fetch_runs (run_id, started_at, finished_at, item_count, status, message) "
+                     "VALUES (?, ?, ?, ?, ?, ?)", ["run-x", "a", "b", 0, "success", ""]),
+                    ("INSERT INTO no_such_table VALUES (?)", [1]),
+                ]
+            )
+        assert client.select("SELECT COUNT(*) AS n FROM fetch_runs")[0]["n"] == 0
+
+
+def test_sync_batch_can_be_replayed(local_d1):
+    """A retry after a lost response re-sends a batch D1 already applied."""
+    _, client = local_d1()
+    finished = dt.datetime(2026, 3, 1, 8, tzinfo=dt.timezone.utc)
+    items = [
+        {
+            "sourceUrl": f"https://example.com/{index}",
+            "sourceName": "Example",
+            "platform": "Example",
+            "region": "海外",
+            "industryStage": "中游",
+            "titleOriginal": f"Title {index}",
+            "titleZh": f"标题 {index}",
+            "summaryOriginal": "summary",
+            "summaryZh": "摘要",
+            "hasTranslation": True,
+            "action": "",
+            "publishedAt": finished.isoformat(),
+            "date": "2026-03-01",
+            "contentTags": ["Agent"],
+        }
+        for index in range(30)
+    ]
+    payload = {"total": len(items), "items": items}
+    statements, manifest, changed, unchanged = update_news.build_d1_sync_statements(
+        payload, "run-1", finished, finished, {}
+    )
+    assert (changed, unchanged) == (30, 0)
+    with client:
+        client.batch(statements)
+        client.batch(statements)
+        counts = {
+            table: client.select(f"SELECT COUNT(*) AS n FROM {table}")[0]["n"]
+            for table in ("fetch_runs", "news_contents", "news_run_items", "latest_news")
+        }
+    assert counts == {"fetch_runs": 1, "news_contents": 30, "news_run_items": 30, "latest_news": 30}
+    assert json.loads(json.dumps(manifest))["https://example.com/0"]["runId"] == "run-1"
+
+
+def test_sync_relinks_content_removed_by_compaction(local_d1):
+    server, client = local_d1()
+    finished = dt.datetime(2026, 3, 1, 8, tzinfo=dt.timezone.utc)
+    item = {
+        "sourceUrl": "https://example.com/a",
+        "sourceName": "Example",
+        "platform": "Example",
+        "region": "海外",
+        "industryStage": "中游",
+        "titleOriginal": "A",
+        "titleZh": "A",
+        "summaryOriginal": "s",
+        "summaryZh": "s",
+        "hasTranslation": False,
+        "action": "",
+        "publishedAt": finished.isoformat(),
+        "date": "2026-03-01",
+        "contentTags": [],
+    }
+    payload = {"total": 1, "items": [item]}
+    with client:
+        first, manifest, _, _ = update_news.build_d1_sync_statements(payload, "run-1", finished, finished, {})
+        client.batch(first)
+        client.batch([("DELETE FROM news_run_items", []), ("DELETE FROM news_contents", [])])
+
+        later = finished + dt.timedelta(hours=12)
+        second, _, changed, unchanged = update_news.build_d1_sync_statements(payload, "run-2", later, later, manifest)
+        assert (changed, unchanged) == (0, 1)
+        client.batch(second)
+        assert client.select("SELECT run_id FROM news_run_items") == [{"run_id": "run-2"}]
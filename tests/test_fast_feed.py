@@ -0,0 +1,162 @@
+import html
+import json
+from pathlib import Path
+
+import feedparser
+import pytest
+
+import build_yt_watchlist
+import fast_feed
+import update_news
+from fast_feed import parse_entries
+from standin_services import StandinConfig, StandinServices
+
+FIXTURES = Path(__file__).resolve().parent.parent / "benchmarks" / "fixtures"
+SOURCES = json.loads((FIXTURES / "sources.json").read_text(encoding="utf-8"))
+RAW_FIELDS = ("id", "link", "author", "published", "published_parsed", "updated", "updated_parsed")
+
+ATOM_FEED = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Example lab</title>
+  <entry>
+    <id>tag:example.com,2026:post-2</id>
+    <title>Open weights for the 70B model</title>
+    <link rel="replies" href="https://example.com/post-2#comments"/>
+    <link rel="alternate" href="https://example.com/post-2"/>
+    <author><name>Research team</name></author>
+    <published>2026-10-17T08:00:00Z</published>
+    <updated>2026-10-17T09:30:00+02:00</updated>
+    <summary type="html">&lt;p&gt;Weights &amp;amp; eval code&lt;/p&gt;&lt;script&gt;track()&lt;/script&gt;</summary>
+  </entry>
+  <entry>
+    <id>tag:example.com,2026:post-1</id>
+    <title type="xhtml"><div xmlns="http://www.w3.org/1999/xhtml">Agents <b>benchmark</b></div></title>
+    <link href="https://example.com/post-1"/>
+    <updated>2026-10-16T08:00:00Z</updated>
+    <content type="html">&lt;p&gt;Long-horizon tasks&lt;/p&gt;</content>
+  </entry>
+</feed>
+"""
+
+RSS_FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/"
+     xmlns:content="http://purl.org/rss/1.0/modules/content/">
+<channel><title>Example news</title>
+  <item>
+    <title>GPU prices fall &amp; supply recovers</title>
+    <guid isPermaLink="true">https://example.com/gpu</guid>
+    <dc:creator>Alex</dc:creator>
+    <pubDate>Sat, 17 Oct 2026 10:00:00 +0800</pubDate>
+    <content:encoded><![CDATA[<p>Spot prices for H100 rentals</p><style>p{}</style>]]></content:encoded>
+  </item>
+  <item>
+    <title>Inference chip startup raises Series B</title>
+    <link>https://example.com/chip</link>
+    <guid isPermaLink="false">chip-123</guid>
+    <description>Funding round led by a sovereign fund.</description>
+    <pubDate>Fri, 16 Oct 2026 10:00:00 GMT</pubDate>
+    <dc:date>2026-10-16T12:00:00Z</dc:date>
+  </item>
+</channel></rss>
+"""
+
+
+def feedparser_entries(content):
+    return feedparser.parse(content).entries
+
+
+def assert_same_raw_fields(fast, slow):
+    assert len(fast) == len(slow)
+    for ours, theirs in zip(fast, slow):
+        for field in RAW_FIELDS:
+            expected = theirs.get(field, None if field.endswith("_parsed") else "")
+            assert ours.get(field) == expected, field
+        # feedparser keeps (re-escaped) markup in text fields; the builders strip it either way.
+        for field in ("title", "summary"):
+            assert update_news.strip_html(ours.get(field)) == update_news.strip_html(theirs.get(field, "")), field
+
+
+@pytest.mark.parametrize("source", SOURCES, ids=[source["name"] for source in SOURCES])
+def test_recorded_feeds_normalize_like_feedparser(source):
+    content = (FIXTURES / source["fixture"]).read_bytes()
+    fast = list(fast_feed.iter_entries(content))
+    slow = feedparser_entries(content)
+    assert_same_raw_fields(fast, slow)
+
+    fast_items = [update_news.normalize_item(source, entry) for entry in fast]
+    slow_items = [update_news.normalize_item(source, entry) for entry in slow]
+    assert [item and item.to_dict() for item in fast_items] == [item and item.to_dict() for item in slow_items]
+
+
+@pytest.mark.parametrize("content", [ATOM_FEED, RSS_FEED], ids=["atom", "rss"])
+def test_inline_feeds_match_feedparser(content):
+    fast = list(fast_feed.iter_entries(content))
+    slow = feedparser_entries(content)
+    assert_same_raw_fields(fast, slow)
+    for ours in fast:
+        assert "track()" not in ours.summary and "p{}" not in ours.summary
+
+
+def test_youtube_feed_matches_feedparser():
+    content = StandinServices(StandinConfig(items=8, seed=3)).youtube_feed("UCabcdefghijklmnop")
+    fast = list(fast_feed.iter_entries(content))
+    slow = feedparser_entries(content)
+    assert_same_raw_fields(fast, slow)
+    for ours, theirs in zip(fast, slow):
+        assert ours.yt_videoid == theirs.yt_videoid
+        assert ours.summary == theirs.summary
+        assert [thumb["url"] for thumb in ours.media_thumbnail] == [thumb["url"] for thumb in theirs.media_thumbnail]
+        args = ("UCabcdefghijklmnop", "Channel", ["AI"])
+        assert (
+            build_yt_watchlist.normalize_entry(ours, *args).to_dict()
+            == build_yt_watchlist.normalize_entry(theirs, *args).to_dict()
+        )
+
+
+def test_limit_and_fallback(monkeypatch):
+    fast = parse_entries(RSS_FEED, limit=1)
+    assert [entry.title for entry in fast.entries] == ["GPU prices fall & supply recovers"]
+    assert isinstance(fast.entries[0], fast_feed.FeedEntry)
+
+    broken = parse_entries(RSS_FEED.replace(b"</channel>", b""))
+    assert broken.warning
+    assert [entry.link for entry in broken.entries] == ["https://example.com/gpu", "https://example.com/chip"]
+
+    monkeypatch.setenv(fast_feed.FAST_FEED_ENV, "0")
+    slow = parse_entries(RSS_FEED, limit=1)
+    assert not isinstance(slow.entries[0], fast_feed.FeedEntry)
+
+
+def rss(dates):
+    items = "".join(
+        f"<item><title>Story {index}</title><link>https://example.com/{index}</link>"
+        f"<pubDate>{html.escape(date)}</pubDate></item>"
+        for index, date in enumerate(dates)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>{items}</channel></rss>'.encode()
+
+
+@pytest.mark.parametrize("fast_path", ["1", "0"])
+def test_known_run_stops_newest_first_feeds(monkeypatch, fast_path):
+    monkeypatch.setenv(fast_feed.FAST_FEED_ENV, fast_path)
+    newest_first = rss([f"Sat, {17 - index:02d} Oct 2026 10:00:00 GMT" for index in range(10)])
+    known = {f"https://example.com/{index}" for index in range(3, 10)}
+
+    def is_known(entry):
+        return entry.get("link") in known
+
+    parsed = parse_entries(newest_first, limit=30, known=is_known, known_run=3)
+    assert parsed.stopped_at_known
+    assert [entry.get("link") for entry in parsed.entries] == [f"https://example.com/{index}" for index in range(6)]
+
+    # A new entry inside the run restarts the count.
+    known.discard("https://example.com/5")
+    parsed = parse_entries(newest_first, limit=30, known=is_known, known_run=3)
+    assert parsed.stopped_at_known
+    assert len(parsed.entries) == 9
+
+    # Out-of-order feeds are always read to the limit.
+    shuffled = rss([f"Sat, {day:02d} Oct 2026 10:00:00 GMT" for day in (17, 18, 16, 15, 14, 13, 12, 11, 10, 9)])
+    parsed = parse_entries(shuffled, limit=30, known=lambda entry: True, known_run=3)
+    assert not parsed.stopped_at_known
+    assert len(parsed.entries) == 10
@@ -0,0 +1,92 @@
+import random
+import re
+
+import pytest
+
+import build_yt_watchlist
+import update_news
+from keyword_matcher import KeywordMatcher
+
+ALPHABET = "aiglmrs _-.4é人"
+
+
+def random_texts(seed, count=400):
+    rng = random.Random(seed)
+    return ["".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 24))) for _ in range(count)]
+
+
+def naive_scan(rules, text):
+    lower = text.lower()
+    hits = set()
+    for keyword, label, boundary in rules:
+        if boundary:
+            if re.search(rf"\b{re.escape(keyword)}\b", lower):
+                hits.add(label)
+        elif keyword in lower:
+            hits.add(label)
+    return hits
+
+
+def test_overlapping_keywords_match_like_substring_and_regex():
+    rng = random.Random(7)
+    rules = []
+    for index in range(60):
+        keyword = "".join(rng.choice(ALPHABET) for _ in range(rng.randint(1, 4)))
+        rules.append((keyword.lower(), index % 17, rng.random() < 0.5))
+    matcher = KeywordMatcher()
+    for keyword, label, boundary in rules:
+        matcher.add(keyword, label, word_boundary=boundary)
+
+    for text in random_texts(11) + ["Said AI", "RAG-based rag_x", "LLM.", "人工智能"]:
+        assert matcher.scan(text) == naive_scan(rules, text), text
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [("AI tools", {"ai"}), ("said", set()), ("ai_x", set()), ("(AI)", {"ai"}), ("ai-rag", {"ai", "rag"})],
+)
+def test_word_boundary(text, expected):
+    matcher = KeywordMatcher([("ai", "ai"), ("rag", "rag")], word_boundary=True)
+    assert matcher.scan(text) == expected
+
+
+def test_news_rules_match_the_substring_tables():
+    texts = random_texts(3, 100) + [
+        "OpenAI launches a new agent API for enterprise customers",
+        "英伟达发布新一代 GPU，算力芯片供应链受关注",
+        "Startup raises Series B to build robotics foundation models",
+        "开源大模型发布，支持多模态推理",
+    ]
+    for text in texts:
+        lower = text.lower()
+        hits = update_news.rule_hits(text)
+        assert update_news.contains_keyword(text, hits) == any(kw in lower for kw in update_news.KEYWORDS)
+        expected_action = next(
+            (action for keywords, action in update_news.ACTION_RULES if any(kw in lower for kw in keywords)),
+            update_news.DEFAULT_ACTION_FALLBACK,
+        )
+        assert update_news.infer_action(text, hits) == expected_action
+        expected_tags = [tag for tag, keywords in update_news.TAG_RULES if any(kw in lower for kw in keywords)][:3]
+        assert update_news.infer_content_tags(text, hits) == (expected_tags or ["AI动态"])
+        for stage, keywords in update_news.STAGE_RULES.items():
+            for kw in keywords:
+                assert (("stage", stage, kw) in hits) == (kw in lower)
+
+
+def test_youtube_keywords_match_the_regex_filter():
+    keywords = build_yt_watchlist.load_ai_keywords(None)
+    matcher = build_yt_watchlist.compile_ai_keywords(keywords)
+
+    def regex_filter(text):
+        lower = text.lower()
+        for kw in keywords:
+            if build_yt_watchlist.is_ascii_word(kw) and len(kw) <= 3:
+                if re.search(rf"\b{re.escape(kw)}\b", lower):
+                    return True
+            elif kw in lower:
+                return True
+        return False
+
+    texts = random_texts(5, 200) + ["What he said about AI", "RAG in 10 minutes", "Paint a garage", "Agentic workflows"]
+    for text in texts:
+        assert build_yt_watchlist.contains_ai_keyword(text, matcher) == regex_filter(text), text
@@ -0,0 +1,63 @@
+import pytest
+
+import near_dup
+from near_dup import find_clusters, strip_templates
+
+TRENDING = [
+    "langchain-ai/langchain · GitHub Trending",
+    "langchain-ai/langgraph · GitHub Trending",
+    "microsoft/autogen · GitHub Trending",
+]
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(near_dup, "np", None)
+    elif near_dup.np is None:
+        pytest.skip("numpy not installed")
+
+
+def test_syndicated_copies_merge(backend):
+    titles = [
+        "OpenAI releases GPT-5 with improved reasoning and a 1M token context",
+        "OpenAI releases GPT-5 with improved reasoning and 1M-token context window",
+        "Google DeepMind unveils Gemini robotics model for household tasks",
+    ]
+    summaries = [
+        "The new model is available in the API today for all paid tiers.",
+        "The model is available today in the API for paid tiers.",
+        "A vision-language-action model that folds laundry.",
+    ]
+    assert find_clusters(titles, summaries, groups=["a", "b", "c"]) == [[0, 1]]
+
+
+def test_same_group_is_not_folded(backend):
+    titles = ["Weekly AI roundup: agents, evals and GPUs"] * 2
+    assert find_clusters(titles, ["", ""], groups=["feed", "feed"]) == []
+    assert find_clusters(titles, ["", ""], groups=["feed", "other"]) == [[0, 1]]
+
+
+def test_shared_template_is_stripped():
+    assert strip_templates(TRENDING) == ["langchain-ai/langchain", "langchain-ai/langgraph", "microsoft/autogen"]
+    # Below TEMPLATE_MIN_TITLES the suffix is part of the title.
+    assert strip_templates(TRENDING[:2]) == TRENDING[:2]
+    assert strip_templates(["Release notes · v1"]) == ["Release notes · v1"]
+
+
+@pytest.mark.parametrize(
+    "summaries",
+    [
+        ["", "", ""],
+        ["Build LLM applications", "Build resilient agents as graphs", "Multi-agent framework"],
+    ],
+)
+def test_templated_repo_titles_do_not_merge(backend, summaries):
+    assert find_clusters(TRENDING, summaries, groups=["a", "b", "c"]) == []
+
+
+def test_short_titles_need_matching_summaries(backend):
+    titles = TRENDING[:1] * 2 + TRENDING[2:]
+    summary = "Build context-aware reasoning applications with composable LLM tooling."
+    assert find_clusters(titles, [summary, summary, ""], groups=["a", "b", "c"]) == [[0, 1]]
+    assert find_clusters(titles, [summary, "Unrelated release notes.", ""], groups=["a", "b", "c"]) == []
@@ -0,0 +1,122 @@
+import datetime as dt
+import json
+import random
+import sqlite3
+
+import pytest
+
+import update_news
+from news_history import NewsHistory
+from update_news import DIGEST_INCREMENTAL_ENV, DIGEST_VERIFY_ENV, SHANGHAI_TZ, build_news_digest, deep_copy
+
+PLATFORMS = ["Hacker News", "Reddit", "量子位", "OpenAI"]
+TAGS = ["模型发布", "融资", "算力", "开源"]
+
+
+def run_payload(rng, generated_at, count=12):
+    items = []
+    for index in range(count):
+        published = generated_at - dt.timedelta(hours=rng.uniform(0, 30))
+        items.append(
+            {
+                "titleZh": f"资讯 {published:%m%d%H%M} #{index}",
+                "sourceUrl": f"https://example.com/{published:%Y%m%d%H%M%S}/{index}",
+                "sourceName": rng.choice(PLATFORMS),
+                "platform": rng.choice(PLATFORMS),
+                "publishedAt": published.isoformat(),
+                "aiScore": rng.randint(40, 99),
+                "contentTags": rng.sample(TAGS, 2),
+                "industryStage": "中游",
+                "summaryZh": "摘要",
+                "action": "跟踪",
+            }
+        )
+    return {"items": items}
+
+
+def build(monkeypatch, payload, generated_at, rules, existing, incremental):
+    monkeypatch.setenv(DIGEST_INCREMENTAL_ENV, "1" if incremental else "0")
+    return build_news_digest(payload, generated_at, rules, deep_copy(existing))
+
+
+@pytest.mark.parametrize("history_days", [20, 90])
+def test_incremental_digest_matches_full_rebuild(monkeypatch, history_days):
+    monkeypatch.delenv(DIGEST_VERIFY_ENV, raising=False)
+    rng = random.Random(history_days)
+    rules = {**deep_copy(update_news.DEFAULT_DIGEST_RULES), "historyDays": history_days, "topN": 3}
+    existing: dict = {}
+    start = dt.datetime(2026, 8, 25, 8, 0, tzinfo=SHANGHAI_TZ)
+    # Twice a day across month and week boundaries, long enough for the historyDays cut to split weeks.
+    for run in range(90):
+        generated_at = start + dt.timedelta(hours=12 * run)
+        payload = run_payload(rng, generated_at)
+        full = build(monkeypatch, payload, generated_at, rules, existing, incremental=False)
+        incremental = build(monkeypatch, payload, generated_at, rules, existing, incremental=True)
+        assert incremental == full, generated_at
+        existing = deep_copy(incremental)
+
+    assert len(existing["dailyHistory"]) == min(history_days, 45)
+    assert existing["weeklyHistory"]
+
+
+def test_incremental_digest_rebuilds_unusable_weekly_history(monkeypatch):
+    monkeypatch.delenv(DIGEST_VERIFY_ENV, raising=False)
+    rng = random.Random(1)
+    rules = {**deep_copy(update_news.DEFAULT_DIGEST_RULES), "topN": 3}
+    generated_at = dt.datetime(2026, 10, 17, 20, 0, tzinfo=SHANGHAI_TZ)
+    yesterday = generated_at - dt.timedelta(days=1)
+    previous = build(monkeypatch, run_payload(rng, yesterday), yesterday, rules, {}, incremental=True)
+    payload = run_payload(rng, generated_at)
+    full = build(monkeypatch, payload, generated_at, rules, previous, incremental=False)
+
+    for weekly in (None, "broken", [{"weekKey": "2026-10-W3", "metrics": {}}]):
+        damaged = {**previous, "weeklyHistory": weekly}
+        assert build(monkeypatch, payload, generated_at, rules, damaged, incremental=True) == full
+
+
+def test_verify_keeps_the_matching_incremental_digest(monkeypatch, capsys):
+    rng = random.Random(2)
+    rules = {**deep_copy(update_news.DEFAULT_DIGEST_RULES), "topN": 3}
+    generated_at = dt.datetime(2026, 10, 17, 8, 0, tzinfo=SHANGHAI_TZ)
+    previous = build(monkeypatch, run_payload(rng, generated_at), generated_at, rules, {}, incremental=True)
+    later = generated_at + dt.timedelta(hours=12)
+    payload = run_payload(rng, later)
+
+    monkeypatch.setenv(DIGEST_VERIFY_ENV, "1")
+    verified = build(monkeypatch, payload, later, rules, previous, incremental=True)
+    assert "matches full rebuild" in capsys.readouterr().out
+    monkeypatch.delenv(DIGEST_VERIFY_ENV)
+    assert verified == build(monkeypatch, payload, later, rules, previous, incremental=False)
+
+
+class ClosedCache:
+    def close(self):
+        pass
+
+
+def test_main_falls_back_to_news_json_when_the_history_store_fails(monkeypatch, tmp_path, capsys):
+    monkeypatch.delenv(DIGEST_VERIFY_ENV, raising=False)
+    generated_at = dt.datetime.now(tz=SHANGHAI_TZ)
+    payload = run_payload(random.Random(4), generated_at)
+    history = NewsHistory(tmp_path / "history.sqlite3")
+
+    def locked(*args, **kwargs):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(history, "upsert", locked)
+    monkeypatch.setattr(update_news, "build_news", lambda: (payload, ClosedCache()))
+    monkeypatch.setattr(update_news, "open_news_history", lambda create=False: history)
+    monkeypatch.setattr(update_news, "OUTPUT_FILE", tmp_path / "news.json")
+    monkeypatch.setattr(update_news, "DIGEST_OUTPUT_FILE", tmp_path / "news_digest.json")
+    monkeypatch.setattr(
+        update_news, "write_digest_shards", lambda digest: {"written": 0, "removed": 0, "days": 0, "weeks": 0}
+    )
+    monkeypatch.setattr(update_news, "sync_to_d1", lambda *args: None)
+
+    update_news.main()
+
+    out = capsys.readouterr().out
+    assert "news history failed (database is locked)" in out
+    digest = json.loads((tmp_path / "news_digest.json").read_text(encoding="utf-8"))
+    assert digest["currentDay"]["date"] == dt.datetime.now(tz=SHANGHAI_TZ).date().isoformat()
+    assert json.loads((tmp_path / "news.json").read_text(encoding="utf-8"))["total"] == len(payload["items"])
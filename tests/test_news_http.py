@@ -0,0 +1,94 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import news_http
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.respond()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.respond()
+
+    def respond(self):
+        server = self.server
+        server.hits += 1
+        if server.mode == "slow":
+            threading.Event().wait(0.5)
+        status = 503 if server.mode == "unavailable" or server.hits <= server.fail_first else 200
+        self.send_response(status)
+        if server.retry_after:
+            self.send_header("Retry-After", str(server.retry_after))
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(news_http.time, "sleep", sleeps.append)
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.hits, httpd.mode, httpd.fail_first, httpd.retry_after = 0, "", 0, 0
+    httpd.sleeps = sleeps
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}/feed"
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+    news_http.close()
+
+
+def test_get_retries_unavailable_responses(server):
+    server.fail_first = 2
+    response = news_http.get(server.url, timeout=2)
+    assert response.status_code == 200
+    assert server.hits == 3
+    assert len(server.sleeps) == 2
+
+
+def test_post_is_retried_on_unavailable_responses(server):
+    server.fail_first = 2
+    server.retry_after = 3
+    response = news_http.post(server.url, json={"q": "ai"}, timeout=2)
+    assert response.status_code == 200
+    assert server.hits == 3
+    assert server.sleeps == [3.0, 3.0]
+
+
+@pytest.mark.parametrize("method", ["GET", "POST"])
+def test_read_timeout_is_not_retried(server, method):
+    server.mode = "slow"
+    with pytest.raises(requests.ReadTimeout):
+        news_http.request(method, server.url, timeout=0.1)
+    assert server.hits == 1
+
+
+def test_connection_errors_are_retried(server):
+    url = server.url
+    server.shutdown()
+    server.server_close()
+    with pytest.raises(requests.ConnectionError):
+        news_http.post(url, json={}, timeout=1)
+    assert len(server.sleeps) == news_http.DEFAULT_RETRIES
+
+
+def test_retries_stop_at_the_deadline(server):
+    server.mode = "unavailable"
+    server.retry_after = 20
+    response = news_http.get(server.url, timeout=2, deadline=15)
+    assert response.status_code == 503
+    assert server.hits == 1
+    assert server.sleeps == []
+
+    news_http.get(server.url, timeout=2, deadline=None)
+    assert server.hits == 1 + 1 + news_http.DEFAULT_RETRIES
+    assert server.sleeps == [20.0] * news_http.DEFAULT_RETRIES
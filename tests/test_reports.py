@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta, timezone
+
+import build_news_48h_report
+import build_weekly
+from news_item import NewsItem
+
+
+def history_row(title, published, stored_score):
+    return NewsItem.from_dict(
+        {
+            "title": title,
+            "titleOriginal": title,
+            "sourceUrl": f"https://example.com/{title.replace(' ', '-')}",
+            "sourceName": "Example",
+            "platform": "Hacker News",
+            "publishedAt": published.isoformat(),
+            "contentTags": ["AI动态"],
+            "action": "跟踪",
+            "aiScore": stored_score,
+        }
+    )
+
+
+def test_48h_report_ranks_history_rows_by_current_recency():
+    now = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+    # Scored 99 when it was minutes old; it is now 40 hours old.
+    stale = history_row("stale story", now - timedelta(hours=40), 99)
+    fresh = history_row("fresh story", now - timedelta(minutes=30), 10)
+    report = build_news_48h_report.build_report([stale, fresh], now)
+    assert [item["title"] for item in report["topItems"]] == ["fresh story", "stale story"]
+    assert report["topItems"][1]["aiScore"] < 99
+
+
+class FixedDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2026, 10, 15, 12, 0, tzinfo=timezone.utc)
+
+
+def test_weekly_top_items_are_rescored(monkeypatch, tmp_path):
+    now = FixedDatetime.now()
+    stale = history_row("stale story", now - timedelta(days=3), 99)
+    fresh = history_row("fresh story", now - timedelta(minutes=30), 10)
+    monkeypatch.setattr(build_weekly, "datetime", FixedDatetime)
+    monkeypatch.setattr(build_weekly, "load_items", lambda *args, **kwargs: [stale, fresh])
+    monkeypatch.setattr(build_weekly, "WEEKLY_DIR", tmp_path)
+    monkeypatch.setattr(build_weekly, "INDEX_JSON", tmp_path / "index.json")
+
+    build_weekly.main()
+
+    page = (tmp_path / "2026-W42.html").read_text(encoding="utf-8")
+    assert page.index("fresh story") < page.index("stale story")
@@ -0,0 +1,87 @@
+import time
+
+import pytest
+from deep_translator.exceptions import TooManyRequests, TranslationNotFound
+
+import translation
+from translation import TRANSIENT_RETRY_SECONDS, BatchTranslator
+from translation_cache import NEGATIVE_RETRY_SECONDS, TranslationCache, hash_key
+
+
+class FakeTranslator:
+    def __init__(self, fail=None):
+        self.fail = fail or (lambda text: None)
+        self.calls = []
+
+    def translate(self, text):
+        self.calls.append(text)
+        error = self.fail(text)
+        if error is not None:
+            raise error
+        return "\n".join(f"译:{line}" for line in text.split("\n"))
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = TranslationCache(tmp_path / "cache.sqlite3")
+    yield cache
+    cache.close()
+
+
+def retry_in(cache, text):
+    row = cache.conn.execute(
+        "SELECT retry_after FROM translations WHERE key = ?", (hash_key(BatchTranslator.cache_key(text)),)
+    ).fetchone()
+    return row[0] - time.time()
+
+
+def test_requests_are_counted_per_flush(cache):
+    translator = BatchTranslator(FakeTranslator(), cache, max_in_flight=1)
+    for round_texts in (["alpha", "beta"], ["gamma"]):
+        for text in round_texts:
+            translator.add(text)
+        assert translator.flush() == len(round_texts)
+        assert translator.requests == 1
+    assert translator.lookup("gamma") == "译:gamma"
+
+
+def test_transient_errors_get_a_short_retry_window(cache):
+    translator = BatchTranslator(FakeTranslator(lambda text: TooManyRequests()), cache)
+    translator.add("alpha")
+    translator.add("beta")
+    assert translator.flush() == 0
+    for text in ("alpha", "beta"):
+        assert 0 < retry_in(cache, text) <= TRANSIENT_RETRY_SECONDS
+
+
+def test_timeouts_get_a_short_retry_window(cache):
+    def slow(text):
+        time.sleep(0.5)
+
+    translator = BatchTranslator(FakeTranslator(slow), cache, timeout=0.05)
+    translator.add("alpha")
+    assert translator.flush() == 0
+    assert 0 < retry_in(cache, "alpha") <= TRANSIENT_RETRY_SECONDS
+
+
+def test_permanent_error_in_a_batch_only_blocks_the_bad_string(cache):
+    def reject(text):
+        return TranslationNotFound(text) if "bad" in text else None
+
+    fake = FakeTranslator(reject)
+    translator = BatchTranslator(fake, cache, max_in_flight=1)
+    for text in ("alpha", "bad one", "beta"):
+        translator.add(text)
+    assert translator.flush() == 2
+    assert translator.requests == 4
+    assert translator.lookup("alpha") == "译:alpha"
+    assert retry_in(cache, "bad one") > TRANSIENT_RETRY_SECONDS
+    assert retry_in(cache, "bad one") <= NEGATIVE_RETRY_SECONDS
+
+
+def test_without_deep_translator_errors_are_transient(cache, monkeypatch):
+    monkeypatch.setattr(translation, "PERMANENT_ERRORS", ())
+    translator = BatchTranslator(FakeTranslator(lambda text: TranslationNotFound(text)), cache)
+    translator.add("alpha")
+    translator.flush()
+    assert retry_in(cache, "alpha") <= TRANSIENT_RETRY_SECONDS
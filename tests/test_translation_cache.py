@@ -0,0 +1,34 @@
+import json
+
+from translation_cache import TranslationCache
+
+
+def test_legacy_json_is_imported_once(tmp_path):
+    legacy = tmp_path / "translation_cache.json"
+    legacy.write_text(json.dumps({"zh::hello": "你好", "zh::empty": " "}), encoding="utf-8")
+    db = tmp_path / "cache.sqlite3"
+
+    cache = TranslationCache(db)
+    assert cache.import_legacy(legacy) == 1
+    assert cache.get("zh::hello") == "你好"
+
+    # Eviction can empty the table; the JSON must not come back.
+    cache.conn.execute("DELETE FROM translations")
+    cache.conn.commit()
+    assert cache.import_legacy(legacy) == 0
+    cache.close()
+
+    reopened = TranslationCache(db)
+    assert reopened.import_legacy(legacy) == 0
+    assert len(reopened) == 0
+    reopened.close()
+
+
+def test_existing_database_skips_the_legacy_json(tmp_path):
+    legacy = tmp_path / "translation_cache.json"
+    legacy.write_text(json.dumps({"zh::hello": "你好"}), encoding="utf-8")
+    cache = TranslationCache(tmp_path / "cache.sqlite3")
+    cache["zh::other"] = "其他"
+    assert cache.import_legacy(legacy) == 0
+    assert "zh::hello" not in cache
+    cache.close()